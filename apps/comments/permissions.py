@@ -1,5 +1,7 @@
 from rest_framework.permissions import BasePermission
 
+from apps.teams.membership import get_memberships
+
 
 class IsProjectTeamMember(BasePermission):
 
@@ -7,7 +9,7 @@ class IsProjectTeamMember(BasePermission):
         task = getattr(obj, 'task', None)
         if not task:
             return False
-        return task.project.team.has_member(request.user)
+        return get_memberships(request).is_member(task.project.team_id)
 
 
 class IsCommentAuthor(BasePermission):
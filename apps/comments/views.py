@@ -6,8 +6,9 @@ from apps.comments.permissions import IsProjectTeamMember, IsCommentAuthor
 from apps.comments.serializers import CommentCreateSerializer, CommentSerializer
 from apps.logs.services import log_activity
 
-from apps.notify.services import notify_user, notify_team
+from apps.notify.services import notify_user, notify_team, publish_board
 from apps.tasks.models import Task
+from apps.teams.membership import get_memberships
 
 
 class CommentViewSet(viewsets.ModelViewSet):
@@ -22,24 +23,43 @@ class CommentViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
     def get_task(self):
-        task = get_object_or_404(Task, id=self.kwargs["task_pk"], project_id=self.kwargs["project_pk"])
-        if not task.project.team.has_member(self.request.user):
-            raise PermissionDenied("You are not a member of this team.")
-        return task
+        """The task from the URL, fetched and membership-checked once per request."""
+        if not hasattr(self, '_task'):
+            task = get_object_or_404(
+                Task.objects.select_related('project__team', 'assigned_to'),
+                id=self.kwargs["task_pk"], project_id=self.kwargs["project_pk"],
+            )
+            if not get_memberships(self.request).is_member(task.project.team_id):
+                raise PermissionDenied("You are not a member of this team.")
+            self._task = task
+        return self._task
 
     def get_queryset(self):
         task = self.get_task()
-        return Comment.objects.filter(task=task, parent__isnull=True).prefetch_related('replies').order_by(
-            'created_at')
+        return (
+            Comment.objects.filter(task=task, parent__isnull=True)
+            .select_related('task__project', 'user')
+            .prefetch_related('replies__user')
+            .order_by('created_at')
+        )
 
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return CommentCreateSerializer
         return CommentSerializer
 
+    def _publish(self, changed=(), deleted=()):
+        """Push the comment change to the task's open boards (``parent`` places a reply)."""
+        task = self.get_task()
+        publish_board(
+            task.project_id, 'comment', task=task.id, deleted=deleted,
+            changed=[{**CommentSerializer(comment).data, 'parent': comment.parent_id} for comment in changed],
+        )
+
     def perform_create(self, serializer):
         task = self.get_task()
         comment = serializer.save(task=task, user=self.request.user)
+        self._publish(changed=[comment])
 
         assigned = task.assigned_to
 
@@ -68,7 +88,11 @@ class CommentViewSet(viewsets.ModelViewSet):
             type='comment',
         )
 
+    def perform_update(self, serializer):
+        self._publish(changed=[serializer.save()])
+
     def perform_destroy(self, instance):
+        comment_id = instance.id
         log_activity(
             user=self.request.user,
             action='deleted',
@@ -78,4 +102,4 @@ class CommentViewSet(viewsets.ModelViewSet):
             project=instance.task.project
         )
         instance.delete()
-
+        self._publish(deleted=[comment_id])
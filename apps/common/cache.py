@@ -0,0 +1,91 @@
+"""Response cache for the read-heavy team/project/task endpoints.
+
+Dashboards reload the same lists far more often than anything changes. A
+cached response is keyed by the requesting user, the full URL and the view's
+ETag stamp (``ConditionalGetMixin.get_etag_stamp()``), which is read from the
+``version`` columns the models advance on every write. Any write, through the
+API or not, moves the stamp, so the next read misses and is rebuilt from the
+database; entries under old stamps are never looked up again and simply
+expire. Sharing the stamp with the ETag means a client can never be handed an
+old body under a new ETag and then pinned to it by 304s.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+_STATS = 'rcache:stats:{}:{}'
+
+# ``cache_name`` of every view using the mixin, for ``cache_stats()``.
+CACHED_VIEWS = set()
+
+
+def _count(name, outcome):
+    key = _STATS.format(name, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def cache_stats():
+    """Hit/miss counters per cached view, e.g. ``{'project': {'hit': 3, 'miss': 1}}``."""
+    keys = {
+        _STATS.format(name, outcome): (name, outcome)
+        for name in CACHED_VIEWS for outcome in ('hit', 'miss')
+    }
+    stats = {name: {'hit': 0, 'miss': 0} for name in CACHED_VIEWS}
+    for key, value in cache.get_many(keys).items():
+        name, outcome = keys[key]
+        stats[name][outcome] = value
+    return stats
+
+
+class CachedResponseMixin:
+    """Serve ``list``/``retrieve`` from the cache until the view's ETag stamp changes.
+
+    Goes under ``ConditionalGetMixin`` in the bases, which supplies the stamp
+    (responses with no stamp are not cached). ``cache_name`` labels the view in
+    the hit/miss metrics. Responses carry ``X-Cache: HIT`` or ``MISS``.
+    """
+
+    cache_name = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.cache_name:
+            CACHED_VIEWS.add(cls.cache_name)
+
+    def _cache_key(self):
+        stamp = self.etag_stamp()
+        if stamp is None:
+            return None
+        raw = f"{self.request.build_absolute_uri()}|{stamp}"
+        digest = hashlib.sha1(raw.encode()).hexdigest()
+        return f"rcache:{self.cache_name}:{self.request.user.pk}:{digest}"
+
+    def _cached(self, build):
+        key = self._cache_key()
+        if key is None:
+            return build()
+        data = cache.get(key)
+        if data is not None:
+            _count(self.cache_name, 'hit')
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        _count(self.cache_name, 'miss')
+        response = build()
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs))
@@ -0,0 +1,68 @@
+"""Conditional GET (ETag / If-None-Match) for list and retrieve endpoints.
+
+A view derives a *stamp* from cheap version columns (``Project.version``,
+``Team.version``) instead of from the rendered payload, so when the client's
+``If-None-Match`` still matches, the view answers ``304 Not Modified`` without
+running its queryset or serializer at all. The same stamp keys the response
+cache (``apps.common.cache``), so a cached body is never served under an ETag
+it was not built for.
+"""
+import hashlib
+
+from django.utils.cache import parse_etags, patch_cache_control, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """Answer ``list``/``retrieve`` with 304 while the client's ETag is current.
+
+    Views implement ``get_etag_stamp()``, returning a value that changes
+    whenever the response would (or None to skip conditional handling). The
+    ETag also covers the user, since payloads carry per-user fields, and the
+    URL and renderer, since each is a separate representation.
+    """
+
+    def get_etag_stamp(self):
+        raise NotImplementedError
+
+    def etag_stamp(self):
+        """``get_etag_stamp()``, read once per request."""
+        if not hasattr(self, '_etag_stamp'):
+            self._etag_stamp = self.get_etag_stamp()
+        return self._etag_stamp
+
+    def _etag(self):
+        stamp = self.etag_stamp()
+        if stamp is None:
+            return None
+        raw = (
+            f"{self.request.user.pk}|{self.request.get_full_path()}|"
+            f"{self.request.accepted_renderer.format}|{stamp}"
+        )
+        return quote_etag(hashlib.sha1(raw.encode()).hexdigest())
+
+    def _conditional(self, build):
+        # The stamp is read before the payload is built, so a concurrent write
+        # can only make the ETag older than the body, never newer.
+        etag = self._etag()
+        if etag:
+            if_none_match = self.request.headers.get('If-None-Match', '')
+            client_etags = {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+            if etag in client_etags or '*' in client_etags:
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+                response['ETag'] = etag
+                patch_cache_control(response, private=True, no_cache=True)
+                return response
+        response = build()
+        if etag and response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            # Let the browser keep the body but revalidate it on every use.
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs))
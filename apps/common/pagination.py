@@ -0,0 +1,61 @@
+"""Pagination shared by the list endpoints.
+
+Page-number pagination (the DRF default) issues a ``COUNT(*)`` and an
+``OFFSET`` scan, so deep pages of large tables get linearly slower. Views that
+list large, append-mostly tables also offer keyset (cursor) pagination: pass
+``?pagination=cursor`` for the first page and follow the ``next`` links, and
+every page costs one indexed range query regardless of depth.
+"""
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination whose ordering is taken from the view's ``cursor_ordering``."""
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+
+class PageOrCursorPagination(PageNumberPagination):
+    """Page numbers by default; keyset pagination when the client asks for it.
+
+    Views declare the indexed column to walk with ``cursor_ordering``
+    (default ``-id``).
+    """
+
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+
+    def _wants_cursor(self, request):
+        params = request.query_params
+        return params.get(self.mode_query_param) == 'cursor' or self.cursor_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self._wants_cursor(request):
+            self.keyset = KeysetPagination(getattr(view, 'cursor_ordering', '-id'))
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to "cursor" for keyset pagination (no total count, constant cost per page).',
+                'schema': {'type': 'string', 'enum': ['cursor']},
+            },
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value (from the "next"/"previous" links).',
+                'schema': {'type': 'string'},
+            },
+        ]
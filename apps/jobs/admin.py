@@ -0,0 +1,24 @@
+from django.contrib import admin
+
+from apps.jobs.models import DeadJob, Job
+from apps.jobs.queue import requeue_dead_jobs
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "attempts", "max_attempts", "run_at", "created_at")
+    list_filter = ("status", "name")
+    search_fields = ("name", "last_error")
+
+
+@admin.register(DeadJob)
+class DeadJobAdmin(admin.ModelAdmin):
+    list_display = ("name", "attempts", "enqueued_at", "failed_at")
+    list_filter = ("name",)
+    search_fields = ("name", "error")
+    actions = ["requeue"]
+
+    @admin.action(description="Requeue selected jobs")
+    def requeue(self, request, queryset):
+        count = requeue_dead_jobs(queryset)
+        self.message_user(request, f"Requeued {count} job(s).")
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs.queue import run_pending
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (email, WebSocket pushes) until interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Process the jobs that are due now, then exit.",
+        )
+        parser.add_argument(
+            "--batch", type=int, default=100,
+            help="Maximum number of jobs claimed per poll.",
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=1.0,
+            help="Seconds to wait between polls when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            total = 0
+            while processed := run_pending(options["batch"]):
+                total += processed
+            self.stdout.write(self.style.SUCCESS(f"Processed {total} job(s)."))
+            return
+
+        self.stdout.write("Job worker started.")
+        try:
+            while True:
+                if not run_pending(options["batch"]):
+                    time.sleep(options["sleep"])
+        except KeyboardInterrupt:
+            self.stdout.write("Job worker stopped.")
@@ -0,0 +1,49 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """A deferred call: the dotted path of a function plus its JSON keyword arguments."""
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+    ]
+
+    name = models.CharField(max_length=255)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status}, attempt {self.attempts}/{self.max_attempts})"
+
+
+class DeadJob(models.Model):
+    """A job that exhausted its retries; kept for inspection and manual requeue."""
+
+    name = models.CharField(max_length=255)
+    kwargs = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveIntegerField()
+    error = models.TextField(blank=True, default="")
+    enqueued_at = models.DateTimeField()
+    failed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-failed_at']
+
+    def __str__(self):
+        return f"{self.name} (failed after {self.attempts} attempts)"
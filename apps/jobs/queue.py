@@ -0,0 +1,136 @@
+"""A small database-backed job queue for side effects that must not block a request.
+
+``enqueue(func, **kwargs)`` stores the function's dotted path and its JSON
+keyword arguments; ``python manage.py run_jobs`` claims due jobs, runs them and
+retries failures with exponential backoff. A job that keeps failing is moved to
+the ``DeadJob`` table. With ``JOBS_RUN_INLINE`` (tests, local development) the
+function runs immediately instead, after the same JSON round-trip its arguments
+would go through in the database.
+"""
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.jobs.models import DeadJob, Job
+
+logger = logging.getLogger(__name__)
+
+
+def _job_name(func):
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def enqueue(func, *, delay=None, max_attempts=None, **kwargs):
+    """Run ``func(**kwargs)`` in the background (or now, in inline mode).
+
+    ``kwargs`` must be JSON-serializable: pass ids, not model instances.
+    Returns the created ``Job``, or None when the call ran inline. Inline mode
+    has no worker to wait for ``delay``, so it is ignored there; callers that
+    depend on it check ``delays_supported()`` first.
+    """
+    kwargs = json.loads(json.dumps(kwargs, cls=DjangoJSONEncoder))
+    if settings.JOBS_RUN_INLINE:
+        func(**kwargs)
+        return None
+    return Job.objects.create(
+        name=_job_name(func),
+        kwargs=kwargs,
+        run_at=timezone.now() + (delay or timedelta()),
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+
+
+def delays_supported():
+    """True when a worker runs the queue, i.e. ``enqueue(..., delay=...)`` really waits."""
+    return not settings.JOBS_RUN_INLINE
+
+
+def _retry_delay(attempts):
+    """Exponential backoff after the given number of failed attempts, capped at an hour."""
+    return timedelta(seconds=min(settings.JOBS_RETRY_BACKOFF * 2 ** (attempts - 1), 3600))
+
+
+def claim_jobs(limit):
+    """Atomically mark up to ``limit`` due jobs as running and return them.
+
+    ``skip_locked`` lets several workers poll the same table on PostgreSQL
+    without handing out a job twice (SQLite ignores row locks and serializes
+    writers anyway).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.STATUS_PENDING, run_at__lte=now)
+            .order_by('run_at', 'id')[:limit]
+        )
+        Job.objects.filter(id__in=[job.id for job in jobs]).update(
+            status=Job.STATUS_RUNNING, locked_at=now, attempts=F('attempts') + 1,
+        )
+    for job in jobs:
+        job.status = Job.STATUS_RUNNING
+        job.locked_at = now
+        job.attempts += 1
+    return jobs
+
+
+def run_job(job):
+    """Run one claimed job; delete it on success, reschedule or bury it on failure."""
+    try:
+        import_string(job.name)(**job.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            logger.error("Job %s #%s failed permanently:\n%s", job.name, job.id, error)
+            with transaction.atomic():
+                DeadJob.objects.create(
+                    name=job.name, kwargs=job.kwargs, attempts=job.attempts,
+                    error=error, enqueued_at=job.created_at,
+                )
+                job.delete()
+        else:
+            logger.warning("Job %s #%s failed (attempt %s), retrying.", job.name, job.id, job.attempts)
+            job.status = Job.STATUS_PENDING
+            job.locked_at = None
+            job.last_error = error
+            job.run_at = timezone.now() + _retry_delay(job.attempts)
+            job.save(update_fields=['status', 'locked_at', 'last_error', 'run_at'])
+        return False
+    job.delete()
+    return True
+
+
+def release_stale_jobs():
+    """Return jobs claimed by a worker that died mid-run to the pending state."""
+    cutoff = timezone.now() - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT)
+    return Job.objects.filter(status=Job.STATUS_RUNNING, locked_at__lt=cutoff).update(
+        status=Job.STATUS_PENDING, locked_at=None,
+    )
+
+
+def run_pending(limit=100):
+    """Claim and run one batch of due jobs. Returns the number of jobs processed."""
+    release_stale_jobs()
+    jobs = claim_jobs(limit)
+    for job in jobs:
+        run_job(job)
+    return len(jobs)
+
+
+def requeue_dead_jobs(queryset):
+    """Move dead jobs back onto the queue with a fresh retry budget."""
+    count = 0
+    with transaction.atomic():
+        for dead in queryset:
+            Job.objects.create(name=dead.name, kwargs=dead.kwargs, max_attempts=settings.JOBS_MAX_ATTEMPTS)
+            dead.delete()
+            count += 1
+    return count
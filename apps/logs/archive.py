@@ -0,0 +1,73 @@
+"""Retention for the activity log: move whole old months into compressed files.
+
+Each month is appended to ``activity-YYYY-MM.jsonl.gz`` in the archive
+directory (one JSON object per line, oldest first) and then removed from the
+database: by dropping its partition on PostgreSQL, or by batched deletes on a
+plain table. Appending writes a new gzip member, and gzip readers treat the
+members of a file as one stream, so a month archived in several runs still
+reads back as one file. If a run dies between writing and removing, the next
+run archives those rows again; ``id`` identifies the duplicates.
+"""
+import gzip
+import json
+from pathlib import Path
+
+from django.db import connection, transaction
+
+from apps.logs.models import ActivityLog
+from apps.logs.partitions import drop_partition, month_start, next_month, partition_months
+
+FIELDS = (
+    'id', 'timestamp', 'user_id', 'action', 'target_type', 'target_id', 'target_repr', 'project_id', 'team_id',
+)
+DELETE_BATCH = 5000
+
+
+def archive_path(directory, month):
+    return Path(directory) / f'activity-{month:%Y-%m}.jsonl.gz'
+
+
+def months_before(cutoff):
+    """Months (as aware datetimes) that hold rows or a partition older than ``cutoff``."""
+    cutoff = month_start(cutoff)
+    months = set(ActivityLog.objects.filter(timestamp__lt=cutoff).datetimes('timestamp', 'month'))
+    # Old partitions are dropped even when empty.
+    months.update(month for month in partition_months(connection) if month < cutoff)
+    return sorted(months)
+
+
+def archive_month(month, directory):
+    """Append one month's rows to its archive file, then remove them. Returns the row count."""
+    start, end = month, next_month(month)
+    rows = (
+        ActivityLog.objects.filter(timestamp__gte=start, timestamp__lt=end)
+        .order_by('id')
+        .values_list(*FIELDS)
+    )
+    path = archive_path(directory, month)
+    count, last_id, archive = 0, None, None
+    try:
+        for row in rows.iterator(chunk_size=2000):
+            if archive is None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                archive = gzip.open(path, 'at', encoding='utf-8')
+            record = dict(zip(FIELDS, row))
+            record['timestamp'] = record['timestamp'].isoformat()
+            archive.write(json.dumps(record) + '\n')
+            count, last_id = count + 1, record['id']
+    finally:
+        if archive is not None:
+            archive.close()
+
+    with transaction.atomic():
+        drop_partition(connection, month)
+        # Rows outside a dropped partition (plain table, DEFAULT partition), and only
+        # those that were written out.
+        if last_id is not None:
+            old = ActivityLog.objects.filter(timestamp__gte=start, timestamp__lt=end, id__lte=last_id)
+            while True:
+                batch = list(old.values_list('id', flat=True)[:DELETE_BATCH])
+                if not batch:
+                    break
+                ActivityLog.objects.filter(id__in=batch).delete()
+    return count
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from apps.logs.archive import archive_month, archive_path, months_before
+from apps.logs.partitions import ensure_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Archive whole months of activity older than the retention period to gzipped "
+        "JSONL files and remove them from the database; create upcoming partitions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=settings.ACTIVITY_LOG_RETENTION_DAYS,
+            help="Keep at least this many days of activity in the database.",
+        )
+        parser.add_argument(
+            "--dir", default=str(settings.ACTIVITY_LOG_ARCHIVE_DIR),
+            help="Directory that receives the activity-YYYY-MM.jsonl.gz files.",
+        )
+        parser.add_argument(
+            "--ahead", type=int, default=3,
+            help="Months of partitions to create in advance (PostgreSQL).",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="List the months that would be archived without changing anything.",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        # Only months that ended before the cutoff are archived, so up to a month
+        # more than --days is kept.
+        months = months_before(now - timedelta(days=options["days"]))
+
+        if options["dry_run"]:
+            for month in months:
+                self.stdout.write(f"Would archive {month:%Y-%m} to {archive_path(options['dir'], month)}")
+            self.stdout.write(self.style.SUCCESS(f"{len(months)} month(s) to archive."))
+            return
+
+        total = 0
+        for month in months:
+            count = archive_month(month, options["dir"])
+            total += count
+            self.stdout.write(f"Archived {count} entries from {month:%Y-%m}.")
+
+        created = ensure_partitions(connection, now, options["ahead"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {total} activity entries from {len(months)} month(s); "
+            f"created {len(created)} partition(s)."
+        ))
@@ -0,0 +1,35 @@
+from django.db import migrations
+from django.utils import timezone
+
+from apps.logs.partitions import convert, revert
+
+# The table as of this migration. Frozen here rather than read from the model:
+# later migrations add columns (team_id in 0004) that do not exist yet.
+FOREIGN_KEYS = {
+    'user_id': 'users_customuser',
+    'project_id': 'projects_project',
+}
+INDEXES = {
+    'logs_project_ts_idx': '(project_id, "timestamp" DESC)',
+    'logs_user_ts_idx': '(user_id, "timestamp" DESC)',
+}
+
+
+def forwards(apps, schema_editor):
+    convert(schema_editor.connection, timezone.now(), FOREIGN_KEYS, INDEXES)
+
+
+def backwards(apps, schema_editor):
+    revert(schema_editor.connection, FOREIGN_KEYS, INDEXES)
+
+
+class Migration(migrations.Migration):
+    """Monthly range partitions on PostgreSQL; other databases keep the plain table."""
+
+    dependencies = [
+        ('logs', '0002_activity_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,32 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_project_teams(apps, schema_editor):
+    ActivityLog = apps.get_model('logs', 'ActivityLog')
+    Project = apps.get_model('projects', 'Project')
+    ActivityLog.objects.filter(project__isnull=False).update(
+        team_id=Subquery(Project.objects.filter(pk=OuterRef('project_id')).values('team_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logs', '0003_partition_activitylog'),
+        ('teams', '0006_team_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activitylog',
+            name='team',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='teams.team'),
+        ),
+        migrations.RunPython(copy_project_teams, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['team', '-timestamp'], name='logs_team_ts_idx'),
+        ),
+    ]
@@ -1,9 +1,15 @@
 from django.db import models
 from apps.users.models import CustomUser
 from apps.projects.models import Project
+from apps.teams.models import Team
 
 class ActivityLog(models.Model):
-    """An audit record of an action a user performed on an object."""
+    """An audit record of an action a user performed on an object.
+
+    Append-only. On PostgreSQL the table is range-partitioned by month on
+    ``timestamp`` (see ``apps.logs.partitions``); old months are archived and
+    dropped by ``manage.py archive_activity``.
+    """
 
     ACTION_CHOICES = [
         ('created', 'Created'),
@@ -24,7 +30,23 @@ class ActivityLog(models.Model):
     target_id = models.PositiveIntegerField()
     target_repr = models.CharField(max_length=255)
     project = models.ForeignKey(Project, on_delete=models.SET_NULL, null=True, blank=True)
+    # Copy of ``project.team`` so the feed is scoped without joins; kept in
+    # step by ``Project.save()`` when the project moves team.
+    team = models.ForeignKey(Team, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # The feed, filtered by project or by user, newest first.
+            models.Index(fields=['project', '-timestamp'], name='logs_project_ts_idx'),
+            models.Index(fields=['user', '-timestamp'], name='logs_user_ts_idx'),
+            models.Index(fields=['team', '-timestamp'], name='logs_team_ts_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.project_id and self.team_id is None:
+            self.team_id = self.project.team_id
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.user.email} - {self.action} {self.target_type} #{self.target_id}"
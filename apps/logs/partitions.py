@@ -0,0 +1,176 @@
+"""Monthly range partitions for the activity log (PostgreSQL only).
+
+The log is append-only, read newest-first, and old months are only ever
+removed whole. Partitioning ``logs_activitylog`` by month on ``timestamp``
+lets the planner skip months a query cannot touch and lets retention drop a
+month with ``DROP TABLE`` instead of a long ``DELETE``.
+
+PostgreSQL requires the partition key in every unique constraint, so the
+primary key there is ``(id, timestamp)``; ids still come from one sequence and
+stay unique. Rows whose month has no partition yet land in a DEFAULT partition
+and are moved when that month's partition is created. Other databases keep the
+plain table, and every function here is a no-op for them.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+
+TABLE = 'logs_activitylog'
+DEFAULT_PARTITION = f'{TABLE}_default'
+PLAIN_TABLE = f'{TABLE}_plain'
+SEQUENCE = f'{TABLE}_pk_seq'
+
+
+def month_start(value):
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(month):
+    return month_start(month.replace(day=28) + timedelta(days=4))
+
+
+def partition_name(month):
+    return f'{TABLE}_y{month:%Y}m{month:%m}'
+
+
+def is_partitioned(connection):
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [TABLE])
+        return cursor.fetchone() is not None
+
+
+def partition_names(connection):
+    """Names of the monthly partitions, oldest first (the DEFAULT one excluded)."""
+    if not is_partitioned(connection):
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s) AND c.relname <> %s ORDER BY c.relname",
+            [TABLE, DEFAULT_PARTITION],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def partition_months(connection):
+    """First instant (UTC) of every month that has a partition, oldest first."""
+    return [
+        datetime(int(name[-7:-3]), int(name[-2:]), 1, tzinfo=dt_timezone.utc)
+        for name in partition_names(connection)
+    ]
+
+
+def create_partition(connection, month):
+    """Attach the partition for ``month``, moving its rows out of DEFAULT. Idempotent.
+
+    One transaction, so readers never see the moved rows missing and a failure
+    leaves no detached table behind. DEFAULT is locked against inserts first:
+    a row for the month landing there before the ATTACH would make it fail.
+    """
+    name = partition_name(month)
+    if not is_partitioned(connection) or name in partition_names(connection):
+        return False
+    start, end = month, next_month(month)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {DEFAULT_PARTITION} IN SHARE ROW EXCLUSIVE MODE")
+        cursor.execute(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE "timestamp" >= %s AND "timestamp" < %s '
+            f'RETURNING *) INSERT INTO {name} SELECT * FROM moved',
+            [start, end],
+        )
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    return True
+
+
+def ensure_partitions(connection, now, ahead=3):
+    """Partitions for the current month and the ``ahead`` following ones."""
+    month = month_start(now)
+    created = []
+    for _ in range(ahead + 1):
+        if create_partition(connection, month):
+            created.append(partition_name(month))
+        month = next_month(month)
+    return created
+
+
+def drop_partition(connection, month):
+    """Drop the partition for ``month``; False if there is none."""
+    name = partition_name(month)
+    if name not in partition_names(connection):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+        cursor.execute(f"DROP TABLE {name}")
+    return True
+
+
+def _add_keys_and_indexes(cursor, primary_key, foreign_keys, indexes):
+    cursor.execute(f"ALTER TABLE {TABLE} ADD PRIMARY KEY ({primary_key})")
+    for column, target in foreign_keys.items():
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_{column}_fk FOREIGN KEY ({column}) "
+            f"REFERENCES {target} (id) DEFERRABLE INITIALLY DEFERRED"
+        )
+    for index, columns in indexes.items():
+        cursor.execute(f"CREATE INDEX {index} ON {TABLE} {columns}")
+
+
+def convert(connection, now, foreign_keys, indexes, ahead=3):
+    """Turn the plain table into a partitioned one, copying every row.
+
+    The table is rebuilt without its constraints, so the caller passes every
+    foreign key (``{column: referenced table}``) and index (``{name: columns
+    SQL}``) the table has at that point. They are recreated on the parent,
+    which cascades them to every partition. Migrations pass a frozen copy:
+    columns added by later migrations do not exist yet.
+    """
+    if connection.vendor != 'postgresql' or is_partitioned(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {PLAIN_TABLE}")
+        cursor.execute(
+            f'CREATE TABLE {TABLE} (LIKE {PLAIN_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            f'PARTITION BY RANGE ("timestamp")'
+        )
+        # A sequence default rather than an identity column: partitions of every
+        # supported PostgreSQL version accept it for rows routed through the parent.
+        cursor.execute(f"CREATE SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')")
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+        cursor.execute(f'SELECT min("timestamp") FROM {PLAIN_TABLE}')
+        oldest = cursor.fetchone()[0]
+
+    month = month_start(oldest or now)
+    while month <= month_start(now):
+        create_partition(connection, month)
+        month = next_month(month)
+    ensure_partitions(connection, now, ahead)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {PLAIN_TABLE}")
+        cursor.execute(f"SELECT setval('{SEQUENCE}', coalesce((SELECT max(id) FROM {TABLE}), 0) + 1, false)")
+        cursor.execute(f"DROP TABLE {PLAIN_TABLE}")
+        _add_keys_and_indexes(cursor, 'id, "timestamp"', foreign_keys, indexes)
+
+
+def revert(connection, foreign_keys, indexes):
+    """Turn the partitioned table back into a plain one, copying every row.
+
+    ``foreign_keys`` and ``indexes`` are as for ``convert()``.
+    """
+    if not is_partitioned(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {PLAIN_TABLE} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        cursor.execute(f"INSERT INTO {PLAIN_TABLE} SELECT * FROM {TABLE}")
+        cursor.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY NONE")
+        cursor.execute(f"DROP TABLE {TABLE} CASCADE")
+        cursor.execute(f"ALTER TABLE {PLAIN_TABLE} RENAME TO {TABLE}")
+        cursor.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+        _add_keys_and_indexes(cursor, 'id', foreign_keys, indexes)
@@ -11,3 +11,22 @@ def log_activity(user, action, target_type, target_id, target_repr, project=None
         target_repr=target_repr,
         project=project
     )
+
+
+def log_activities(user, action, target_type, targets, project=None):
+    """Record the same action on many objects with a single INSERT.
+
+    ``targets`` is an iterable of ``(target_id, target_repr)`` pairs.
+    """
+    ActivityLog.objects.bulk_create([
+        ActivityLog(
+            user=user,
+            action=action,
+            target_type=target_type,
+            target_id=target_id,
+            target_repr=target_repr,
+            project=project,
+            team_id=project.team_id if project else None,
+        )
+        for target_id, target_repr in targets
+    ])
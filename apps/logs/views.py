@@ -1,22 +1,48 @@
+from datetime import datetime, time
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 
+from apps.common.pagination import PageOrCursorPagination
+from apps.logs.export import FORMATS, asynchronous, batched, rows
 from apps.logs.models import ActivityLog
 from apps.logs.serializers import ActivityLogSerializer
+from apps.teams.membership import get_memberships
+
+
+def _moment(name, value):
+    """A query parameter as an aware datetime; a bare date means its midnight."""
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None and (day := parse_date(value)) is not None:
+            parsed = datetime.combine(day, time.min)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: 'Expected an ISO 8601 date or date-time.'})
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
 
 
 class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
-    """Read-only activity/audit log, filterable by user, project or target type."""
+    """Read-only activity/audit log, filterable by user, project, target type or time range."""
 
     serializer_class = ActivityLogSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PageOrCursorPagination
+    cursor_ordering = '-timestamp'
 
     def get_queryset(self):
-        # Only logs for projects on teams the user is an accepted member of.
+        # Only logs for projects on teams the user is an accepted member of,
+        # filtered on the log's own team id: no joins, and the (team, -timestamp)
+        # index serves the newest-first feed.
         queryset = (
-            ActivityLog.objects.filter(
-                project__team__membership_set__user=self.request.user,
-                project__team__membership_set__status='accepted',
-            )
+            ActivityLog.objects.filter(team_id__in=get_memberships(self.request).team_ids())
             .select_related('user', 'project')
             .order_by('-timestamp')
         )
@@ -24,6 +50,8 @@ class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
         user_id = self.request.query_params.get('user')
         project_id = self.request.query_params.get('project')
         target_type = self.request.query_params.get('target_type')
+        since = self.request.query_params.get('since')
+        until = self.request.query_params.get('until')
 
         if user_id:
             queryset = queryset.filter(user_id=user_id)
@@ -31,5 +59,34 @@ class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.filter(project_id=project_id)
         if target_type:
             queryset = queryset.filter(target_type=target_type)
+        if since:
+            queryset = queryset.filter(timestamp__gte=_moment('since', since))
+        if until:
+            queryset = queryset.filter(timestamp__lt=_moment('until', until))
 
         return queryset
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter('output', str, enum=list(FORMATS), description="csv (default) or jsonl."),
+            OpenApiParameter('since', str, description="Start of the range (inclusive), ISO 8601."),
+            OpenApiParameter('until', str, description="End of the range (exclusive), ISO 8601."),
+            OpenApiParameter('user', int), OpenApiParameter('project', int), OpenApiParameter('target_type', str),
+        ],
+        responses={200: OpenApiResponse(description="The matching entries, oldest first, streamed.")},
+    )
+    @action(detail=False, methods=['get'], pagination_class=None)
+    def export(self, request):
+        """Stream every matching entry as CSV or JSON Lines, with no paging."""
+        output = request.query_params.get('output', 'csv')
+        if output not in FORMATS:
+            raise ValidationError({'output': f"Expected one of: {', '.join(FORMATS)}."})
+        content_type, encode = FORMATS[output]
+
+        chunks = batched(encode(rows(self.get_queryset())))
+        if isinstance(request._request, ASGIRequest):
+            chunks = asynchronous(chunks)
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        filename = f"activity-{timezone.now():%Y%m%d-%H%M%S}.{output}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from apps.notify.models import Notification
+from apps.notify.models import Notification, NotificationPreference, PendingEmail, UnreadCounter
 
 
 @admin.register(Notification)
@@ -8,3 +8,22 @@ class NotificationAdmin(admin.ModelAdmin):
     list_display = ("user", "type", "message", "is_read", "created_at")
     list_filter = ("type", "is_read")
     search_fields = ("message", "user__email")
+
+
+@admin.register(UnreadCounter)
+class UnreadCounterAdmin(admin.ModelAdmin):
+    list_display = ("user", "count")
+    search_fields = ("user__email",)
+
+
+@admin.register(NotificationPreference)
+class NotificationPreferenceAdmin(admin.ModelAdmin):
+    list_display = ("user", "email_delivery")
+    list_filter = ("email_delivery",)
+    search_fields = ("user__email",)
+
+
+@admin.register(PendingEmail)
+class PendingEmailAdmin(admin.ModelAdmin):
+    list_display = ("user", "subject", "created_at")
+    search_fields = ("subject", "user__email")
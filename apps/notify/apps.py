@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class NotifyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.notify'
+
+    def ready(self):
+        from apps.notify import middleware, services
+        # Drop cached WebSocket users when they are saved (e.g. deactivated) or deleted.
+        middleware.connect_signals()
+        # Drop unread counters when notifications change outside the services module.
+        services.connect_signals()
@@ -1,9 +1,67 @@
+from datetime import timedelta
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.db.models import Q
+
+from apps.notify.models import Notification
+from apps.notify.serializers import NotificationSerializer
+from apps.notify.services import project_group, unread_count
+from apps.projects.models import Project
+from apps.teams.membership import MembershipResolver
+
+# Boards one socket may follow at once (one per open tab is the usual case).
+MAX_SUBSCRIPTIONS = 20
+# Missed notifications replayed on reconnect; past this the client reloads its list.
+REPLAY_LIMIT = 50
+
+
+@database_sync_to_async
+def missed_notifications(user, last_seen_id):
+    """The user's notifications after ``last_seen_id`` (oldest first) and unread count.
+
+    Older digests that grew since the client saw ``last_seen_id`` come along:
+    every digest updated after that row was created, less one coalescing window
+    (the longest a folded event waits for its push, which the client may have
+    missed). Some may be sent again; clients upsert by id. Returns None as the
+    list when more than ``REPLAY_LIMIT`` were missed.
+    """
+    missed = Q(id__gt=last_seen_id)
+    seen_at = Notification.objects.filter(user=user, id=last_seen_id).values_list('created_at', flat=True).first()
+    if seen_at is not None:
+        missed |= Q(count__gt=1, updated_at__gt=seen_at - timedelta(seconds=settings.NOTIFY_COALESCE_WINDOW))
+    notes = list(Notification.objects.filter(missed, user=user).order_by('id')[:REPLAY_LIMIT + 1])
+    if len(notes) > REPLAY_LIMIT:
+        notes = None
+    else:
+        notes = NotificationSerializer(notes, many=True).data
+    return notes, unread_count(user)
+
+
+@database_sync_to_async
+def board_version(user, project_id):
+    """The project's board version, or None if it does not exist or the user is not on its team."""
+    row = Project.objects.filter(pk=project_id).values_list('team_id', 'version').first()
+    if row is None or not MembershipResolver(user).is_member(row[0]):
+        return None
+    return row[1]
 
 
 class NotificationConsumer(AsyncJsonWebsocketConsumer):
-    """Per-user WebSocket: authenticates via JWT, joins the ``user_<id>`` group and pushes notifications."""
+    """Per-user WebSocket: authenticates via JWT, joins the ``user_<id>`` group and pushes notifications.
+
+    The same socket carries live boards: ``{"action": "subscribe", "project": id}``
+    joins the ``project_<id>`` group (team members only) and is answered with the
+    board's current ``version``; ``{"action": "unsubscribe", "project": id}`` leaves it.
+
+    A reconnecting client passes ``?last_seen_id=`` (the newest notification id
+    it has) and first receives one ``{"event": "replay"}`` frame with what it
+    missed, oldest first, including older digests that grew meanwhile;
+    ``complete`` is false when the gap was too long.
+    """
 
     async def connect(self):
         user = self.scope.get("user")
@@ -12,6 +70,7 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
             return
 
         self.group_name = f"user_{user.id}"
+        self.projects = set()
 
         if self.channel_layer is None:
             await self.close()
@@ -20,9 +79,57 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
 
+        # Joined first, so nothing falls between the replay and the live feed
+        # (a notification may arrive twice; clients skip ids they have).
+        last_seen_id = parse_qs(self.scope["query_string"].decode()).get("last_seen_id", [""])[0]
+        if last_seen_id.isdigit():
+            notes, unread = await missed_notifications(user, int(last_seen_id))
+            await self.send_json({
+                "event": "replay", "notifications": notes or [], "complete": notes is not None, "unread": unread,
+            })
+
     async def disconnect(self, close_code):
         if hasattr(self, 'group_name') and self.channel_layer is not None:
             await self.channel_layer.group_discard(self.group_name, self.channel_name)
+            for project_id in self.projects:
+                await self.channel_layer.group_discard(project_group(project_id), self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        action = content.get("action") if isinstance(content, dict) else None
+        project_id = content.get("project") if isinstance(content, dict) else None
+        if action not in ("subscribe", "unsubscribe"):
+            await self.send_json({"event": "error", "detail": "Unknown action."})
+            return
+        if not isinstance(project_id, int) or isinstance(project_id, bool):
+            await self.send_json({"event": "error", "detail": "A project id is required."})
+            return
+
+        if action == "unsubscribe":
+            if project_id in self.projects:
+                self.projects.discard(project_id)
+                await self.channel_layer.group_discard(project_group(project_id), self.channel_name)
+            await self.send_json({"event": "unsubscribed", "project": project_id})
+            return
+
+        if project_id not in self.projects and len(self.projects) >= MAX_SUBSCRIPTIONS:
+            await self.send_json({"event": "error", "project": project_id, "detail": "Too many subscriptions."})
+            return
+        version = await board_version(self.scope["user"], project_id)
+        if version is None:
+            await self.send_json({
+                "event": "error", "project": project_id,
+                "detail": "Project not found or you're not a member of its team.",
+            })
+            return
+        self.projects.add(project_id)
+        await self.channel_layer.group_add(project_group(project_id), self.channel_name)
+        await self.send_json({"event": "subscribed", "project": project_id, "version": version})
 
     async def notify(self, event):
-        await self.send_json(event["data"])
\ No newline at end of file
+        await self.send_json(event["data"])
+
+    async def unread_count(self, event):
+        await self.send_json({"event": "unread_count", "unread": event["unread"]})
+
+    async def frame(self, event):
+        await self.send_json(event["data"])
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.notify.services import send_email_digests
+
+
+class Command(BaseCommand):
+    help = "Send held notification emails now, one digest per user (the job worker also does this every EMAIL_DIGEST_MINUTES)."
+
+    def handle(self, *args, **options):
+        sent = send_email_digests()
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} email digests."))
@@ -1,24 +1,120 @@
+"""WebSocket handshake middleware: JWT authentication and admission control.
+
+Every handshake used to load its user from the database, so the reconnect
+storm after a deploy (every open tab at once) turned into a burst of user
+queries. The token's signature and expiry are still checked on every
+handshake, but the user it names is kept in a small per-process cache for a
+short while, and concurrent handshakes of the same user share one load.
+Saving or deleting a user drops its entry (other processes see a deactivation
+within ``WS_USER_CACHE_TTL`` seconds). Handshakes beyond
+``WS_ADMISSION_RATE`` per second (after a burst of ``WS_ADMISSION_BURST``) are
+refused before any of that work, and clients retry with backoff.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
 from urllib.parse import parse_qs
-from channels.middleware import BaseMiddleware
+
 from channels.db import database_sync_to_async
-from django.contrib.auth.models import AnonymousUser
+from channels.middleware import BaseMiddleware
+from channels.security.websocket import WebsocketDenier
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import UntypedToken
 
 User = get_user_model()
 
 
+class UserCache:
+    """Size-bounded, short-lived map of user id -> user, least recently used out first."""
+
+    def __init__(self, size, ttl, clock=time.monotonic):
+        self.size = size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # user id -> (expires at, user)
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= self.clock():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user_id, user):
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (self.clock() + self.ttl, user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.WS_USER_CACHE_SIZE, settings.WS_USER_CACHE_TTL)
+# user id -> the load in flight, awaited by every handshake that missed the cache meanwhile.
+_loading = {}
+
+
 @database_sync_to_async
-def get_user(token):
+def _load_user(validated_token):
+    return JWTAuthentication().get_user(validated_token)
+
+
+async def get_user(token):
+    """The active user a valid access token names, or AnonymousUser."""
+    if not token:
+        return AnonymousUser()
     try:
+        # Signature and expiry only; no database.
         validated_token = UntypedToken(token)
-        jwt_auth = JWTAuthentication()
-        user = jwt_auth.get_user(validated_token)
-        return user
-    except (InvalidToken, TokenError, KeyError, User.DoesNotExist):
+        user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+    except (InvalidToken, TokenError, KeyError):
         return AnonymousUser()
+    user = user_cache.get(user_id)
+    if user is None:
+        load = _loading.get(user_id)
+        if load is None:
+            load = _loading[user_id] = asyncio.ensure_future(_load_user(validated_token))
+            load.add_done_callback(lambda _: _loading.pop(user_id, None))
+        try:
+            # Shielded: a handshake that gives up must not cancel the others' load.
+            user = await asyncio.shield(load)
+        except (InvalidToken, AuthenticationFailed, User.DoesNotExist):
+            return AnonymousUser()
+        user_cache.put(user_id, user)
+    return user
+
+
+def forget_user(sender, instance, **kwargs):
+    """Signal receiver: a saved (e.g. deactivated) or deleted user is loaded afresh."""
+    user_cache.discard(str(instance.pk))
+
+
+def connect_signals():
+    from django.db.models.signals import post_delete, post_save
+
+    post_save.connect(forget_user, sender=User, dispatch_uid='ws-user-cache-save')
+    post_delete.connect(forget_user, sender=User, dispatch_uid='ws-user-cache-delete')
 
 
 class JwtAuthMiddleware(BaseMiddleware):
@@ -29,3 +125,41 @@ class JwtAuthMiddleware(BaseMiddleware):
         token = query_string.get("token", [None])[0]
         scope["user"] = await get_user(token)
         return await super().__call__(scope, receive, send)
+
+
+class TokenBucket:
+    """Admits ``rate`` events a second on average, in bursts of up to ``burst``."""
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """Use one token if there is one; False means the event should be refused."""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class AdmissionLimitMiddleware(BaseMiddleware):
+    """Refuses WebSocket handshakes beyond the process's admission rate (``WS_ADMISSION_RATE`` <= 0 disables it)."""
+
+    def __init__(self, inner, bucket=None):
+        super().__init__(inner)
+        if bucket is None and settings.WS_ADMISSION_RATE > 0:
+            bucket = TokenBucket(settings.WS_ADMISSION_RATE, settings.WS_ADMISSION_BURST)
+        self.bucket = bucket
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket" and self.bucket is not None and not self.bucket.take():
+            return await WebsocketDenier()(scope, receive, send)
+        return await super().__call__(scope, receive, send)
@@ -3,7 +3,11 @@ from apps.users.models import CustomUser
 
 
 class Notification(models.Model):
-    """A notification for a user; also pushed live over WebSocket when created."""
+    """A notification for a user; also pushed live over WebSocket when created.
+
+    A burst of same-type events for the user becomes one digest row (see
+    ``apps.notify.services``).
+    """
 
     TYPE_CHOICES = [
         ('general', 'General'),
@@ -17,11 +21,69 @@ class Notification(models.Model):
     type = models.CharField(max_length=50, choices=TYPE_CHOICES, default='general')
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Moves when a digest grows, so a reconnecting client is sent the new version.
+    updated_at = models.DateTimeField(auto_now=True)
+    # Events folded into this row by the coalescing stage (1: a single event).
+    count = models.PositiveIntegerField(default=1)
 
     class Meta:
         indexes = [
             models.Index(fields=['user', '-created_at']),
+            # Replay on reconnect: the user's rows after the last id a client saw.
+            models.Index(fields=['user', 'id'], name='notify_user_id_idx'),
+            # ... and the digests that grew since.
+            models.Index(fields=['user', 'updated_at'], name='notify_user_updated_idx'),
+            # Partial index: only unread rows, used by recounts and mark-all-read.
+            models.Index(fields=['user'], condition=models.Q(is_read=False), name='notify_unread_user_idx'),
         ]
 
     def __str__(self):
         return f"{self.user.email} - {self.type} - {self.message[:30]}"
+
+
+class UnreadCounter(models.Model):
+    """A user's unread-notification count, maintained as notifications are created and read.
+
+    Seeded from a ``COUNT(*)`` the first time it is needed, then kept up to date
+    by ``apps.notify.services`` so the bell reads a single row. Dropped when
+    notifications change elsewhere and recounted periodically, so drift heals.
+    """
+
+    user = models.OneToOneField(
+        CustomUser, on_delete=models.CASCADE, primary_key=True, related_name='unread_counter'
+    )
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.count} unread"
+
+
+class NotificationPreference(models.Model):
+    """A user's notification settings; users without a row get the defaults."""
+
+    EMAIL_IMMEDIATE = 'immediate'
+    EMAIL_DIGEST = 'digest'
+    EMAIL_DELIVERY_CHOICES = [
+        (EMAIL_IMMEDIATE, 'One email per notification'),
+        (EMAIL_DIGEST, 'One digest email every few minutes'),
+    ]
+
+    user = models.OneToOneField(
+        CustomUser, on_delete=models.CASCADE, primary_key=True, related_name='notification_preference'
+    )
+    email_delivery = models.CharField(max_length=20, choices=EMAIL_DELIVERY_CHOICES, default=EMAIL_IMMEDIATE)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.email_delivery}"
+
+
+class PendingEmail(models.Model):
+    """A notification email held for the user's next digest."""
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='+')
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.subject}"
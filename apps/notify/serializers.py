@@ -1,8 +1,27 @@
 from rest_framework import serializers
-from .models import Notification
+
+from apps.jobs.queue import delays_supported
+from .models import Notification, NotificationPreference
 
 
 class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
-        fields = ['id', 'message', 'type', 'is_read', 'created_at']
+        fields = ['id', 'message', 'type', 'is_read', 'created_at', 'count']
+
+
+class NotificationPreferenceSerializer(serializers.ModelSerializer):
+    # Digests are sent by the job worker; without one the choice is refused.
+    digest_available = serializers.SerializerMethodField()
+
+    class Meta:
+        model = NotificationPreference
+        fields = ['email_delivery', 'digest_available']
+
+    def get_digest_available(self, obj) -> bool:
+        return delays_supported()
+
+    def validate_email_delivery(self, value):
+        if value == NotificationPreference.EMAIL_DIGEST and not delays_supported():
+            raise serializers.ValidationError("Digest delivery needs the background job worker.")
+        return value
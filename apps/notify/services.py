@@ -1,53 +1,449 @@
-from django.core.mail import send_mail
+"""Notifications (stored rows, WebSocket pushes, email) and other live frames.
+
+Coalescing: with ``NOTIFY_COALESCE_WINDOW`` set, an event for a user who got a
+notification of the same type less than a window ago (still unread, fewer than
+``NOTIFY_COALESCE_MAX_BATCH`` events in it) is folded into that row, which
+becomes a digest ("... (+3 more)"), instead of adding a row. The first event
+of a burst is pushed at once; the folded ones share a single delayed push of
+the digest per window (without a job worker there is nothing to run a delayed
+push, so each fold is pushed at once). ``coalescing_stats()`` counts the rows
+and frames saved.
+
+Email digests: a user whose ``NotificationPreference`` says ``digest`` gets
+their notification emails held as ``PendingEmail`` rows; one delayed job per
+``EMAIL_DIGEST_MINUTES`` folds each user's rows into a single message and
+sends them all over one SMTP connection. Digests need the job worker; with
+``JOBS_RUN_INLINE`` the preference cannot be chosen and stored ones fall back
+to immediate delivery.
+"""
+import asyncio
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.db import transaction
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
-from apps.notify.models import Notification
+from apps.jobs.queue import delays_supported, enqueue
+from apps.notify.models import Notification, NotificationPreference, PendingEmail, UnreadCounter
+
+logger = logging.getLogger(__name__)
+
+# Set while a digest's push is queued; later folds into it ride along.
+_PUSH_PENDING = 'notify:push:{}'
+# Set while an email-digest run is queued; emails held meanwhile go out with it.
+_EMAIL_DIGEST_PENDING = 'notify:email-digest'
+# Users whose pending emails are read and sent per round.
+EMAIL_DIGEST_BATCH = 500
+_STATS = 'notify:stats:{}'
+# Set while a user's unread counter is trusted; once it expires the next read recounts.
+_UNREAD_FRESH = 'notify:unread-fresh:{}'
+# Safety net for rows changed by ``QuerySet.update()``, which sends no signal.
+UNREAD_RECOUNT_TIMEOUT = 600
+STAT_NAMES = ('events', 'rows_saved', 'frames_saved')
+
+
+def _notify_event(message, type, timestamp):
+    """The ``notify`` event the consumer forwards to the browser."""
+    return {
+        "type": "notify",
+        "data": {
+            "message": message,
+            "type": type,
+            "timestamp": timestamp,
+        }
+    }
+
+
+def _group_send_many(channel_layer, messages):
+    """Send ``(group, event)`` pairs concurrently in a single event-loop hop.
+
+    One ``async_to_sync`` round-trip per message dominates fan-out latency; with
+    Redis the sends are pipelined over the layer's connection pool instead.
+    """
+    async def send_all():
+        await asyncio.gather(*(channel_layer.group_send(group, event) for group, event in messages))
+
+    async_to_sync(send_all)()
+
+
+def push_to_users(user_ids, message, type, timestamp, unread=None, ids=None):
+    """Job: push a notification over WebSocket to each user's ``user_<id>`` group.
+
+    ``unread`` maps a user id (as a string, it went through JSON) to that user's
+    new unread count, which rides along in the frame so the bell never refetches.
+    ``ids`` maps it to the user's ``Notification`` id, the ``last_seen_id`` a
+    reconnecting client hands back to have what it missed replayed.
+    """
+    channel_layer = get_channel_layer()
+    if not channel_layer:
+        return
+    unread = unread or {}
+    ids = ids or {}
+    messages = []
+    for user_id in user_ids:
+        event = _notify_event(message, type, timestamp)
+        if str(user_id) in unread:
+            event["data"]["unread"] = unread[str(user_id)]
+        if str(user_id) in ids:
+            event["data"]["id"] = ids[str(user_id)]
+        messages.append((f"user_{user_id}", event))
+    _group_send_many(channel_layer, messages)
+
+
+def push_notifications(ids):
+    """Job: push notification rows as they are now (a digest may have grown since this was queued)."""
+    cache.delete_many([_PUSH_PENDING.format(note_id) for note_id in ids])
+    channel_layer = get_channel_layer()
+    if not channel_layer:
+        return
+    notes = list(Notification.objects.filter(id__in=ids))
+    unread = dict(
+        UnreadCounter.objects.filter(user_id__in={note.user_id for note in notes}).values_list('user_id', 'count')
+    )
+    messages = []
+    for note in notes:
+        event = _notify_event(note.message, note.type, note.created_at.isoformat())
+        event["data"].update(id=note.id, count=note.count)
+        if note.user_id in unread:
+            event["data"]["unread"] = unread[note.user_id]
+        messages.append((f"user_{note.user_id}", event))
+    _group_send_many(channel_layer, messages)
+
+
+def push_event(user_ids, data):
+    """Job: send a non-notification frame (``data`` carries its ``event`` name) to each user's sockets."""
+    channel_layer = get_channel_layer()
+    if channel_layer:
+        _group_send_many(channel_layer, [(f"user_{user_id}", {"type": "frame", "data": data}) for user_id in user_ids])
+
+
+def project_group(project_id):
+    """Channel-layer group of the sockets subscribed to a project's board."""
+    return f"project_{project_id}"
+
+
+def push_to_project(project_id, data):
+    """Job: send a board delta frame to every socket subscribed to the project."""
+    channel_layer = get_channel_layer()
+    if channel_layer:
+        async_to_sync(channel_layer.group_send)(project_group(project_id), {"type": "frame", "data": data})
+
+
+def publish_board(project_id, kind, changed=(), deleted=(), **extra):
+    """Push a structured change of a project's board to its open boards, after commit.
+
+    ``kind`` is ``task``, ``comment`` or ``file``; ``changed`` holds the
+    serialized rows as they are now and ``deleted`` the ids of removed ones.
+    ``extra`` carries context such as the board ``version`` or the ``task`` a
+    comment belongs to.
+    """
+    data = {
+        "event": "board", "project": project_id, "kind": kind,
+        "changed": list(changed), "deleted": list(deleted), **extra,
+    }
+    transaction.on_commit(lambda: enqueue(push_to_project, project_id=project_id, data=data))
+
+
+def push_unread_count(user_id, unread):
+    """Job: tell every open socket of the user its new unread count."""
+    channel_layer = get_channel_layer()
+    if channel_layer:
+        async_to_sync(channel_layer.group_send)(f"user_{user_id}", {"type": "unread_count", "unread": unread})
+
+
+def _seed_unread_counters(user_ids):
+    """Create missing counters from a grouped ``COUNT(*)``; return ``{user_id: count}``."""
+    counts = dict.fromkeys(user_ids, 0)
+    counts.update(
+        Notification.objects.filter(user_id__in=user_ids, is_read=False)
+        .values_list('user_id')
+        .annotate(n=Count('id'))
+        .values_list('user_id', 'n')
+    )
+    UnreadCounter.objects.bulk_create(
+        [UnreadCounter(user_id=user_id, count=count) for user_id, count in counts.items()],
+        ignore_conflicts=True,
+    )
+    cache.set_many({_UNREAD_FRESH.format(user_id): True for user_id in counts}, UNREAD_RECOUNT_TIMEOUT)
+    return counts
+
+
+def _recount_unread(user_id):
+    """Reset the user's counter from a ``COUNT(*)`` of their unread rows and return it."""
+    count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+    UnreadCounter.objects.update_or_create(user_id=user_id, defaults={'count': count})
+    cache.set(_UNREAD_FRESH.format(user_id), True, UNREAD_RECOUNT_TIMEOUT)
+    return count
+
+
+def forget_unread_count(*user_ids):
+    """Drop the unread counters of users whose notifications changed out of band.
+
+    The next read or notification reseeds them from the rows. The counter rows
+    go in the caller's transaction; the freshness marks are dropped again on
+    commit, in case a concurrent read trusted the pre-commit counter meanwhile.
+    """
+    keys = [_UNREAD_FRESH.format(user_id) for user_id in user_ids]
+    UnreadCounter.objects.filter(user_id__in=user_ids).delete()
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def notification_saved(sender, instance, created, **kwargs):
+    """Signal receiver: forget the owner's counter when a row is saved outside this module.
+
+    This module writes rows with ``bulk_create``, ``bulk_update`` and ``update()``,
+    which send no signal, so only admin edits and direct ``save()`` calls land here.
+    """
+    if not (created and instance.is_read):
+        forget_unread_count(instance.user_id)
+
+
+def notification_deleted(sender, instance, **kwargs):
+    """Signal receiver: forget the owner's counter when an unread row is deleted (admin, cascades)."""
+    if not instance.is_read:
+        forget_unread_count(instance.user_id)
+
+
+def connect_signals():
+    from django.db.models.signals import post_delete, post_save
+
+    post_save.connect(notification_saved, sender=Notification, dispatch_uid='notify-unread-save')
+    post_delete.connect(notification_deleted, sender=Notification, dispatch_uid='notify-unread-delete')
+
+
+def adjust_unread(user_ids, delta):
+    """Add ``delta`` to each user's unread counter and return ``{user_id: new count}``.
+
+    Call it after the notification rows changed: a counter that does not exist
+    yet is seeded from the rows themselves, so the delta is not applied twice.
+    """
+    user_ids = set(user_ids)
+    UnreadCounter.objects.filter(user_id__in=user_ids).update(count=Greatest(F('count') + delta, 0))
+    counts = dict(UnreadCounter.objects.filter(user_id__in=user_ids).values_list('user_id', 'count'))
+    missing = user_ids - counts.keys()
+    if missing:
+        counts.update(_seed_unread_counters(missing))
+    return counts
+
+
+def unread_count(user):
+    """The user's unread-notification count, read from the maintained counter.
+
+    A counter missing, or not recounted for ``UNREAD_RECOUNT_TIMEOUT``, is
+    recounted from the rows, so drift from unsignalled updates heals.
+    """
+    count = UnreadCounter.objects.filter(user=user).values_list('count', flat=True).first()
+    if count is None or not cache.get(_UNREAD_FRESH.format(user.id)):
+        count = _recount_unread(user.id)
+    return count
+
+
+def mark_read(user, notification_ids=None):
+    """Mark the user's notifications read (all, or only ``notification_ids``).
+
+    Keeps the unread counter in step and pushes the new count to the user's open
+    sockets. Returns the number of notifications that changed.
+    """
+    notes = Notification.objects.filter(user=user, is_read=False)
+    if notification_ids is not None:
+        notes = notes.filter(id__in=notification_ids)
+    changed = notes.update(is_read=True)
+    if changed:
+        unread = adjust_unread([user.id], -changed)[user.id]
+        enqueue(push_unread_count, user_id=user.id, unread=unread)
+    return changed
+
+
+def send_email(subject, message, recipient_list):
+    """Job: send a plain-text email from DEFAULT_FROM_EMAIL."""
+    send_mail(
+        subject=subject,
+        message=message,
+        from_email=None,  # uses DEFAULT_FROM_EMAIL
+        recipient_list=recipient_list,
+    )
+
+
+def _digest_email(user, emails):
+    """One message for all of a user's held emails (a lone email keeps its own subject)."""
+    if len(emails) == 1:
+        subject, body = emails[0].subject, emails[0].body
+    else:
+        subject = f"{len(emails)} new notifications"
+        body = "\n\n---\n\n".join(f"{email.subject}\n\n{email.body}" for email in emails)
+    return EmailMessage(subject=subject, body=body, to=[user.email])
+
+
+def send_email_digests():
+    """Job: send every user's held emails as one digest each, over a single SMTP connection.
+
+    Rows are deleted only once their digest went out; a user whose send failed
+    keeps them and is retried with the next run. Returns the number of digests sent.
+    """
+    cache.delete(_EMAIL_DIGEST_PENDING)
+    user_ids = list(PendingEmail.objects.order_by().values_list('user_id', flat=True).distinct())
+    sent = failed = 0
+    with get_connection() as connection:
+        for start in range(0, len(user_ids), EMAIL_DIGEST_BATCH):
+            held = {}
+            for email in PendingEmail.objects.filter(
+                user_id__in=user_ids[start:start + EMAIL_DIGEST_BATCH]
+            ).select_related('user').order_by('id'):
+                held.setdefault(email.user, []).append(email)
+            done = []
+            for user, emails in held.items():
+                if user.email:
+                    message = _digest_email(user, emails)
+                    message.connection = connection
+                    try:
+                        message.send()
+                    except Exception:
+                        logger.exception("Email digest for user %s failed", user.id)
+                        failed += 1
+                        continue
+                    sent += 1
+                done.extend(email.id for email in emails)
+            PendingEmail.objects.filter(id__in=done).delete()
+    if failed:
+        _schedule_email_digest()
+    return sent
+
+
+def _schedule_email_digest():
+    """Queue the next digest run unless one is already waiting."""
+    delay = timedelta(minutes=settings.EMAIL_DIGEST_MINUTES)
+    if cache.add(_EMAIL_DIGEST_PENDING, True, timeout=int(delay.total_seconds()) + 60):
+        enqueue(send_email_digests, delay=delay)
+
+
+def _email(user, subject, body):
+    """Send the email now, or hold it for the user's next digest if they asked for those."""
+    if delays_supported() and NotificationPreference.objects.filter(user=user, email_delivery=NotificationPreference.EMAIL_DIGEST).exists():
+        PendingEmail.objects.create(user=user, subject=subject[:255], body=body)
+        _schedule_email_digest()
+    else:
+        enqueue(send_email, subject=subject, message=body, recipient_list=[user.email])
+
+
+def _count(name, amount):
+    key = _STATS.format(name)
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key, amount)
+
+
+def coalescing_stats():
+    """Events notified and the rows and frames coalescing saved, e.g. ``{'events': 40, 'rows_saved': 31, ...}``."""
+    found = cache.get_many([_STATS.format(name) for name in STAT_NAMES])
+    return {name: found.get(_STATS.format(name), 0) for name in STAT_NAMES}
+
+
+def _digest_message(message, count):
+    suffix = f" (+{count - 1} more)"
+    max_length = Notification._meta.get_field('message').max_length
+    return message[:max_length - len(suffix)] + suffix
+
+
+def _fold(user_ids, message, type):
+    """Fold the event into each user's open digest row; return the rows that took it."""
+    with transaction.atomic():
+        latest = {}
+        for note in Notification.objects.select_for_update().filter(
+            user_id__in=user_ids, type=type, is_read=False,
+            created_at__gte=timezone.now() - timedelta(seconds=settings.NOTIFY_COALESCE_WINDOW),
+            count__lt=settings.NOTIFY_COALESCE_MAX_BATCH,
+        ).order_by('id'):
+            latest[note.user_id] = note
+        folded = list(latest.values())
+        now = timezone.now()
+        for note in folded:
+            note.count += 1
+            note.message = _digest_message(message, note.count)
+            note.updated_at = now  # bulk_update does not apply auto_now
+        if folded:
+            Notification.objects.bulk_update(folded, ['count', 'message', 'updated_at'])
+    return folded
+
+
+def _push_digests(notes):
+    """Queue one delayed push for the digests without one pending; the rest ride along on theirs."""
+    if not delays_supported():
+        # Nothing would wait for the delay: push the grown digests now.
+        enqueue(push_notifications, ids=[note.id for note in notes])
+        return
+    window = settings.NOTIFY_COALESCE_WINDOW
+    due = [note.id for note in notes if cache.add(_PUSH_PENDING.format(note.id), True, timeout=window + 60)]
+    if len(due) < len(notes):
+        _count('frames_saved', len(notes) - len(due))
+    if due:
+        enqueue(push_notifications, ids=due, delay=timedelta(seconds=window))
+
+
+def _deliver(user_ids, message, type):
+    """Store and push one event for each user, coalescing it into open digests when enabled."""
+    folded = _fold(user_ids, message, type) if settings.NOTIFY_COALESCE_WINDOW > 0 else []
+    folded_ids = {note.user_id for note in folded}
+    notes = Notification.objects.bulk_create(
+        [Notification(user_id=user_id, message=message, type=type) for user_id in user_ids if user_id not in folded_ids]
+    )
+    if notes:
+        enqueue(
+            push_to_users, user_ids=[note.user_id for note in notes], message=message, type=type,
+            timestamp=timezone.now().isoformat(), unread=adjust_unread([note.user_id for note in notes], 1),
+            ids={note.user_id: note.id for note in notes if note.id is not None},
+        )
+    if folded:
+        _count('rows_saved', len(folded))
+        _push_digests(folded)
+    _count('events', len(user_ids))
 
 
 def notify_user(user, message, email_subject=None, email_body=None, type='general', save=True):
-    """Notify a user: live over WebSocket, optionally by email, and persist a record."""
+    """Notify a user: persist a record, then push it live and optionally email it.
+
+    The WebSocket push and the email are queued as background jobs, so the
+    request never waits on the channel layer or the SMTP server. Users on digest
+    delivery get the email in their next digest instead.
+    """
     if user is None:
         raise ValueError("User cannot be None")
-    # WebSocket
-    channel_layer = get_channel_layer()
-    if channel_layer:
-        async_to_sync(channel_layer.group_send)(
-            f"user_{user.id}",
-            {
-                "type": "notify",
-                "data": {
-                    "message": message,
-                    "type": type,
-                    "timestamp": str(timezone.now())
-                }
-            }
+    # DB + WebSocket
+    if save:
+        _deliver([user.id], message, type)
+    else:
+        enqueue(
+            push_to_users, user_ids=[user.id], message=message, type=type,
+            timestamp=timezone.now().isoformat(),
         )
 
     # Email
     if email_subject and email_body and user.email:
-        send_mail(
-            subject=email_subject,
-            message=email_body,
-            from_email=None,  # uses DEFAULT_FROM_EMAIL
-            recipient_list=[user.email]
-        )
-
-    # DB
-    if save:
-        Notification.objects.create(user=user, message=message, type=type)
+        _email(user, email_subject, email_body)
 
 
 def notify_team(team, message, exclude_user_ids=None, type='general'):
     """In-app/WebSocket notify every accepted team member (no email, to avoid spam).
 
     ``exclude_user_ids`` skips users already notified individually (the actor and,
-    e.g., an assignee) so nobody gets the same event twice.
-    """
-    exclude = set(exclude_user_ids or ())
-    members = team.membership_set.filter(status='accepted').select_related('user')
-    for membership in members:
-        if membership.user_id in exclude:
-            continue
-        notify_user(membership.user, message, type=type)
+    e.g., an assignee) so nobody gets the same event twice. All rows are written
+    with one ``bulk_create`` and the pushes go out as one background job, so the
+    cost of a task edit no longer grows with the size of the team.
+    """
+    user_ids = list(
+        team.membership_set.filter(status='accepted')
+        .exclude(user_id__in=set(exclude_user_ids or ()))
+        .values_list('user_id', flat=True)
+    )
+    if not user_ids:
+        return
+    _deliver(user_ids, message, type)
@@ -2,16 +2,20 @@ from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
-from .models import Notification
-from .serializers import NotificationSerializer
+from apps.common.pagination import PageOrCursorPagination
+from .models import Notification, NotificationPreference
+from .serializers import NotificationPreferenceSerializer, NotificationSerializer
+from .services import mark_read, unread_count
 
 
 class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
-    """The current user's recent notifications, with a mark-as-read action."""
+    """The current user's recent notifications, with mark-as-read and delivery-preference actions."""
 
     queryset = Notification.objects.none()  # actual rows come from get_queryset; set for schema generation
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PageOrCursorPagination
+    cursor_ordering = '-created_at'
 
     def get_queryset(self):
         # Ordering only; let pagination cap the page size so older notifications
@@ -21,16 +25,28 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=True, methods=["post"], url_path="mark_as_read")
     def mark_as_read(self, request, pk=None):
         note = get_object_or_404(Notification, id=pk, user=request.user)
-        note.is_read = True
-        note.save()
+        mark_read(request.user, [note.id])
         return Response({"status": "marked as read"})
 
     @action(detail=False, methods=["get"], url_path="unread_count")
     def unread_count(self, request):
-        count = Notification.objects.filter(user=request.user, is_read=False).count()
-        return Response({"unread": count})
+        # Served from the maintained per-user counter, not a COUNT(*).
+        return Response({"unread": unread_count(request.user)})
 
     @action(detail=False, methods=["post"], url_path="mark_all_read")
     def mark_all_read(self, request):
-        Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+        mark_read(request.user)
         return Response({"status": "all marked as read"})
+
+    @action(detail=False, methods=["get", "patch"], url_path="preferences",
+            serializer_class=NotificationPreferenceSerializer)
+    def preferences(self, request):
+        # No row until the user first changes something; reads get the defaults.
+        if request.method == "GET":
+            preference = NotificationPreference.objects.filter(user=request.user).first()
+            return Response(NotificationPreferenceSerializer(preference or NotificationPreference()).data)
+        preference, _ = NotificationPreference.objects.get_or_create(user=request.user)
+        serializer = NotificationPreferenceSerializer(preference, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
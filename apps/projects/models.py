@@ -14,7 +14,54 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
     budget = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     due_date = models.DateField(null=True, blank=True)
+    # Change stamp: incremented whenever the project or one of its tasks
+    # changes. Part of the ETags of project and task responses.
+    version = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_team_id = instance.__dict__.get('team_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        bump = not self._state.adding
+        if bump:
+            self.version = models.F('version') + 1
+        super().save(*args, **kwargs)
+        if bump:
+            self.refresh_from_db(fields=['version'])
+        moved = getattr(self, '_loaded_team_id', self.team_id) != self.team_id
+        if moved:
+            from apps.timetrack.models import RunningTimer, TimeEntry
+            from apps.timetrack.timers import forget_team_timers
+
+            # Tasks, activity entries, time entries and rollups and running
+            # timers carry a copy of the team id.
+            self.tasks.update(team_id=self.team_id)
+            self.activitylog_set.update(team_id=self.team_id)
+            TimeEntry.objects.filter(project=self).update(team_id=self.team_id)
+            self.time_rollups.update(team_id=self.team_id)
+            RunningTimer.objects.filter(task__project=self).update(team_id=self.team_id)
+            forget_team_timers(self._loaded_team_id, self.team_id)
+        self._loaded_team_id = self.team_id
+
+    @classmethod
+    def bump_versions(cls, *project_ids):
+        """Advance the change stamp of the given projects without loading them."""
+        cls.objects.filter(pk__in=project_ids).update(version=models.F('version') + 1)
+
+    @classmethod
+    def next_version(cls, project_id):
+        """Advance the project's stamp and return the new value.
+
+        Must run inside a transaction: the UPDATE locks the project row until
+        commit, so versions handed out for one project become visible in
+        increasing order and a delta sync never skips one.
+        """
+        cls.bump_versions(project_id)
+        return cls.objects.filter(pk=project_id).values_list('version', flat=True).get()
+
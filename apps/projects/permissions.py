@@ -1,15 +1,17 @@
 from rest_framework.permissions import BasePermission
 
+from apps.teams.membership import get_memberships
+
 
 class IsTeamMember(BasePermission):
     def has_object_permission(self, request, view, obj):
         if hasattr(obj, 'project'):  # e.g. Task
-            return obj.project.team.has_member(request.user)
+            return get_memberships(request).is_member(obj.project.team_id)
         elif hasattr(obj, 'team'):  # e.g. Project
-            return obj.team.has_member(request.user)
+            return get_memberships(request).is_member(obj.team_id)
         return False
 
 
 class IsProjectAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.team.has_admin(request.user)
+        return get_memberships(request).is_admin(obj.team_id)
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from apps.projects.models import Project
+from apps.tasks.models import Task
 from apps.tasks.serializers import TaskSerializer
 from apps.teams.serializers import TeamSerializer
 from apps.users.serializers import UserSerializer
@@ -52,6 +53,41 @@ class ProjectListSerializer(serializers.ModelSerializer):
         return {"id": obj.team_id, "name": obj.team.name}
 
 
+class ProjectSummarySerializer(serializers.ModelSerializer):
+    """Compact list shape (``?compact=true``): per-project task counters aggregated
+    by the database instead of every task of every project."""
+
+    team = serializers.SerializerMethodField()
+    created_by = UserSerializer(read_only=True)
+    task_count = serializers.IntegerField(read_only=True)
+    stats = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Project
+        fields = [
+            'id',
+            'name',
+            'description',
+            'team',
+            'created_by',
+            'created_at',
+            'budget',
+            'due_date',
+            'task_count',
+            'stats',
+        ]
+
+    def get_team(self, obj) -> dict:
+        return {"id": obj.team_id, "name": obj.team.name}
+
+    def get_stats(self, obj) -> dict:
+        return {
+            "by_status": {value: getattr(obj, f"status_{value}") for value, _ in Task.STATUS_CHOICES},
+            "by_priority": {value: getattr(obj, f"priority_{value}") for value, _ in Task.PRIORITY_CHOICES},
+            "overdue": obj.overdue_count,
+        }
+
+
 class ProjectCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
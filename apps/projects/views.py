@@ -1,35 +1,88 @@
+from django.db.models import Count, Q
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, permissions, filters
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 
+from apps.common.cache import CachedResponseMixin
+from apps.common.conditional import ConditionalGetMixin
 from apps.projects.models import Project
 from apps.projects.permissions import IsTeamMember, IsProjectAdmin
-from apps.projects.serializers import ProjectCreateSerializer, ProjectSerializer, ProjectListSerializer
+from apps.projects.serializers import (
+    ProjectCreateSerializer, ProjectSerializer, ProjectListSerializer, ProjectSummarySerializer,
+)
+from apps.search.filters import FullTextSearchFilter
+from apps.tasks.models import Task
+from apps.teams.membership import get_memberships
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """Projects the current user can access (those owned by teams they belong to)."""
 
     queryset = Project.objects.all()
     permission_classes = [permissions.IsAuthenticated, IsTeamMember]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['team__id', 'created_by__id']
     ordering_fields = ['created_at', 'name']
     search_fields = ['name', 'description']
+    search_index = 'project'
+    cache_name = 'projects'
+
+    def _compact(self):
+        """``?compact=true`` on the list returns task counters instead of task lists."""
+        return self.action == 'list' and self.request.query_params.get('compact') in ('1', 'true')
+
+    def _task_counters(self):
+        """Per-project task counters, computed in the list query's GROUP BY."""
+        counters = {
+            'task_count': Count('tasks'),
+            'overdue_count': Count(
+                'tasks', filter=Q(tasks__due_date__lt=timezone.now()) & ~Q(tasks__status=Task.STATUS_DONE)
+            ),
+        }
+        for value, _ in Task.STATUS_CHOICES:
+            counters[f'status_{value}'] = Count('tasks', filter=Q(tasks__status=value))
+        for value, _ in Task.PRIORITY_CHOICES:
+            counters[f'priority_{value}'] = Count('tasks', filter=Q(tasks__priority=value))
+        return counters
+
+    def get_etag_stamp(self):
+        team_ids = get_memberships(self.request).team_ids()
+        if self.action == 'retrieve':
+            return (
+                Project.objects.filter(pk=self.kwargs['pk'], team_id__in=team_ids)
+                .values_list('version', 'team__version').first()
+            )
+        # One narrow row per visible project: any edit, task change, membership
+        # change, new or deleted project alters the stamp.
+        stamp = list(
+            Project.objects.filter(team_id__in=team_ids)
+            .order_by('id').values_list('id', 'version', 'team__version')
+        )
+        if self._compact():
+            # Overdue counters change with the clock, without any write.
+            stamp.append(
+                Task.objects.filter(team_id__in=team_ids, due_date__lt=timezone.now())
+                .exclude(status=Task.STATUS_DONE).count()
+            )
+        return stamp
 
     def get_queryset(self):
-        return (
-            Project.objects.filter(
-                team__membership_set__user=self.request.user,
-                team__membership_set__status='accepted',
+        if self._compact():
+            return (
+                Project.objects.filter(team_id__in=get_memberships(self.request).team_ids())
+                .select_related('team', 'created_by')
+                .annotate(**self._task_counters())
+                .order_by('-id')
             )
+        return (
+            Project.objects.filter(team_id__in=get_memberships(self.request).team_ids())
             .select_related('team', 'created_by')
             .prefetch_related(
                 'tasks', 'tasks__assigned_to', 'tasks__created_by',
                 'team__membership_set__user',
             )
-            .distinct()
             .order_by('-id')
         )
 
@@ -42,12 +95,11 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if self.action == 'create':
             return ProjectCreateSerializer
         if self.action == 'list':
-            return ProjectListSerializer
+            return ProjectSummarySerializer if self._compact() else ProjectListSerializer
         return ProjectSerializer
 
     def perform_create(self, serializer):
         team = serializer.validated_data.get('team')
-        if not team.has_member(self.request.user):
+        if not get_memberships(self.request).is_member(team):
             raise PermissionDenied("You are not a member of this team.")
         serializer.save(created_by=self.request.user)
-
@@ -0,0 +1,20 @@
+from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate
+
+
+def _repair_indexes(sender, using, **kwargs):
+    from apps.search.indexes import install
+    install(connections[using])
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.search'
+
+    def ready(self):
+        # Table rebuilds in later migrations drop SQLite triggers; re-create them.
+        post_migrate.connect(_repair_indexes, sender=self)
+        # Keep the in-memory typeahead index in step with user and project edits.
+        from apps.search.typeahead import connect_signals
+        connect_signals()
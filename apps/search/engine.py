@@ -0,0 +1,131 @@
+"""Ranked, prefix-matching full-text queries over the indexes in ``indexes.py``.
+
+Every word of the query must match (as a prefix, so ``depl`` finds
+"deployment"). Results are ranked with ``ts_rank`` on PostgreSQL and ``bm25``
+on SQLite; other databases fall back to unranked ``icontains`` matching.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from apps.search.indexes import INDEXES, PG_CONFIG
+
+MAX_TERMS = 8
+# bm25() column weights matching the PostgreSQL setweight() labels.
+_BM25_WEIGHTS = {'A': '10.0', 'B': '1.0'}
+
+
+def terms(query):
+    """The words of a user query, lower-cased; punctuation and operators are dropped."""
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+
+def _pg_query(words):
+    return ' & '.join(f"{word}:*" for word in words)
+
+
+def _fts_query(words):
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def _fallback_q(index, words):
+    q = Q()
+    for word in words:
+        q &= Q(*(Q(**{f"{field}__icontains": word}) for field in index.fields), _connector=Q.OR)
+    return q
+
+
+def filter_matching(queryset, index, words):
+    """Restrict ``queryset`` to rows of ``index`` matching every word."""
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        return queryset.filter(pk__in=RawSQL(
+            f"SELECT id FROM {index.table} WHERE search_vector @@ to_tsquery(%s, %s)",
+            [PG_CONFIG, _pg_query(words)],
+        ))
+    if vendor == 'sqlite':
+        return queryset.filter(pk__in=RawSQL(
+            f"SELECT rowid FROM {index.fts_table} WHERE {index.fts_table} MATCH %s",
+            [_fts_query(words)],
+        ))
+    return queryset.filter(_fallback_q(index, words))
+
+
+def ranked_ids(queryset, index, words, limit):
+    """``[(pk, rank), ...]`` of the best matches among ``queryset``, best first."""
+    connection = connections[queryset.db]
+    scope_sql, scope_params = queryset.values('pk').query.sql_with_params()
+    if connection.vendor == 'postgresql':
+        sql = (
+            f"SELECT t.id, ts_rank(t.search_vector, q) AS rank "
+            f"FROM {index.table} t, to_tsquery(%s, %s) q "
+            f"WHERE t.search_vector @@ q AND t.id IN ({scope_sql}) "
+            f"ORDER BY rank DESC, t.id DESC LIMIT %s"
+        )
+        params = [PG_CONFIG, _pg_query(words), *scope_params, limit]
+    elif connection.vendor == 'sqlite':
+        fts = index.fts_table
+        weights = ', '.join(_BM25_WEIGHTS[weight] for weight in index.weights)
+        # bm25() is lower-is-better; negate it so every backend ranks high-first.
+        sql = (
+            f"SELECT rowid, -bm25({fts}, {weights}) AS rank FROM {fts} "
+            f"WHERE {fts} MATCH %s AND rowid IN ({scope_sql}) "
+            f"ORDER BY rank DESC, rowid DESC LIMIT %s"
+        )
+        params = [_fts_query(words), *scope_params, limit]
+    else:
+        pks = filter_matching(queryset, index, words).order_by('-pk').values_list('pk', flat=True)[:limit]
+        return [(pk, 0.0) for pk in pks]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def excerpt(text, words, width=160):
+    """A window of ``text`` around the first matched word."""
+    text = ' '.join((text or '').split())
+    lowered = text.lower()
+    positions = [pos for pos in (lowered.find(word) for word in words) if pos >= 0]
+    start = max(min(positions, default=0) - width // 4, 0)
+    snippet = text[start:start + width]
+    return f"{'…' if start else ''}{snippet}{'…' if start + width < len(text) else ''}"
+
+
+def _hit(index, obj, rank, words):
+    if index.name == 'task':
+        project, task_id, title, body = obj.project, obj.id, obj.title, obj.description or obj.title
+    elif index.name == 'comment':
+        project, task_id, title, body = obj.task.project, obj.task_id, obj.task.title, obj.text
+    else:
+        project, task_id, title, body = obj, None, obj.name, obj.description or obj.name
+    return {
+        'type': index.name,
+        'id': obj.id,
+        'title': title,
+        'excerpt': excerpt(body, words),
+        'project': {'id': project.id, 'name': project.name},
+        'task_id': task_id,
+        'rank': round(float(rank), 6),
+    }
+
+
+_RELATED = {'task': ('project',), 'comment': ('task__project',), 'project': ()}
+
+
+def search(team_ids, query, types=None, limit=20):
+    """Best matches for ``query`` across the given index types, within the teams."""
+    words = terms(query)
+    if not words or not team_ids:
+        return []
+    hits = []
+    for name in types or INDEXES:
+        index = INDEXES[name]
+        model = index.model()
+        scoped = model.objects.filter(**{f"{index.scope}__in": team_ids})
+        ranked = ranked_ids(scoped, index, words, limit)
+        objects = model.objects.select_related(*_RELATED[name]).in_bulk([pk for pk, _ in ranked])
+        hits.extend(_hit(index, objects[pk], rank, words) for pk, rank in ranked if pk in objects)
+    hits.sort(key=lambda hit: hit['rank'], reverse=True)
+    return hits[:limit]
@@ -0,0 +1,147 @@
+"""What is searchable, and the database objects that index it.
+
+PostgreSQL: each table gets a stored, generated ``search_vector`` tsvector
+column (weighted per field) with a GIN index, kept current by the database.
+
+SQLite (development and tests): each table gets an external-content FTS5
+virtual table plus triggers that mirror inserts, updates and deletes.
+
+``install()`` is idempotent. It runs from the app's migration and again after
+every ``migrate``: on SQLite, Django rebuilds a table to alter it, which drops
+its triggers, so they are re-created and the FTS index is rebuilt when missing.
+"""
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    name: str           # result ``type`` in the API
+    app_label: str
+    model_name: str
+    table: str
+    fields: tuple       # indexed text columns, most important first
+    weights: tuple      # PostgreSQL setweight() labels, one per field
+    scope: str          # ORM path to the owning team's id
+
+    @property
+    def fts_table(self):
+        return f"search_{self.name}_fts"
+
+    def model(self):
+        from django.apps import apps
+        return apps.get_model(self.app_label, self.model_name)
+
+
+INDEXES = {
+    index.name: index
+    for index in (
+        SearchIndex(
+            name='task', app_label='tasks', model_name='Task', table='tasks_task',
+            fields=('title', 'description'), weights=('A', 'B'),
+            scope='team_id',
+        ),
+        SearchIndex(
+            name='comment', app_label='comments', model_name='Comment', table='comments_comment',
+            fields=('text',), weights=('B',),
+            scope='task__team_id',
+        ),
+        SearchIndex(
+            name='project', app_label='projects', model_name='Project', table='projects_project',
+            fields=('name', 'description'), weights=('A', 'B'),
+            scope='team_id',
+        ),
+    )
+}
+
+# PostgreSQL text search configuration used for indexing and querying. No
+# stemmer, as on SQLite: queries are prefixes of the words as typed, and a
+# stemmed index stores "deploy" for "deployment", which "deploymen:*" misses.
+PG_CONFIG = 'simple'
+
+
+def _pg_vector(index, config):
+    return ' || '.join(
+        f"setweight(to_tsvector('{config}', coalesce({field}, '')), '{weight}')"
+        for field, weight in zip(index.fields, index.weights)
+    )
+
+
+def _install_postgresql(cursor, index, config=PG_CONFIG):
+    cursor.execute(
+        f"ALTER TABLE {index.table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({_pg_vector(index, config)}) STORED"
+    )
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS {index.table}_search_gin ON {index.table} USING GIN (search_vector)"
+    )
+
+
+def _install_sqlite(cursor, index):
+    columns = ', '.join(index.fields)
+    new_values = ', '.join(f"new.{field}" for field in index.fields)
+    old_values = ', '.join(f"old.{field}" for field in index.fields)
+    fts = index.fts_table
+    # No stemmer: every query word is a prefix query, and the porter stemmer
+    # would turn the prefix "deploy" into "deploi", missing "deployment".
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{columns}, content='{index.table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+    )
+    cursor.execute("SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s", [f"{fts}_%"])
+    if cursor.fetchone()[0] == 3:
+        return
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {index.table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {index.table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+    )
+    # Only text edits touch the index (not, e.g., version bumps).
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {index.table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def install(connection):
+    """Create (or repair) the full-text objects for every index."""
+    installer = {'postgresql': _install_postgresql, 'sqlite': _install_sqlite}.get(connection.vendor)
+    if installer is None:
+        return
+    with connection.cursor() as cursor:
+        for index in INDEXES.values():
+            installer(cursor, index)
+
+
+def _uninstall_postgresql(cursor, index):
+    cursor.execute(f"DROP INDEX IF EXISTS {index.table}_search_gin")
+    cursor.execute(f"ALTER TABLE {index.table} DROP COLUMN IF EXISTS search_vector")
+
+
+def rebuild_postgresql(connection, config):
+    """Re-create the PostgreSQL vectors with the text search configuration ``config``.
+
+    A generated column cannot change its expression in place, so each one is
+    dropped and added again, which recomputes every row.
+    """
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        for index in INDEXES.values():
+            _uninstall_postgresql(cursor, index)
+            _install_postgresql(cursor, index, config)
+
+
+def uninstall(connection):
+    with connection.cursor() as cursor:
+        for index in INDEXES.values():
+            if connection.vendor == 'postgresql':
+                _uninstall_postgresql(cursor, index)
+            elif connection.vendor == 'sqlite':
+                for suffix in ('ai', 'ad', 'au'):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {index.fts_table}_{suffix}")
+                cursor.execute(f"DROP TABLE IF EXISTS {index.fts_table}")
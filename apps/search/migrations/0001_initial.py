@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from apps.search.indexes import install, uninstall
+
+
+def forwards(apps, schema_editor):
+    install(schema_editor.connection)
+
+
+def backwards(apps, schema_editor):
+    uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0004_alter_comment_options'),
+        ('projects', '0003_project_version'),
+        ('tasks', '0005_task_change_tracking'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
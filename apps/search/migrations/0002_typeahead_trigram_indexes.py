@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from apps.search.typeahead import install, uninstall
+
+
+def forwards(apps, schema_editor):
+    install(schema_editor.connection)
+
+
+def backwards(apps, schema_editor):
+    uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('users', '0003_emailverificationtoken'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from apps.search.indexes import rebuild_postgresql
+
+
+def forwards(apps, schema_editor):
+    rebuild_postgresql(schema_editor.connection, 'simple')
+
+
+def backwards(apps, schema_editor):
+    rebuild_postgresql(schema_editor.connection, 'english')
+
+
+class Migration(migrations.Migration):
+    """Index PostgreSQL vectors unstemmed, so prefix queries match partial words."""
+
+    dependencies = [
+        ('search', '0002_typeahead_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
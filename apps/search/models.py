@@ -0,0 +1,3 @@
+# No models: the full-text indexes are database objects managed by indexes.py.
+# The module exists because Django only sends post_migrate to apps that have
+# one, and SearchConfig relies on it to repair triggers after table rebuilds.
@@ -0,0 +1,300 @@
+"""Typeahead for the assignee, invite and project pickers.
+
+PostgreSQL: pg_trgm GIN indexes over a user's name and email and over a
+project's name turn ``LIKE '%word%'`` into an index scan; matches are ranked
+by trigram similarity.
+
+Other databases: each process keeps an in-memory prefix trie of the words in
+those fields, built on first use and kept current by model signals. A change
+also bumps a generation counter in the shared cache, so every other process
+notices and rebuilds its trie on its next lookup.
+"""
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db import connections
+
+MAX_WORDS = 4
+# Below this many in-scope rows, checking each one beats walking the trie.
+SCAN_LIMIT = 500
+_GENERATION = 'typeahead:{}:gen'
+_IDS = ''  # trie node key holding the ids of words ending there
+
+
+def words(*values):
+    """Lower-cased words of the given strings (an email splits at . and @)."""
+    return re.findall(r'[^\W_]+', ' '.join(value or '' for value in values).lower())
+
+
+@dataclass(frozen=True)
+class Source:
+    name: str           # result ``type`` in the API
+    app_label: str
+    model_name: str
+    table: str
+    fields: tuple       # text columns matched against the query
+    values: tuple       # columns returned to the client
+    scope: str | None   # column kept in memory to filter by team, if any
+    active: str | None  # boolean column hiding deactivated rows, if any
+
+    def model(self):
+        from django.apps import apps
+        return apps.get_model(self.app_label, self.model_name)
+
+    def rows(self):
+        queryset = self.model().objects.all()
+        if self.active:
+            queryset = queryset.filter(**{self.active: True})
+        return queryset
+
+    @property
+    def indexed(self):
+        """Columns the in-memory index keeps per row."""
+        return ('id', *self.fields, *filter(None, [self.scope]))
+
+    @property
+    def trgm_expression(self):
+        return "lower(" + " || ' ' || ".join(self.fields) + ")"
+
+
+SOURCES = {
+    source.name: source
+    for source in (
+        Source(
+            name='user', app_label='users', model_name='CustomUser', table='users_customuser',
+            fields=('first_name', 'last_name', 'email'),
+            values=('id', 'first_name', 'last_name', 'email'), scope=None, active='is_active',
+        ),
+        Source(
+            name='project', app_label='projects', model_name='Project', table='projects_project',
+            fields=('name',), values=('id', 'name', 'team_id'), scope='team_id', active=None,
+        ),
+    )
+}
+
+
+class PrefixTrie:
+    """Maps words to ids; every id stored under a prefix is found by one walk."""
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, word, pk):
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        node.setdefault(_IDS, set()).add(pk)
+
+    def discard(self, word, pk):
+        node = self.root
+        for char in word:
+            node = node.get(char)
+            if node is None:
+                return
+        node.get(_IDS, set()).discard(pk)
+
+    def prefixed(self, prefix):
+        """Ids of every word starting with ``prefix``."""
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return set()
+        found, stack = set(), [node]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key == _IDS:
+                    found |= child
+                else:
+                    stack.append(child)
+        return found
+
+
+class MemoryIndex:
+    """The trie of one source, plus each row's words, label and scope."""
+
+    def __init__(self, source):
+        self.source = source
+        self.trie = PrefixTrie()
+        self.entries = {}  # pk -> (words, label, scope value)
+        self.generation = None
+        self._lock = threading.Lock()
+
+    def _current_generation(self):
+        key = _GENERATION.format(self.source.name)
+        generation = cache.get(key)
+        if generation is None:
+            cache.add(key, time.time_ns(), timeout=None)
+            generation = cache.get(key)
+        return generation
+
+    def _add(self, row):
+        pk = row['id']
+        row_words = tuple(dict.fromkeys(words(*(row[field] for field in self.source.fields))))
+        label = ' '.join(row_words)
+        for word in row_words:
+            self.trie.add(word, pk)
+        self.entries[pk] = (row_words, label, row.get(self.source.scope))
+
+    def _remove(self, pk):
+        entry = self.entries.pop(pk, None)
+        if entry:
+            for word in entry[0]:
+                self.trie.discard(word, pk)
+
+    def ensure_current(self):
+        generation = self._current_generation()
+        if generation == self.generation:
+            return
+        with self._lock:
+            if generation == self.generation:
+                return
+            self.trie, self.entries = PrefixTrie(), {}
+            for row in self.source.rows().values(*self.source.indexed).iterator(chunk_size=2000):
+                self._add(row)
+            self.generation = generation
+
+    def changed(self, pk, row=None):
+        """Apply one saved (``row``) or deleted (``row=None``) record."""
+        with self._lock:
+            was_current = self.generation is not None and self.generation == self._current_generation()
+            self._remove(pk)
+            if row is not None:
+                self._add(row)
+            generation = time.time_ns()
+            cache.set(_GENERATION.format(self.source.name), generation, timeout=None)
+            # Only claim the new generation if nothing else was missed before it.
+            if was_current:
+                self.generation = generation
+
+    def lookup(self, terms, allowed=None, scope_values=None, limit=10):
+        """Best pks whose words start with every term, within the scope."""
+        self.ensure_current()
+        entries = self.entries
+        if allowed is not None and len(allowed) <= SCAN_LIMIT:
+            candidates = {pk for pk in allowed if pk in entries}
+        else:
+            # Walk only the most selective (longest) term; check the rest per row.
+            candidates = self.trie.prefixed(max(terms, key=len))
+            if allowed is not None:
+                candidates &= allowed
+        if scope_values is not None:
+            candidates = {pk for pk in candidates if entries[pk][2] in scope_values}
+        phrase = ' '.join(terms)
+        matches = [
+            pk for pk in candidates
+            if all(any(word.startswith(term) for word in entries[pk][0]) for term in terms)
+        ]
+        # Whole-phrase prefix matches first, then shorter (closer) labels.
+        matches.sort(key=lambda pk: (not entries[pk][1].startswith(phrase), len(entries[pk][1]), pk))
+        return matches[:limit]
+
+
+MEMORY_INDEXES = {name: MemoryIndex(source) for name, source in SOURCES.items()}
+
+
+def _trigram_ids(source, queryset, terms, limit):
+    connection = connections[queryset.db]
+    scope_sql, scope_params = queryset.values('pk').query.sql_with_params()
+    expression = source.trgm_expression
+    conditions = ' AND '.join(f"{expression} LIKE %s" for _ in terms)
+    sql = (
+        f"SELECT id FROM {source.table} WHERE id IN ({scope_sql}) AND {conditions} "
+        f"ORDER BY similarity({expression}, %s) DESC, id LIMIT %s"
+    )
+    params = [*scope_params, *(f"%{term}%" for term in terms), ' '.join(terms), limit]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _result(source, row):
+    row = dict(row, type=source.name)
+    if 'team_id' in row:
+        row['team'] = row.pop('team_id')
+    return row
+
+
+def suggest(name, query, team_ids, limit=10):
+    """Top ``limit`` users (co-members of ``team_ids``) or projects (of those teams)."""
+    from apps.teams.models import TeamMembership
+
+    terms = words(query)[:MAX_WORDS]
+    if not terms or not team_ids:
+        return []
+    source = SOURCES[name]
+    queryset = source.rows()
+    if name == 'user':
+        scoped = queryset.filter(
+            teammembership__team_id__in=team_ids,
+            teammembership__status=TeamMembership.STATUS_ACCEPTED,
+        ).distinct()
+    else:
+        scoped = queryset.filter(team_id__in=team_ids)
+
+    if connections[queryset.db].vendor == 'postgresql':
+        pks = _trigram_ids(source, scoped, terms, limit)
+    else:
+        index = MEMORY_INDEXES[name]
+        if name == 'user':
+            allowed = set(TeamMembership.objects.filter(
+                team_id__in=team_ids, status=TeamMembership.STATUS_ACCEPTED,
+            ).values_list('user_id', flat=True))
+            pks = index.lookup(terms, allowed=allowed, limit=limit)
+        else:
+            pks = index.lookup(terms, scope_values=set(team_ids), limit=limit)
+    # Re-read the chosen rows so labels are current and vanished rows drop out.
+    rows = {row['id']: row for row in scoped.filter(pk__in=pks).values(*source.values)}
+    return [_result(source, rows[pk]) for pk in pks if pk in rows]
+
+
+def _on_save(sender, instance, update_fields=None, **kwargs):
+    for source in SOURCES.values():
+        if sender is not source.model():
+            continue
+        tracked = {*source.indexed, *filter(None, [source.active])}
+        if update_fields is not None and not tracked & set(update_fields):
+            return  # e.g. last_login or a password change
+        row = None
+        if not source.active or getattr(instance, source.active):
+            row = {column: getattr(instance, column) for column in source.indexed}
+        MEMORY_INDEXES[source.name].changed(instance.pk, row)
+
+
+def _on_delete(sender, instance, **kwargs):
+    for source in SOURCES.values():
+        if sender is source.model():
+            MEMORY_INDEXES[source.name].changed(instance.pk)
+
+
+def connect_signals():
+    from django.db.models.signals import post_delete, post_save
+
+    for source in SOURCES.values():
+        post_save.connect(_on_save, sender=source.model(), dispatch_uid=f'typeahead-save-{source.name}')
+        post_delete.connect(_on_delete, sender=source.model(), dispatch_uid=f'typeahead-delete-{source.name}')
+
+
+def install(connection):
+    """Create the pg_trgm extension and indexes (PostgreSQL only)."""
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for source in SOURCES.values():
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {source.table}_typeahead_trgm ON {source.table} "
+                f"USING GIN (({source.trgm_expression}) gin_trgm_ops)"
+            )
+
+
+def uninstall(connection):
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        for source in SOURCES.values():
+            cursor.execute(f"DROP INDEX IF EXISTS {source.table}_typeahead_trgm")
@@ -0,0 +1,85 @@
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.search.engine import search as run_search, terms
+from apps.search.indexes import INDEXES
+from apps.search.typeahead import SOURCES, suggest
+from apps.teams.membership import get_memberships
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+TYPEAHEAD_LIMIT = 10
+TYPEAHEAD_MAX_LIMIT = 20
+
+
+def _limit(request, default, maximum):
+    try:
+        return min(max(int(request.query_params.get('limit', default)), 1), maximum)
+    except ValueError:
+        return default
+
+
+def _types(request, known):
+    """The comma-separated ``type`` parameter (default: all), or the unknown ones."""
+    types = [t for t in request.query_params.get('type', '').split(',') if t] or list(known)
+    return types, set(types) - set(known)
+
+
+@extend_schema(parameters=[
+    OpenApiParameter('q', str, required=True, description="Words to find (prefix match, all required)."),
+    OpenApiParameter('type', str, description="Comma-separated subset of: task, comment, project."),
+    OpenApiParameter('limit', int, description=f"Maximum results (default {DEFAULT_LIMIT}, max {MAX_LIMIT})."),
+])
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search(request):
+    """Ranked full-text search over the tasks, comments and projects of the user's teams."""
+    query = request.query_params.get('q', '').strip()
+    if not terms(query):
+        return Response({'detail': 'Query parameter "q" is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    types, unknown = _types(request, INDEXES)
+    if unknown:
+        return Response({'detail': f"Unknown type: {', '.join(sorted(unknown))}."},
+                        status=status.HTTP_400_BAD_REQUEST)
+    limit = _limit(request, DEFAULT_LIMIT, MAX_LIMIT)
+
+    results = run_search(get_memberships(request).team_ids(), query, types=types, limit=limit)
+    return Response({'query': query, 'results': results})
+
+
+@extend_schema(parameters=[
+    OpenApiParameter('q', str, required=True, description="What the user has typed so far."),
+    OpenApiParameter('type', str, description="Comma-separated subset of: user, project."),
+    OpenApiParameter('team', int, description="Only members or projects of this team."),
+    OpenApiParameter('limit', int, description=f"Maximum results per type "
+                                               f"(default {TYPEAHEAD_LIMIT}, max {TYPEAHEAD_MAX_LIMIT})."),
+])
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def typeahead(request):
+    """Picker suggestions: co-members of the user's teams and the projects of those teams."""
+    query = request.query_params.get('q', '').strip()
+    types, unknown = _types(request, SOURCES)
+    if unknown:
+        return Response({'detail': f"Unknown type: {', '.join(sorted(unknown))}."},
+                        status=status.HTTP_400_BAD_REQUEST)
+    limit = _limit(request, TYPEAHEAD_LIMIT, TYPEAHEAD_MAX_LIMIT)
+
+    memberships = get_memberships(request)
+    team_ids = memberships.team_ids()
+    team = request.query_params.get('team')
+    if team is not None:
+        if not team.isdigit():
+            return Response({'detail': 'Query parameter "team" must be a team id.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not memberships.is_member(int(team)):
+            raise PermissionDenied("You're not a member of this team.")
+        team_ids = {int(team)}
+
+    results = [hit for name in types for hit in suggest(name, query, team_ids, limit=limit)]
+    return Response({'query': query, 'results': results})
@@ -8,9 +8,11 @@ from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 
 from apps.comments.permissions import IsProjectTeamMember
+from apps.notify.services import publish_board
 from apps.taskfiles.models import TaskFile
 from apps.taskfiles.serializers import TaskFileSerializer
 from apps.tasks.models import Task
+from apps.teams.membership import get_memberships
 
 
 @api_view(["GET"])
@@ -18,13 +20,13 @@ from apps.tasks.models import Task
 def download_task_file(request, project_id, task_id, file_id):
     """Stream a task's file as an attachment, restricted to the project's team members."""
     file_obj = get_object_or_404(
-        TaskFile,
+        TaskFile.objects.select_related('task__project'),
         id=file_id,
         task__id=task_id,
         task__project__id=project_id
     )
 
-    if not file_obj.task.project.team.has_member(request.user):
+    if not get_memberships(request).is_member(file_obj.task.project.team_id):
         raise PermissionDenied("You are not a member of this team.")
 
     file_path = file_obj.file.path
@@ -47,19 +49,36 @@ class TaskFileViewSet(viewsets.ModelViewSet):
     serializer_class = TaskFileSerializer
     permission_classes = [permissions.IsAuthenticated, IsProjectTeamMember]
 
-    def get_queryset(self):
-        task = get_object_or_404(Task, id=self.kwargs['task_pk'])
-
-        if not task.project.team.has_member(self.request.user):
-            raise PermissionDenied("You are not a member of this team.")
+    def get_task(self):
+        """The task from the URL, fetched and membership-checked once per request."""
+        if not hasattr(self, '_task'):
+            task = get_object_or_404(Task.objects.select_related('project'), id=self.kwargs['task_pk'])
+            if not get_memberships(self.request).is_member(task.project.team_id):
+                raise PermissionDenied("You are not a member of this team.")
+            self._task = task
+        return self._task
 
-        return TaskFile.objects.filter(task=task).order_by("-uploaded_at")
+    def get_queryset(self):
+        return (
+            TaskFile.objects.filter(task=self.get_task())
+            .select_related('task__project', 'uploaded_by')
+            .order_by("-uploaded_at")
+        )
+
+    def _publish(self, changed=(), deleted=()):
+        """Push the attachment change to the task's open boards."""
+        task = self.get_task()
+        publish_board(
+            task.project_id, 'file', task=task.id, deleted=deleted,
+            changed=TaskFileSerializer(changed, many=True, context=self.get_serializer_context()).data,
+        )
 
     def perform_create(self, serializer):
-        task = get_object_or_404(Task, id=self.kwargs['task_pk'])
-
-        if not task.project.team.has_member(self.request.user):
-            raise PermissionDenied("You are not a member of this team.")
+        task_file = serializer.save(task=self.get_task(), uploaded_by=self.request.user)
+        self._publish(changed=[task_file])
 
-        serializer.save(task=task, uploaded_by=self.request.user)
+    def perform_destroy(self, instance):
+        file_id = instance.id
+        instance.delete()
+        self._publish(deleted=[file_id])
 
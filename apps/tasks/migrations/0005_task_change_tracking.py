@@ -0,0 +1,61 @@
+# Generated by Django 5.2 on 2026-10-18 20:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+
+
+def stamp_existing_tasks(apps, schema_editor):
+    """Give existing tasks a version above 0 so a ``since=0`` sync returns them."""
+    Project = apps.get_model('projects', 'Project')
+    Task = apps.get_model('tasks', 'Task')
+    Project.objects.update(version=F('version') + 1)
+    Task.objects.update(
+        version=Subquery(Project.objects.filter(pk=OuterRef('project_id')).values('version')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_version'),
+        ('tasks', '0004_alter_task_assigned_to_alter_task_status_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.PositiveIntegerField()),
+                ('version', models.PositiveIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'version'], name='tasks_task_project_b1ea6c_idx'),
+        ),
+        migrations.AddField(
+            model_name='tasktombstone',
+            name='project',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_tombstones', to='projects.project'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['project', 'version'], name='tasks_taskt_project_912bc4_idx'),
+        ),
+        migrations.RunPython(stamp_existing_tasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_project_teams(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    Project = apps.get_model('projects', 'Project')
+    Task.objects.update(team_id=Subquery(Project.objects.filter(pk=OuterRef('project_id')).values('team_id')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_change_tracking'),
+        ('teams', '0006_team_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='team',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='teams.team'),
+        ),
+        migrations.RunPython(copy_project_teams, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='task',
+            name='team',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='teams.team'),
+        ),
+    ]
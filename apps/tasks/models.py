@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 
 from apps.projects.models import Project
+from apps.teams.models import Team
 from apps.users.models import CustomUser
 
 
@@ -26,18 +27,55 @@ class Task(models.Model):
     title = models.CharField(max_length=255, blank=False)
     description = models.TextField(blank=True)
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='tasks')
+    # Copy of ``project.team`` so permission filters need no join. Set on every
+    # save and rewritten by ``Project.save()`` when the project moves team.
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='+', editable=False)
     assigned_to = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True)
     status = models.CharField(max_length=11, choices=STATUS_CHOICES, db_index=True)
     priority = models.CharField(max_length=6, choices=PRIORITY_CHOICES)
     due_date = models.DateTimeField()
     created_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='task_created')
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    # The project's version at the time of the last write: a client that has
+    # synced up to version N asks for the tasks with version > N.
+    version = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         indexes = [
             models.Index(fields=['project', 'status']),
             models.Index(fields=['project', '-created_at']),
+            models.Index(fields=['project', 'version']),
         ]
 
     def __str__(self):
         return f"{self.title} (assigned to: {self.assigned_to})"
+
+    def save(self, *args, **kwargs):
+        self.team_id = self.project.team_id
+        with transaction.atomic():
+            self.version = Project.next_version(self.project_id)
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            TaskTombstone.objects.create(
+                project_id=self.project_id, task_id=self.pk,
+                version=Project.next_version(self.project_id),
+            )
+            return super().delete(*args, **kwargs)
+
+
+class TaskTombstone(models.Model):
+    """Marks a deleted task so delta syncs can tell clients to drop it."""
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='task_tombstones')
+    task_id = models.PositiveIntegerField()
+    version = models.PositiveIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['project', 'version'])]
+
+    def __str__(self):
+        return f"Deleted task #{self.task_id} (project {self.project_id}, v{self.version})"
@@ -3,6 +3,7 @@ from rest_framework import serializers
 
 from apps.projects.models import Project
 from apps.tasks.models import Task
+from apps.teams.membership import get_memberships
 from apps.users.models import CustomUser
 
 
@@ -31,6 +32,8 @@ class TaskSerializer(serializers.ModelSerializer):
             'created_by',
             'project',
             'created_at',
+            'updated_at',
+            'version',
             'can_manage',
         ]
 
@@ -45,12 +48,17 @@ class TaskSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         if not request or not request.user.is_authenticated:
             return False
-        # Memoize per team within one serialization pass (avoids N+1 in lists).
-        cache = self.context.setdefault("_can_manage_cache", {})
-        team_id = obj.project.team_id
-        if team_id not in cache:
-            cache[team_id] = obj.project.team.can_manage_tasks(request.user)
-        return cache[team_id]
+        # Answered from the request's membership resolver (no N+1 in lists).
+        return get_memberships(request).can_manage_tasks(obj.project.team_id)
+
+
+class TaskDeltaSerializer(TaskSerializer):
+    """A task as pushed to every open board; ``can_manage`` depends on the viewer, so it is left out."""
+
+    can_manage = None
+
+    class Meta(TaskSerializer.Meta):
+        fields = [field for field in TaskSerializer.Meta.fields if field != 'can_manage']
 
 
 class TaskCreateSerializer(serializers.ModelSerializer):
@@ -107,4 +115,52 @@ class TaskStatusSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
-        fields = ['status']
\ No newline at end of file
+        fields = ['status']
+
+
+class TaskBulkItemSerializer(TaskCreateSerializer):
+    """One task of a bulk create; the project comes from the URL."""
+
+    class Meta(TaskCreateSerializer.Meta):
+        fields = [field for field in TaskCreateSerializer.Meta.fields if field != 'project']
+
+
+class TaskBulkSerializer(serializers.Serializer):
+    """A batch of task changes applied in one transaction.
+
+    ``op`` selects the operation: ``create`` takes ``tasks``; ``status``,
+    ``reassign`` and ``delete`` take the task ``ids`` plus the new ``status``
+    or ``assigned_to`` (null unassigns).
+    """
+
+    OP_CREATE = 'create'
+    OP_STATUS = 'status'
+    OP_REASSIGN = 'reassign'
+    OP_DELETE = 'delete'
+    OP_CHOICES = [OP_CREATE, OP_STATUS, OP_REASSIGN, OP_DELETE]
+    MAX_BATCH = 500
+
+    op = serializers.ChoiceField(choices=OP_CHOICES)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False, max_length=MAX_BATCH,
+    )
+    tasks = TaskBulkItemSerializer(many=True, required=False, allow_empty=False, max_length=MAX_BATCH)
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    assigned_to = serializers.PrimaryKeyRelatedField(
+        queryset=CustomUser.objects.all(), required=False, allow_null=True,
+    )
+
+    def validate(self, attrs):
+        op = attrs['op']
+        required = {
+            self.OP_CREATE: ['tasks'],
+            self.OP_STATUS: ['ids', 'status'],
+            self.OP_REASSIGN: ['ids', 'assigned_to'],
+            self.OP_DELETE: ['ids'],
+        }[op]
+        missing = {field: f"This field is required for '{op}'." for field in required if field not in attrs}
+        if missing:
+            raise serializers.ValidationError(missing)
+        if 'ids' in attrs:
+            attrs['ids'] = list(dict.fromkeys(attrs['ids']))
+        return attrs
@@ -1,46 +1,87 @@
+from django.db import transaction
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets, permissions, filters
-from rest_framework.exceptions import PermissionDenied
+from rest_framework import viewsets, permissions, filters, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
 
-from apps.logs.services import log_activity
-from apps.notify.services import notify_user, notify_team
+from apps.common.cache import CachedResponseMixin
+from apps.common.conditional import ConditionalGetMixin
+from apps.common.pagination import PageOrCursorPagination
+from apps.logs.services import log_activities, log_activity
+from apps.notify.services import notify_user, notify_team, publish_board
 from apps.projects.models import Project
 from apps.projects.permissions import IsTeamMember
-from apps.tasks.models import Task
+from apps.search.filters import FullTextSearchFilter
+from apps.teams.membership import get_memberships
+from apps.teams.models import TeamMembership
+from apps.tasks.models import Task, TaskTombstone
 from apps.tasks.serializers import (
-    TaskSerializer, TaskCreateSerializer, TaskUpdateSerializer, TaskStatusSerializer,
+    TaskSerializer, TaskCreateSerializer, TaskUpdateSerializer, TaskStatusSerializer, TaskBulkSerializer,
+    TaskDeltaSerializer,
 )
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+def _publish_tasks(project, version, changed=(), deleted=()):
+    """Push the tasks written under board ``version`` to the project's open boards."""
+    publish_board(
+        project.id, 'task', changed=TaskDeltaSerializer(changed, many=True).data, deleted=deleted, version=version,
+    )
+
+
+def _tasks_phrase(tasks):
+    """``task 'Title'`` for one task, ``N tasks`` for several (notification text)."""
+    if len(tasks) == 1:
+        return f"task '{tasks[0].title}'"
+    return f"{len(tasks)} tasks"
+
+
+class TaskViewSet(ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """Tasks within a project. Create/update/delete emit notifications and activity logs."""
 
     queryset = Task.objects.all()
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['status', 'priority', 'assigned_to', 'project']
     ordering_fields = ['due_date', 'created_at']
     search_fields = ['title', 'description']
+    search_index = 'task'
+    pagination_class = PageOrCursorPagination
+    cursor_ordering = '-id'
+    cache_name = 'tasks'
 
     def get_permissions(self):
         # Team membership is required everywhere; role-based rules (admin/manager
         # manage tasks, developers only move status) are enforced in perform_*.
         return [permissions.IsAuthenticated(), IsTeamMember()]
 
+    def get_project(self):
+        """The project from the URL, fetched once per request."""
+        if not hasattr(self, '_project'):
+            self._project = get_object_or_404(
+                Project.objects.select_related('team'), id=self.kwargs.get('project_pk')
+            )
+        return self._project
+
+    def get_etag_stamp(self):
+        # Project.version moves with every task write in the project and
+        # Team.version with every membership change (roles drive can_manage).
+        project = self.get_project()
+        return (project.version, project.team.version)
+
     def _team_role(self):
-        project = get_object_or_404(Project, id=self.kwargs.get('project_pk'))
-        return project.team.member_role(self.request.user)
+        return get_memberships(self.request).role(self.get_project().team_id)
 
     def get_queryset(self):
         project_id = self.kwargs.get('project_pk')
         return (
             Task.objects.filter(
-                project__id=project_id,
-                project__team__membership_set__user=self.request.user,
-                project__team__membership_set__status='accepted',
+                project_id=project_id,
+                team_id__in=get_memberships(self.request).team_ids(),
             )
-            .select_related('project', 'assigned_to', 'created_by')
+            .select_related('project__team', 'assigned_to', 'created_by')
             .order_by("-id")
         )
 
@@ -56,12 +97,12 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         """Validate team membership and assignee, save, notify the assignee and log the activity."""
-        project_id = self.kwargs.get('project_pk')
-        project = get_object_or_404(Project, id=project_id)
+        project = self.get_project()
+        memberships = get_memberships(self.request)
 
-        if not project.team.has_member(self.request.user):
+        if not memberships.is_member(project.team_id):
             raise PermissionDenied("You're not a member of this team.")
-        if not project.team.can_manage_tasks(self.request.user):
+        if not memberships.can_manage_tasks(project.team_id):
             raise PermissionDenied("Only admins and managers can create tasks.")
 
         assigned_user = serializer.validated_data.get('assigned_to')
@@ -69,6 +110,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Assigned user is not part of this team.")
 
         task = serializer.save(created_by=self.request.user, project=project)
+        _publish_tasks(project, task.version, changed=[task])
 
         notified_ids = {self.request.user.id}
         if assigned_user and assigned_user != self.request.user:
@@ -98,7 +140,7 @@ class TaskViewSet(viewsets.ModelViewSet):
     def perform_update(self, serializer):
         task = serializer.instance
         team = task.project.team
-        if not team.can_manage_tasks(self.request.user):
+        if not get_memberships(self.request).can_manage_tasks(team):
             # Developers may only move the status of tasks assigned to them.
             if task.assigned_to_id != self.request.user.id:
                 raise PermissionDenied("You can only update the status of tasks assigned to you.")
@@ -108,6 +150,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Assigned user is not part of this team.")
 
         task = serializer.save()
+        _publish_tasks(task.project, task.version, changed=[task])
 
         log_activity(
             user=self.request.user,
@@ -126,9 +169,9 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     def perform_destroy(self, instance):
         team = instance.project.team
-        if not team.can_manage_tasks(self.request.user):
+        if not get_memberships(self.request).can_manage_tasks(team):
             raise PermissionDenied("Only admins and managers can delete tasks.")
-        title = instance.title
+        title, task_id, project = instance.title, instance.id, instance.project
         log_activity(
             user=self.request.user,
             action='deleted',
@@ -138,6 +181,11 @@ class TaskViewSet(viewsets.ModelViewSet):
             project=instance.project
         )
         instance.delete()
+        version = (
+            TaskTombstone.objects.filter(project=project, task_id=task_id)
+            .order_by('-version').values_list('version', flat=True).first()
+        )
+        _publish_tasks(project, version, deleted=[task_id])
         notify_team(
             team,
             f"{self.request.user.first_name} deleted task '{title}'",
@@ -145,6 +193,170 @@ class TaskViewSet(viewsets.ModelViewSet):
             type='task',
         )
 
+    @action(detail=False, methods=['get'])
+    def changes(self, request, project_pk=None):
+        """Delta sync: tasks created, updated or deleted after version ``?since=``.
+
+        Returns the project's current ``version`` (the next ``since``), the
+        changed tasks and the ids of deleted ones; ``since=0`` loads the board.
+        """
+        since = request.query_params.get('since', '')
+        if not since.isdigit():
+            raise ValidationError({'since': 'A version number (0 or greater) is required.'})
+        project = self.get_project()
+        if not get_memberships(request).is_member(project.team_id):
+            raise PermissionDenied("You're not a member of this team.")
+        # Bound both sides by the version read with the project, so rows
+        # written during this request are picked up by the next sync instead.
+        window = {'version__gt': int(since), 'version__lte': project.version}
+        changed = self.get_queryset().filter(**window).order_by('version')
+        deleted = TaskTombstone.objects.filter(project=project, **window).values_list('task_id', flat=True)
+        return Response({
+            'version': project.version,
+            'changed': TaskSerializer(changed, many=True, context=self.get_serializer_context()).data,
+            'deleted': list(deleted),
+        })
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, project_pk=None):
+        """Create, move, reassign or delete many tasks of the project at once.
+
+        Permissions are checked once for the whole batch, the rows are written
+        with ``bulk_create``/``bulk_update`` in one transaction under a single
+        board version, and the team gets one notification per batch. The
+        response has the ``changes`` shape: ``{version, changed, deleted}``.
+        """
+        serializer = TaskBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        op = data['op']
+
+        project = self.get_project()
+        memberships = get_memberships(request)
+        if not memberships.is_member(project.team_id):
+            raise PermissionDenied("You're not a member of this team.")
+        can_manage = memberships.can_manage_tasks(project.team_id)
+        if op != TaskBulkSerializer.OP_STATUS and not can_manage:
+            raise PermissionDenied("Only admins and managers can create, reassign or delete tasks.")
+        self._check_bulk_assignees(project, data)
+
+        with transaction.atomic():
+            version = Project.next_version(project.id)
+            if op == TaskBulkSerializer.OP_CREATE:
+                tasks = changed = self._bulk_create(project, data['tasks'], version)
+                deleted = []
+            else:
+                tasks = self._lock_bulk_tasks(project, data['ids'])
+                if op == TaskBulkSerializer.OP_STATUS and not can_manage:
+                    if any(task.assigned_to_id != request.user.id for task in tasks):
+                        raise PermissionDenied("You can only update the status of tasks assigned to you.")
+                if op == TaskBulkSerializer.OP_DELETE:
+                    changed, deleted = [], self._bulk_delete(project, tasks, version)
+                else:
+                    field = 'status' if op == TaskBulkSerializer.OP_STATUS else 'assigned_to'
+                    changed, deleted = self._bulk_set(tasks, field, data[field], version), []
+            log_activities(
+                user=request.user,
+                action={TaskBulkSerializer.OP_CREATE: 'created', TaskBulkSerializer.OP_DELETE: 'deleted'}.get(op, 'updated'),
+                target_type='task',
+                targets=[(task.id, f"Task: {task.title}") for task in tasks],
+                project=project,
+            )
+        _publish_tasks(project, version, changed=changed, deleted=deleted)
+        self._notify_bulk(project, op, tasks, data)
+
+        return Response(
+            {
+                'version': version,
+                'changed': TaskSerializer(changed, many=True, context=self.get_serializer_context()).data,
+                'deleted': deleted,
+            },
+            status=status.HTTP_201_CREATED if op == TaskBulkSerializer.OP_CREATE else status.HTTP_200_OK,
+        )
+
+    def _check_bulk_assignees(self, project, data):
+        """Every assignee in the batch must be an accepted member (one query)."""
+        assignees = {item.get('assigned_to') for item in data.get('tasks', ())}
+        assignees.add(data.get('assigned_to'))
+        assignees.discard(None)
+        if not assignees:
+            return
+        member_ids = set(
+            TeamMembership.objects.filter(
+                team_id=project.team_id, status=TeamMembership.STATUS_ACCEPTED,
+                user__in=assignees,
+            ).values_list('user_id', flat=True)
+        )
+        if any(user.id not in member_ids for user in assignees):
+            raise PermissionDenied("Assigned user is not part of this team.")
+
+    def _lock_bulk_tasks(self, project, ids):
+        tasks = list(
+            Task.objects.select_for_update(of=('self',))
+            .filter(project=project, id__in=ids)
+            .select_related('assigned_to', 'created_by')
+        )
+        missing = set(ids) - {task.id for task in tasks}
+        if missing:
+            raise ValidationError({'ids': f"Not tasks of this project: {sorted(missing)}."})
+        for task in tasks:
+            task.project = project
+        return tasks
+
+    def _bulk_create(self, project, items, version):
+        tasks = [
+            Task(**item, project=project, team_id=project.team_id, created_by=self.request.user, version=version)
+            for item in items
+        ]
+        return Task.objects.bulk_create(tasks)
+
+    def _bulk_set(self, tasks, field, value, version):
+        now = timezone.now()
+        for task in tasks:
+            setattr(task, field, value)
+            task.version = version
+            task.updated_at = now
+        Task.objects.bulk_update(tasks, [field, 'version', 'updated_at'])
+        return tasks
+
+    def _bulk_delete(self, project, tasks, version):
+        ids = [task.id for task in tasks]
+        TaskTombstone.objects.bulk_create(
+            [TaskTombstone(project=project, task_id=task_id, version=version) for task_id in ids]
+        )
+        Task.objects.filter(id__in=ids).delete()
+        return ids
+
+    def _notify_bulk(self, project, op, tasks, data):
+        """One notification per new assignee and one for the rest of the team."""
+        actor = self.request.user
+        notified_ids = {actor.id}
+        if op in (TaskBulkSerializer.OP_CREATE, TaskBulkSerializer.OP_REASSIGN):
+            by_assignee = {}
+            for task in tasks:
+                if task.assigned_to_id and task.assigned_to_id != actor.id:
+                    by_assignee.setdefault(task.assigned_to, []).append(task)
+            for assignee, assigned in by_assignee.items():
+                if len(assigned) == 1:
+                    message = f"New task assigned: {assigned[0].title}"
+                else:
+                    message = f"{len(assigned)} new tasks assigned to you in '{project.name}'"
+                notify_user(
+                    user=assignee,
+                    message=message,
+                    email_subject="New Task Assigned",
+                    email_body=f"You have been assigned {_tasks_phrase(assigned)} in project '{project.name}'.",
+                )
+                notified_ids.add(assignee.id)
+
+        phrase = _tasks_phrase(tasks)
+        message = {
+            TaskBulkSerializer.OP_CREATE: f"{actor.first_name} added {phrase}",
+            TaskBulkSerializer.OP_REASSIGN: f"{actor.first_name} reassigned {phrase}",
+            TaskBulkSerializer.OP_DELETE: f"{actor.first_name} deleted {phrase}",
+        }.get(op) or f"{actor.first_name} moved {phrase} to {dict(Task.STATUS_CHOICES)[data.get('status')]}"
+        notify_team(project.team, message, exclude_user_ids=notified_ids, type='task')
+
 
 class MyTaskViewSet(viewsets.ReadOnlyModelViewSet):
     """Read-only list of tasks the current user created or is assigned to."""
@@ -152,6 +364,10 @@ class MyTaskViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Task.objects.none()  # actual rows come from get_queryset; set for schema generation
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PageOrCursorPagination
+    # Walks the primary key: no index covers created_at under the OR filter,
+    # and ids follow creation order anyway.
+    cursor_ordering = '-id'
 
     def get_queryset(self):
         user = self.request.user
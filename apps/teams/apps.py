@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class TeamsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.teams'
+
+    def ready(self):
+        # Forget cached roles and bump the team stamp on every membership change.
+        from apps.teams.membership import connect_signals
+        connect_signals()
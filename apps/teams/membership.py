@@ -0,0 +1,101 @@
+"""Request-scoped team membership lookups.
+
+Permissions, views and serializers all ask for the caller's role on a team. The
+resolver loads every accepted membership of the user the first time it is
+needed and answers every later check from memory, so a request pays for at most
+one membership query no matter how many checks it runs. The loaded roles are
+also kept in the shared cache, so most requests pay for none: the
+``post_save``/``post_delete`` receivers below forget the entry whenever one of
+the user's memberships is saved or deleted, including queryset and admin bulk
+deletes and the cascades of team and user deletion.
+"""
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.teams.models import Team, TeamMembership
+
+MANAGER_ROLES = (TeamMembership.ROLE_ADMIN, TeamMembership.ROLE_MANAGER)
+_ROLES_KEY = 'memberships:user:{}'
+# Safety net for membership rows changed by ``QuerySet.update()``, which sends no signal.
+ROLES_CACHE_TIMEOUT = 600
+
+
+def forget_memberships(*user_ids):
+    """Drop the cached roles of the given users after their memberships change.
+
+    Forgotten again on commit, in case a concurrent request cached the
+    pre-commit roles in between.
+    """
+    keys = [_ROLES_KEY.format(user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def membership_changed(sender, instance, **kwargs):
+    """Signal receiver: advance the team's change stamp and forget the member's cached roles."""
+    Team.bump_versions(instance.team_id)
+    forget_memberships(instance.user_id)
+
+
+def connect_signals():
+    from django.db.models.signals import post_delete, post_save
+
+    post_save.connect(membership_changed, sender=TeamMembership, dispatch_uid='team-membership-save')
+    post_delete.connect(membership_changed, sender=TeamMembership, dispatch_uid='team-membership-delete')
+
+
+def _team_id(team):
+    """Accept a Team instance or a bare team id."""
+    return getattr(team, 'pk', team)
+
+
+class MembershipResolver:
+    """The accepted team roles of one user, loaded lazily and at most once."""
+
+    def __init__(self, user):
+        self.user = user
+        self._roles = None
+
+    @property
+    def roles(self):
+        """Mapping of team id -> role for the user's accepted memberships."""
+        if self._roles is None:
+            if self.user is None or not self.user.is_authenticated:
+                self._roles = {}
+            else:
+                key = _ROLES_KEY.format(self.user.pk)
+                self._roles = cache.get(key)
+                if self._roles is None:
+                    self._roles = dict(
+                        TeamMembership.objects.filter(
+                            user=self.user, status=TeamMembership.STATUS_ACCEPTED
+                        ).values_list('team_id', 'role')
+                    )
+                    cache.set(key, self._roles, ROLES_CACHE_TIMEOUT)
+        return self._roles
+
+    def team_ids(self):
+        return set(self.roles)
+
+    def role(self, team):
+        """Role of the user on the team, or None if not an accepted member."""
+        return self.roles.get(_team_id(team))
+
+    def is_member(self, team):
+        return _team_id(team) in self.roles
+
+    def is_admin(self, team):
+        return self.role(team) == TeamMembership.ROLE_ADMIN
+
+    def can_manage_tasks(self, team):
+        """Admins and managers may create/edit/delete tasks."""
+        return self.role(team) in MANAGER_ROLES
+
+
+def get_memberships(request):
+    """The membership resolver for ``request.user``, created once per request."""
+    resolver = getattr(request, '_membership_resolver', None)
+    if resolver is None or resolver.user is not request.user:
+        resolver = MembershipResolver(request.user)
+        request._membership_resolver = resolver
+    return resolver
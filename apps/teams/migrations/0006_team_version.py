@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 20:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0005_teammembership_invite_token_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 21:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0006_team_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teammembership',
+            name='hourly_rate',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True),
+        ),
+    ]
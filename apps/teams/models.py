@@ -14,10 +14,27 @@ class Team(models.Model):
         CustomUser, through='TeamMembership', through_fields=('team', 'user'),
         related_name='teams_joined',
     )
+    # Change stamp: incremented whenever the team or one of its memberships
+    # changes (memberships through the receivers in apps.teams.membership).
+    # Part of the ETags of team-scoped responses.
+    version = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        bump = not self._state.adding
+        if bump:
+            self.version = models.F('version') + 1
+        super().save(*args, **kwargs)
+        if bump:
+            self.refresh_from_db(fields=['version'])
+
+    @classmethod
+    def bump_versions(cls, *team_ids):
+        """Advance the change stamp of the given teams without loading them."""
+        cls.objects.filter(pk__in=team_ids).update(version=models.F('version') + 1)
+
     def has_member(self, user):
         """True if the user is an accepted member of this team."""
         return self.membership_set.filter(
@@ -74,6 +91,9 @@ class TeamMembership(models.Model):
     )
     invite_token = models.UUIDField(null=True, blank=True, editable=False, db_index=True)
     joined_at = models.DateTimeField(auto_now_add=True, editable=False)
+    # Cost of an hour of this member's time in the team's budgets; when unset,
+    # settings.TIME_REPORT_DEFAULT_HOURLY_RATE applies.
+    hourly_rate = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True)
 
     def is_pending(self):
         return self.status == self.STATUS_PENDING
@@ -1,5 +1,7 @@
 from rest_framework.permissions import BasePermission
 
+from apps.teams.membership import get_memberships
+
 
 class IsTeamAdmin(BasePermission):
     def has_permission(self, request, view):
@@ -8,4 +10,4 @@ class IsTeamAdmin(BasePermission):
         if not view.detail:
             return False
         team = view.get_object()
-        return team.has_admin(request.user)
+        return get_memberships(request).is_admin(team)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from apps.teams.membership import get_memberships
 from apps.teams.models import Team, TeamMembership
 
 
@@ -49,7 +50,7 @@ class TeamSerializer(serializers.ModelSerializer):
         return f"{obj.created_by.first_name} {obj.created_by.last_name}"
 
     def get_is_admin(self, obj) -> bool:
-        return obj.has_admin(self.context['request'].user)
+        return get_memberships(self.context['request']).is_admin(obj)
 
 
 class TeamCreateSerializer(serializers.ModelSerializer):
@@ -61,3 +62,8 @@ class TeamCreateSerializer(serializers.ModelSerializer):
 class InviteMemberSerializer(serializers.Serializer):
     email = serializers.EmailField()
     role = serializers.ChoiceField(choices=TeamMembership.ROLE_CHOICES, default='developer')
+
+
+class MemberRateSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField()
+    hourly_rate = serializers.DecimalField(max_digits=8, decimal_places=2, min_value=0, allow_null=True)
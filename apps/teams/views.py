@@ -1,20 +1,23 @@
 import uuid
 
 from django.conf import settings
-from django.core.mail import send_mail
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.exceptions import PermissionDenied, NotFound, ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-from apps.notify.services import notify_user
+from apps.common.cache import CachedResponseMixin
+from apps.common.conditional import ConditionalGetMixin
+from apps.jobs.queue import enqueue
+from apps.notify.services import notify_user, send_email
+from apps.teams.membership import get_memberships
 from apps.teams.models import Team, TeamMembership
 from apps.teams.permissions import IsTeamAdmin
 from apps.users.throttles import InviteRateThrottle
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 
-from apps.teams.serializers import TeamSerializer, TeamCreateSerializer, InviteMemberSerializer
+from apps.teams.serializers import TeamSerializer, TeamCreateSerializer, InviteMemberSerializer, MemberRateSerializer
 from apps.users.models import CustomUser
 from django.db.models import Q
 
@@ -31,13 +34,24 @@ def _invitee_name(membership):
     return f"{user.first_name} {user.last_name}".strip() or user.email
 
 
-class TeamViewSet(viewsets.ModelViewSet):
+class TeamViewSet(ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """Teams the user belongs to, plus actions to invite, accept/decline, remove and change roles."""
 
     queryset = Team.objects.all()
     serializer_class = TeamSerializer
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = "pk"
+    cache_name = 'teams'
+
+    def get_etag_stamp(self):
+        # Team.version moves with every edit of the team, its memberships and
+        # its members' profiles. The list also shows teams with a pending
+        # invite or created by the user, so stamp exactly the teams the
+        # queryset returns.
+        teams = self.get_queryset().order_by('id')
+        if self.action == 'retrieve':
+            teams = teams.filter(pk=self.kwargs['pk'])
+        return list(teams.values_list('id', 'version'))
 
     def get_queryset(self):
         return (
@@ -110,7 +124,7 @@ class TeamViewSet(viewsets.ModelViewSet):
             f"Accept:  {accept_link}\n"
             f"Decline: {decline_link}\n"
         )
-        send_mail(subject, message, None, [membership.user.email])  # None -> DEFAULT_FROM_EMAIL
+        enqueue(send_email, subject=subject, message=message, recipient_list=[membership.user.email])
 
     @action(detail=True, methods=['post'], url_path='accept-invite', permission_classes=[permissions.IsAuthenticated])
     def accept_invite(self, request, pk=None):
@@ -178,10 +192,24 @@ class TeamViewSet(viewsets.ModelViewSet):
         membership.save()
         return Response({'status': f'Role changed to {new_role}'})
 
+    @action(detail=True, methods=['post'], url_path='set-rate', permission_classes=[IsTeamAdmin])
+    def set_rate(self, request, pk=None):
+        """Set (or clear, with null) the hourly rate a member's time is priced at in budget reports."""
+        team = self.get_object()
+        serializer = MemberRateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        membership = TeamMembership.objects.filter(team=team, user_id=serializer.validated_data['user_id']).first()
+        if not membership:
+            raise NotFound("Membership not found.")
+        membership.hourly_rate = serializer.validated_data['hourly_rate']
+        membership.save()
+        return Response({'status': 'rate updated', 'hourly_rate': membership.hourly_rate})
+
     def destroy(self, request, *args, **kwargs):
         team = self.get_object()
 
-        if not team.has_admin(request.user):
+        if not get_memberships(request).is_admin(team):
             raise PermissionDenied("You must be team admin to delete this team.")
 
         team_name = team.name
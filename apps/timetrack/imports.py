@@ -0,0 +1,108 @@
+"""Bulk import of time entries from a JSON array, CSV or JSON Lines.
+
+Rows are handled a chunk at a time: each row's fields are validated, then one
+query loads the chunk's tasks (they must belong to the user's teams), valid
+rows are written with ``bulk_create`` and counted into the daily rollups per
+(user, task, day) rather than per entry. Input is consumed as an iterator, so
+a file of any size is read one chunk at a time.
+"""
+import csv
+import json
+from contextlib import nullcontext
+from itertools import islice
+
+from django.db import transaction
+
+from apps.tasks.models import Task
+from apps.timetrack import rollups
+from apps.timetrack.models import TimeEntry
+from apps.timetrack.serializers import TimeEntryImportRowSerializer
+
+CHUNK_SIZE = 500
+COLUMNS = ('task_id', 'date', 'minutes', 'note')
+
+
+class _Unreadable(dict):
+    """Stands in for a line that could not be parsed, so it is reported with its row number."""
+
+
+def csv_rows(lines):
+    """Rows of a CSV with a header line naming (at least) task_id, date and minutes."""
+    for row in csv.DictReader(lines):
+        yield {column: row[column] for column in COLUMNS if row.get(column) not in (None, '')}
+
+
+def jsonl_rows(lines):
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = _Unreadable()
+        yield row if isinstance(row, dict) else _Unreadable()
+
+
+def chunked(rows, size=CHUNK_SIZE):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _check(chunk, user, team_ids, first_row):
+    """Validate one chunk: the entries to create and the row errors."""
+    valid, errors = [], []
+    for number, row in enumerate(chunk, first_row):
+        if isinstance(row, _Unreadable) or not isinstance(row, dict):
+            errors.append({'row': number, 'errors': {'non_field_errors': ['Expected an object of entry fields.']}})
+            continue
+        serializer = TimeEntryImportRowSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((number, serializer.validated_data))
+        else:
+            errors.append({'row': number, 'errors': serializer.errors})
+
+    tasks = {
+        task_id: (project_id, team_id)
+        for task_id, project_id, team_id in Task.objects.filter(
+            id__in={data['task_id'] for _, data in valid}, team_id__in=team_ids,
+        ).values_list('id', 'project_id', 'team_id')
+    }
+    entries = []
+    for number, data in valid:
+        if data['task_id'] not in tasks:
+            errors.append({'row': number, 'errors': {'task_id': ['No such task on your teams.']}})
+            continue
+        project_id, team_id = tasks[data['task_id']]
+        entries.append(TimeEntry(user=user, project_id=project_id, team_id=team_id, **data))
+    errors.sort(key=lambda error: error['row'])
+    return entries, errors
+
+
+def import_entries(rows, user, team_ids, all_or_nothing=True, dry_run=False, chunk_size=CHUNK_SIZE):
+    """Create the user's time entries from ``rows``; returns (created count, row errors).
+
+    With ``dry_run`` nothing is written and the count is of the valid rows.
+
+    Rows are numbered from 1. With ``all_or_nothing`` a single invalid row
+    saves nothing (the remaining rows are still checked so every error is
+    reported); otherwise each chunk commits on its own and invalid rows are
+    skipped.
+    """
+    created, errors, first_row = 0, [], 1
+    with transaction.atomic() if all_or_nothing else nullcontext():
+        for chunk in chunked(rows, chunk_size):
+            entries, chunk_errors = _check(chunk, user, team_ids, first_row)
+            errors += chunk_errors
+            first_row += len(chunk)
+            if all_or_nothing and errors:
+                continue
+            if not dry_run:
+                with transaction.atomic():
+                    TimeEntry.objects.bulk_create(entries)
+                    rollups.add_entries(entries)
+            created += len(entries)
+        if all_or_nothing and errors:
+            transaction.set_rollback(True)
+            created = 0
+    return created, errors
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.teams.models import TeamMembership
+from apps.timetrack.imports import CHUNK_SIZE, csv_rows, import_entries, jsonl_rows
+from apps.users.models import CustomUser
+
+READERS = {'.csv': csv_rows, '.jsonl': jsonl_rows}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a user's time entries from a CSV (header: task_id,date,minutes,note) "
+        "or JSON Lines file, streaming it in chunks. Invalid rows are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="A .csv or .jsonl file.")
+        parser.add_argument("--user", required=True, help="Email of the user the time belongs to.")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows validated and inserted at a time.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate every row without saving anything.")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        reader = READERS.get(path.suffix.lower())
+        if reader is None:
+            raise CommandError(f"Unsupported file type {path.suffix!r}: expected .csv or .jsonl.")
+        try:
+            user = CustomUser.objects.get(email__iexact=options["user"])
+        except CustomUser.DoesNotExist:
+            raise CommandError(f"No user with email {options['user']!r}.")
+        team_ids = set(
+            TeamMembership.objects.filter(user=user, status=TeamMembership.STATUS_ACCEPTED).values_list("team_id", flat=True)
+        )
+
+        with path.open(encoding="utf-8-sig", newline="") as lines:
+            created, errors = import_entries(
+                reader(lines), user, team_ids, all_or_nothing=False,
+                dry_run=options["dry_run"], chunk_size=options["chunk_size"],
+            )
+        for error in errors:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        verb = "Would import" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {created} time entries; {len(errors)} invalid row(s) skipped."))
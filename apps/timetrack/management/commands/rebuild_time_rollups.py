@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.timetrack.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the daily time rollups from the time entries, e.g. after entries "
+        "were changed in bulk or imported without going through the model."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--team", type=int, action="append", dest="teams",
+            help="Only rebuild this team's rollups (repeatable). Default: every team.",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild(options["teams"])
+        scope = f"team(s) {', '.join(map(str, options['teams']))}" if options["teams"] else "all teams"
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} time rollup(s) for {scope}."))
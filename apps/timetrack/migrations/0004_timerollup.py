@@ -0,0 +1,47 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+
+
+def fill_rollups(apps, schema_editor):
+    TimeEntry = apps.get_model('timetrack', 'TimeEntry')
+    TimeRollup = apps.get_model('timetrack', 'TimeRollup')
+    totals = (
+        TimeEntry.objects.order_by()
+        .values('user_id', 'task_id', 'date', project_id=F('task__project_id'), team_id=F('task__team_id'))
+        .annotate(minutes=Sum('minutes'), entries=Count('id'))
+    )
+    TimeRollup.objects.bulk_create((TimeRollup(**row) for row in totals.iterator()), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_version'),
+        ('tasks', '0006_task_team'),
+        ('teams', '0006_team_version'),
+        ('timetrack', '0003_alter_timeentry_minutes_alter_timeentry_note_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimeRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('minutes', models.PositiveIntegerField(default=0)),
+                ('entries', models.PositiveIntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_rollups', to='projects.project')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tasks.task')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='teams.team')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['team', 'date'], name='timerollup_team_date_idx'), models.Index(fields=['project', 'date'], name='timerollup_project_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'task', 'date'), name='timerollup_user_task_date_uniq')],
+            },
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
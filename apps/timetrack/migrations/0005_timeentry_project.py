@@ -0,0 +1,40 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_task_projects(apps, schema_editor):
+    TimeEntry = apps.get_model('timetrack', 'TimeEntry')
+    Task = apps.get_model('tasks', 'Task')
+    TimeEntry.objects.update(project_id=Subquery(Task.objects.filter(pk=OuterRef('task_id')).values('project_id')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_version'),
+        ('tasks', '0006_task_team'),
+        ('timetrack', '0004_timerollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timeentry',
+            name='project',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.project'),
+        ),
+        migrations.RunPython(copy_task_projects, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='timeentry',
+            name='project',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.project'),
+        ),
+        migrations.RemoveIndex(
+            model_name='timeentry',
+            name='timetrack_t_user_id_5ec0d9_idx',
+        ),
+        migrations.AddIndex(
+            model_name='timeentry',
+            index=models.Index(fields=['user', 'date', 'minutes'], name='timeentry_user_date_min_idx'),
+        ),
+    ]
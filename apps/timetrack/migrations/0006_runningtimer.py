@@ -0,0 +1,28 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_team'),
+        ('teams', '0007_teammembership_hourly_rate'),
+        ('timetrack', '0005_timeentry_project'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RunningTimer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('note', models.TextField(blank=True, default='')),
+                ('started_at', models.DateTimeField()),
+                ('last_heartbeat', models.DateTimeField()),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tasks.task')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='teams.team')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='running_timer', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
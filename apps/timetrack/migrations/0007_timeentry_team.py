@@ -0,0 +1,32 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_task_teams(apps, schema_editor):
+    TimeEntry = apps.get_model('timetrack', 'TimeEntry')
+    Task = apps.get_model('tasks', 'Task')
+    TimeEntry.objects.update(team_id=Subquery(Task.objects.filter(pk=OuterRef('task_id')).values('team_id')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_team'),
+        ('teams', '0006_team_version'),
+        ('timetrack', '0006_runningtimer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timeentry',
+            name='team',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='teams.team'),
+        ),
+        migrations.RunPython(copy_task_teams, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='timeentry',
+            name='team',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='teams.team'),
+        ),
+    ]
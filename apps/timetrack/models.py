@@ -1,8 +1,10 @@
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 
+from apps.projects.models import Project
 from apps.tasks.models import Task
+from apps.teams.models import Team
 
 
 class TimeEntry(models.Model):
@@ -10,6 +12,10 @@ class TimeEntry(models.Model):
 
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="time_entries")
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="time_entries")
+    # Copies of task.project and task.team, kept by save() (and by Project.save()
+    # when the project moves team): filtering by project or team needs no join.
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="+", editable=False)
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="+", editable=False)
     date = models.DateField()
     minutes = models.PositiveIntegerField(validators=[MinValueValidator(1)])
     note = models.TextField(blank=True, default="")
@@ -18,10 +24,89 @@ class TimeEntry(models.Model):
     class Meta:
         ordering = ["-date", "-created_at"]
         indexes = [
-            models.Index(fields=["user", "date"]),
+            # Covers the summary: a user's minutes by date come from the index alone.
+            models.Index(fields=["user", "date", "minutes"], name="timeentry_user_date_min_idx"),
         ]
         # No (user, task, date) uniqueness on purpose: a user may log several
         # separate sessions (each with its own note) for the same task in a day.
 
     def __str__(self):
         return f"{self.user} - {self.task} ({self.minutes} min on {self.date})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._rolled_up = instance._rollup_key()
+        return instance
+
+    def _rollup_key(self):
+        return (self.user_id, self.task_id, self.date, self.minutes)
+
+    def save(self, *args, **kwargs):
+        from apps.timetrack import rollups
+
+        self.project_id = self.task.project_id
+        self.team_id = self.task.team_id
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            previous, current = getattr(self, '_rolled_up', None), self._rollup_key()
+            if previous != current:
+                if previous is not None:
+                    rollups.remove(*previous)
+                rollups.add(self.user_id, self.task, self.date, self.minutes)
+            self._rolled_up = current
+
+    def delete(self, *args, **kwargs):
+        from apps.timetrack import rollups
+
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            rollups.remove(*getattr(self, '_rolled_up', self._rollup_key()))
+        return result
+
+
+class RunningTimer(models.Model):
+    """A user's running timer, shared by all their devices; stopping it logs a TimeEntry."""
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="running_timer")
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="+")
+    # Copy of task.team, for the team's list of running timers.
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="+")
+    note = models.TextField(blank=True, default="")
+    started_at = models.DateTimeField()
+    # Last time a device showing the timer checked in; after
+    # TIMER_ABANDON_MINUTES without one the timer is abandoned (see timers.py).
+    last_heartbeat = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user} - {self.task} (since {self.started_at})"
+
+
+class TimeRollup(models.Model):
+    """Minutes one user logged on one task on one day, summed over their entries.
+
+    Maintained by ``TimeEntry.save()``/``delete()`` so reports never aggregate
+    raw entries. The project and team are copied from the task. Entries changed
+    in bulk (``QuerySet.update``/``delete``) bypass it; ``rebuild_time_rollups``
+    recomputes the table from the entries.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="+")
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="time_rollups")
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="+")
+    date = models.DateField()
+    minutes = models.PositiveIntegerField(default=0)
+    entries = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "task", "date"], name="timerollup_user_task_date_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["team", "date"], name="timerollup_team_date_idx"),
+            models.Index(fields=["project", "date"], name="timerollup_project_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.task_id} ({self.minutes} min on {self.date})"
@@ -0,0 +1,237 @@
+"""Daily time rollups: upkeep, rebuilding and team reports.
+
+Reports read ``TimeRollup`` rows (one per user, task and day) instead of
+summing raw ``TimeEntry`` rows: a team's month is at most members x tasks x
+days rows however many entries were logged, and each read is served by the
+(team, date) index. Every breakdown is one grouped query; time is priced in
+the same query, at each member's ``TeamMembership.hourly_rate`` (or
+``settings.TIME_REPORT_DEFAULT_HOURLY_RATE``).
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth, TruncWeek
+
+from apps.projects.models import Project
+from apps.teams.models import TeamMembership
+from apps.timetrack.models import TimeEntry, TimeRollup
+
+# Response column -> rollup lookup, per ``group_by`` dimension.
+GROUPS = {
+    'project': {'project': 'project_id', 'project_name': 'project__name'},
+    'task': {'task': 'task_id', 'task_title': 'task__title'},
+    'user': {
+        'user': 'user_id', 'user_email': 'user__email',
+        'user_first_name': 'user__first_name', 'user_last_name': 'user__last_name',
+    },
+}
+# ``bucket`` -> first day of the period a rollup's date falls in.
+BUCKETS = {
+    'day': F('date'),
+    'week': TruncWeek('date'),
+    'month': TruncMonth('date'),
+}
+CENT = Decimal('0.01')
+
+
+def add(user_id, task, date, minutes):
+    """Count one entry of ``minutes`` into its rollup row, creating it if needed."""
+    _upsert(user_id, task.pk, task.project_id, task.team_id, date, minutes, 1)
+
+
+def _upsert(user_id, task_id, project_id, team_id, date, minutes, entries):
+    key = TimeRollup.objects.filter(user_id=user_id, task_id=task_id, date=date)
+    if key.update(minutes=F('minutes') + minutes, entries=F('entries') + entries):
+        return
+    try:
+        with transaction.atomic():
+            TimeRollup.objects.create(
+                user_id=user_id, task_id=task_id, project_id=project_id, team_id=team_id,
+                date=date, minutes=minutes, entries=entries,
+            )
+    except IntegrityError:
+        # Another request created the row first.
+        key.update(minutes=F('minutes') + minutes, entries=F('entries') + entries)
+
+
+def add_entries(entries):
+    """Count freshly bulk-created entries in: one locked read, one bulk update, one bulk insert."""
+    totals = {}
+    for entry in entries:
+        key = (entry.user_id, entry.task_id, entry.date)
+        minutes, count = totals.get(key, (0, 0))
+        totals[key] = (minutes + entry.minutes, count + 1)
+    if not totals:
+        return
+    projects = {entry.task_id: entry.project_id for entry in entries}
+    task_teams = {entry.task_id: entry.team_id for entry in entries}
+
+    with transaction.atomic():
+        existing = TimeRollup.objects.select_for_update().filter(
+            user_id__in={key[0] for key in totals},
+            task_id__in={key[1] for key in totals},
+            date__in={key[2] for key in totals},
+        )
+        changed = []
+        for rollup in existing:
+            key = (rollup.user_id, rollup.task_id, rollup.date)
+            if key in totals:
+                minutes, count = totals.pop(key)
+                rollup.minutes += minutes
+                rollup.entries += count
+                changed.append(rollup)
+        TimeRollup.objects.bulk_update(changed, ['minutes', 'entries'])
+        try:
+            with transaction.atomic():
+                TimeRollup.objects.bulk_create([
+                    TimeRollup(
+                        user_id=user_id, task_id=task_id, project_id=projects[task_id], team_id=task_teams[task_id],
+                        date=date, minutes=minutes, entries=count,
+                    )
+                    for (user_id, task_id, date), (minutes, count) in totals.items()
+                ])
+        except IntegrityError:
+            # Another request created some of the rows first.
+            for (user_id, task_id, date), (minutes, count) in totals.items():
+                _upsert(user_id, task_id, projects[task_id], task_teams[task_id], date, minutes, count)
+
+
+def remove(user_id, task_id, date, minutes):
+    """Take one entry of ``minutes`` back out; the row goes with its last entry."""
+    key = TimeRollup.objects.filter(user_id=user_id, task_id=task_id, date=date)
+    key.filter(entries__lte=1).delete()
+    key.filter(entries__gt=1).update(minutes=F('minutes') - minutes, entries=F('entries') - 1)
+
+
+def rebuild(team_ids=None):
+    """Recompute the rollups (of the given teams, or all) from the entries. Returns the row count."""
+    entries = TimeEntry.objects.all()
+    rollups = TimeRollup.objects.all()
+    if team_ids:
+        entries = entries.filter(team_id__in=team_ids)
+        rollups = rollups.filter(team_id__in=team_ids)
+    totals = (
+        entries.order_by()
+        .values('user_id', 'task_id', 'project_id', 'team_id', 'date')
+        .annotate(minutes=Sum('minutes'), entries=Count('id'))
+    )
+    with transaction.atomic():
+        rollups.delete()
+        created = TimeRollup.objects.bulk_create(
+            (TimeRollup(**row) for row in totals.iterator(chunk_size=2000)), batch_size=1000,
+        )
+    return len(created)
+
+
+def _rate_minutes():
+    """Sum of minutes x hourly rate; divided by 60 (see ``_cost``) it is money."""
+    rate = TeamMembership.objects.filter(
+        team_id=OuterRef('team_id'), user_id=OuterRef('user_id'),
+    ).values('hourly_rate')[:1]
+    money = DecimalField(max_digits=20, decimal_places=2)
+    return Sum(
+        F('minutes') * Coalesce(Subquery(rate), Value(settings.TIME_REPORT_DEFAULT_HOURLY_RATE), output_field=money),
+        output_field=money,
+    )
+
+
+def _cost(rate_minutes):
+    return (Decimal(rate_minutes or 0) / 60).quantize(CENT)
+
+
+def grouped(team_id, start, end, groups, bucket=None):
+    """Minutes and cost per combination of ``groups`` (and ``bucket`` period), oldest period first."""
+    columns = {name: lookup for group in groups for name, lookup in GROUPS[group].items()}
+    rows = TimeRollup.objects.filter(team_id=team_id, date__range=(start, end))
+    order = []
+    if bucket:
+        rows = rows.annotate(period=BUCKETS[bucket])
+        columns['period'] = 'period'
+        order = ['period']
+    totals = (
+        rows.values(*columns.values())
+        .annotate(total=Sum('minutes'), rate_minutes=_rate_minutes())
+        .order_by(*order, '-total', *columns.values())
+    )
+    result = []
+    for row in totals:
+        item = {name: row[lookup] for name, lookup in columns.items()}
+        if bucket:
+            item['period'] = str(item['period'])
+        item.update(minutes=row['total'], cost=str(_cost(row['rate_minutes'])))
+        result.append(item)
+    return result
+
+
+def budget_burn(team_id, bucket='week'):
+    """Every project of the team with its budget, the cost of all time logged so far,
+    and the cumulative spend per ``bucket`` period (a burn-down series).
+    """
+    spend = defaultdict(list)
+    periods = (
+        TimeRollup.objects.filter(team_id=team_id)
+        .annotate(period=BUCKETS[bucket])
+        .values('project_id', 'period')
+        .annotate(total=Sum('minutes'), rate_minutes=_rate_minutes())
+        .order_by('project_id', 'period')
+    )
+    for row in periods:
+        spend[row['project_id']].append(row)
+
+    projects = []
+    for project in Project.objects.filter(team_id=team_id).order_by('name').values('id', 'name', 'budget', 'due_date'):
+        budget, spent, minutes, series = project['budget'], Decimal('0.00'), 0, []
+        for row in spend[project['id']]:
+            cost = _cost(row['rate_minutes'])
+            spent += cost
+            minutes += row['total']
+            series.append({
+                'period': str(row['period']), 'minutes': row['total'], 'cost': str(cost), 'spent': str(spent),
+                'remaining': None if budget is None else str(budget - spent),
+            })
+        projects.append({
+            'project': project['id'],
+            'name': project['name'],
+            'budget': None if budget is None else str(budget),
+            'due_date': project['due_date'] and str(project['due_date']),
+            'minutes': minutes,
+            'spent': str(spent),
+            'remaining': None if budget is None else str(budget - spent),
+            'burned_percent': float(round(spent / budget * 100, 1)) if budget else None,
+            'series': series,
+        })
+    return projects
+
+
+def team_report(team_id, start, end):
+    """Totals of one team between two dates (inclusive): overall, per project, per user, per week."""
+    rows = TimeRollup.objects.filter(team_id=team_id, date__range=(start, end)).order_by()
+    by_project = (
+        rows.values('project_id', 'project__name')
+        .annotate(total=Sum('minutes'))
+        .order_by('-total', 'project_id')
+    )
+    by_user = (
+        rows.values('user_id', 'user__first_name', 'user__last_name', 'user__email')
+        .annotate(total=Sum('minutes'))
+        .order_by('-total', 'user_id')
+    )
+    by_week = rows.annotate(week=TruncWeek('date')).values('week').annotate(total=Sum('minutes')).order_by('week')
+    return {
+        'total_minutes': rows.aggregate(total=Sum('minutes'))['total'] or 0,
+        'by_project': [
+            {'project': row['project_id'], 'name': row['project__name'], 'minutes': row['total']}
+            for row in by_project
+        ],
+        'by_user': [
+            {
+                'user': row['user_id'], 'first_name': row['user__first_name'],
+                'last_name': row['user__last_name'], 'email': row['user__email'], 'minutes': row['total'],
+            }
+            for row in by_user
+        ],
+        'by_week': [{'week': str(row['week']), 'minutes': row['total']} for row in by_week],
+    }
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import TimeEntry
 from ..tasks.models import Task
+from ..teams.membership import get_memberships
 
 
 class TaskShortSerializer(serializers.ModelSerializer):
@@ -22,11 +23,38 @@ class TimeEntrySerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         if request and request.user.is_authenticated:
             self.fields["task_id"].queryset = Task.objects.filter(
-                project__team__membership_set__user=request.user,
-                project__team__membership_set__status="accepted",
+                team_id__in=get_memberships(request).team_ids()
             )
 
     class Meta:
         model = TimeEntry
         fields = ['id', 'user', 'task', 'task_id', 'date', 'minutes', 'note', 'created_at']
-        read_only_fields = ['id', 'user', 'created_at']
\ No newline at end of file
+        read_only_fields = ['id', 'user', 'created_at']
+
+
+class TimeEntryImportRowSerializer(serializers.Serializer):
+    """One row of a bulk import; task access is checked for the whole batch at once."""
+
+    task_id = serializers.IntegerField(min_value=1)
+    date = serializers.DateField()
+    minutes = serializers.IntegerField(min_value=1)
+    note = serializers.CharField(required=False, allow_blank=True, default="")
+
+
+class TimerStartSerializer(serializers.Serializer):
+    task_id = serializers.PrimaryKeyRelatedField(queryset=Task.objects.all(), source="task")
+    note = serializers.CharField(required=False, allow_blank=True, default="")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Timers run on tasks of the user's teams only.
+        request = self.context.get("request")
+        if request and request.user.is_authenticated:
+            self.fields["task_id"].queryset = Task.objects.filter(
+                team_id__in=get_memberships(request).team_ids()
+            )
+
+
+class TimerStopSerializer(serializers.Serializer):
+    note = serializers.CharField(required=False, allow_blank=True)
+    discard = serializers.BooleanField(required=False, default=False)
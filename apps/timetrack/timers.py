@@ -0,0 +1,165 @@
+"""Server-side running timers.
+
+A user has at most one running timer, held in ``RunningTimer`` so every device
+sees the same one and a closed tab loses nothing: the time is counted from
+``started_at`` when the timer is stopped. Starting and stopping push a
+``{"event": "timer"}`` frame to the user's sockets and to their teammates'.
+
+Open tabs send a heartbeat while the timer runs. A timer none has checked in
+on for ``TIMER_ABANDON_MINUTES`` (a laptop closed for the night) is abandoned:
+stopping it counts time only up to its last heartbeat, and reads of the
+user's or the team's timers stop such timers first.
+
+Each team's running timers are kept in the cache (rebuilt from the team's rows
+on a miss and dropped whenever one starts or stops), so "who is tracking time
+right now" never reads the table.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.jobs.queue import enqueue
+from apps.notify.services import push_event
+from apps.teams.models import TeamMembership
+from apps.timetrack.models import RunningTimer, TimeEntry
+
+_TEAM_TIMERS = 'timers:team:{}'
+# Safety net for timers removed without going through this module (e.g. their task was deleted).
+TEAM_TIMERS_TIMEOUT = 300
+
+
+def describe(timer):
+    """A timer as sent to clients (and kept in the team cache)."""
+    user = timer.user
+    return {
+        'user': user.id,
+        'user_email': user.email,
+        'user_first_name': user.first_name,
+        'user_last_name': user.last_name,
+        'task': timer.task_id,
+        'task_title': timer.task.title,
+        'project': timer.task.project_id,
+        'team': timer.team_id,
+        'note': timer.note,
+        'started_at': timer.started_at,
+        'last_heartbeat': timer.last_heartbeat,
+    }
+
+
+def with_elapsed(data, now=None):
+    return {**data, 'elapsed_seconds': max(0, int(((now or timezone.now()) - data['started_at']).total_seconds()))}
+
+
+def forget_team_timers(*team_ids):
+    """Drop the cached timer lists of the given teams."""
+    cache.delete_many([_TEAM_TIMERS.format(team_id) for team_id in team_ids])
+
+
+def _abandoned_since(now):
+    return now - timedelta(minutes=settings.TIMER_ABANDON_MINUTES)
+
+
+def expire_abandoned(now=None):
+    """Stop every abandoned timer, logging its time up to its last heartbeat. Returns how many."""
+    now = now or timezone.now()
+    abandoned = RunningTimer.objects.filter(last_heartbeat__lt=_abandoned_since(now)).select_related('user')
+    return sum(stop(timer.user, at=now) is not None for timer in abandoned)
+
+
+def team_timers(team_id):
+    """The running timers of a team, from the cache when possible."""
+    key = _TEAM_TIMERS.format(team_id)
+    timers = cache.get(key)
+    if timers is None:
+        expire_abandoned()
+        timers = [
+            describe(timer)
+            for timer in RunningTimer.objects.filter(team_id=team_id).select_related('user', 'task').order_by('started_at')
+        ]
+        cache.set(key, timers, TEAM_TIMERS_TIMEOUT)
+    return timers
+
+
+def _changed(action, data):
+    """Forget the team's cached list and tell the user's devices and teammates, after commit."""
+    key = _TEAM_TIMERS.format(data['team'])
+    cache.delete(key)
+
+    def announce():
+        cache.delete(key)
+        user_ids = set(TeamMembership.objects.filter(
+            team_id=data['team'], status=TeamMembership.STATUS_ACCEPTED,
+        ).values_list('user_id', flat=True))
+        user_ids.add(data['user'])
+        enqueue(push_event, user_ids=sorted(user_ids), data={'event': 'timer', 'action': action, 'timer': data})
+
+    transaction.on_commit(announce)
+
+
+def current(user):
+    """The user's running timer, or None (an abandoned one is stopped and logged first)."""
+    timer = RunningTimer.objects.filter(user=user).select_related('user', 'task').first()
+    if timer is not None and timer.last_heartbeat < _abandoned_since(timezone.now()):
+        stop(user)
+        return None
+    return timer
+
+
+def stop(user, note=None, discard=False, at=None):
+    """Stop the user's timer and log its time; returns (timer data, entry) or None if none runs.
+
+    The entry is dated on the day the timer started and counts at least one
+    minute; an abandoned timer counts up to its last heartbeat only. ``discard``
+    drops the time instead.
+    """
+    at = at or timezone.now()
+    with transaction.atomic():
+        timer = RunningTimer.objects.select_for_update().filter(user=user).select_related('user', 'task').first()
+        if timer is None:
+            return None
+        data = describe(timer)
+        entry = None
+        if not discard:
+            end = timer.last_heartbeat if timer.last_heartbeat < _abandoned_since(at) else at
+            seconds = (end - timer.started_at).total_seconds()
+            entry = TimeEntry(
+                user=user, task=timer.task, date=timezone.localdate(timer.started_at),
+                minutes=max(1, round(seconds / 60)),
+                note=timer.note if note is None else note,
+            )
+            entry.save()
+        timer.delete()
+        _changed('stopped', data)
+    return data, entry
+
+
+def start(user, task, note=''):
+    """Start a timer on ``task``; a timer already running is stopped and logged first.
+
+    Returns (timer, entry logged for the previous timer or None).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        stopped = stop(user, at=now)
+        # IntegrityError if another device started one in the meantime.
+        timer = RunningTimer.objects.create(
+            user=user, task=task, team_id=task.team_id, note=note, started_at=now, last_heartbeat=now,
+        )
+        _changed('started', describe(timer))
+    return timer, stopped and stopped[1]
+
+
+def heartbeat(user):
+    """Record that a device showing the timer is alive; returns the timer or None.
+
+    A timer that was already abandoned is stopped rather than revived.
+    """
+    now = timezone.now()
+    alive = RunningTimer.objects.filter(user=user, last_heartbeat__gte=_abandoned_since(now))
+    if alive.update(last_heartbeat=now):
+        return current(user)
+    current(user)  # stops the timer if it was abandoned
+    return None
@@ -1,14 +1,35 @@
 # timetrack/views.py
 
+import csv
+import io
+from itertools import islice
+
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from apps.common.pagination import PageOrCursorPagination
+from apps.teams.membership import get_memberships
+from .imports import csv_rows, import_entries
 from .models import TimeEntry
-from .serializers import TimeEntrySerializer
+from .rollups import BUCKETS, GROUPS, budget_burn, grouped, team_report
+from . import timers
+from .serializers import TimeEntrySerializer, TimerStartSerializer, TimerStopSerializer
+from django.conf import settings
+from django.db import IntegrityError
 from django.db.models import Sum, Q
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from datetime import timedelta
 
+# Default report period: the current week and the three before it.
+REPORT_WEEKS = 4
+MAX_SUMMARY_RANGES = 12
+# Larger imports go through `manage.py import_time_entries`.
+BULK_MAX_ROWS = 1000
+
 
 class TimeEntryViewSet(viewsets.ModelViewSet):
     """The current user's time entries, filterable by date/task/project, plus a weekly summary."""
@@ -16,6 +37,8 @@ class TimeEntryViewSet(viewsets.ModelViewSet):
     queryset = TimeEntry.objects.none()  # actual rows come from get_queryset; set for schema generation
     serializer_class = TimeEntrySerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PageOrCursorPagination
+    cursor_ordering = '-id'
 
     def get_queryset(self):
         queryset = TimeEntry.objects.filter(user=self.request.user)
@@ -32,42 +55,281 @@ class TimeEntryViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(task_id=task_id)
         project_id = self.request.query_params.get("project")
         if project_id:
-            queryset = queryset.filter(task__project_id=project_id)
+            queryset = queryset.filter(project_id=project_id)
         return queryset
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create up to ``BULK_MAX_ROWS`` entries at once from a JSON array or an uploaded CSV ``file``.
+
+        All or nothing: if any row is invalid, nothing is saved and every
+        invalid row is listed with its number (from 1) and errors.
+        """
+        upload = request.FILES.get('file')
+        if upload is not None:
+            rows = csv_rows(io.TextIOWrapper(upload, encoding='utf-8-sig', newline=''))
+        elif isinstance(request.data, list):
+            rows = iter(request.data)
+        else:
+            raise ValidationError({'detail': 'Send a JSON array of entries or a CSV "file".'})
+        try:
+            rows = list(islice(rows, BULK_MAX_ROWS + 1))
+        except (UnicodeDecodeError, csv.Error):
+            raise ValidationError({'file': 'Expected a UTF-8 CSV file.'})
+        if not rows:
+            raise ValidationError({'detail': 'No entries.'})
+        if len(rows) > BULK_MAX_ROWS:
+            raise ValidationError({'detail': f'At most {BULK_MAX_ROWS} entries per request.'})
+
+        created, errors = import_entries(rows, request.user, get_memberships(request).team_ids())
+        if errors:
+            return Response({'created': 0, 'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'created': created, 'errors': []}, status=status.HTTP_201_CREATED)
+
+    @extend_schema(parameters=[
+        OpenApiParameter('ranges', str, description=f"Up to {MAX_SUMMARY_RANGES} extra comma-separated "
+                                                    f"YYYY-MM-DD..YYYY-MM-DD ranges (inclusive) to total."),
+    ])
     @action(detail=False, methods=['get'])
     def summary(self, request):
-        queryset = self.get_queryset()
-        total_minutes = queryset.aggregate(total=Sum('minutes'))['total'] or 0
-
+        """Totals for all time, today, the last 7 days, this week, month and quarter, and any
+        requested ranges, from one conditional-aggregation query.
+        """
+        ranges = _summary_ranges(request)
         # Use the configured timezone so "today"/week match the UTC dates entries
         # are stored with (avoids attributing time to the wrong day near midnight).
         today = timezone.localdate()
-        week_start = today - timedelta(days=today.weekday())
-
-        # Breakdown for the last 7 days, aggregated in a single query.
         days = [(today - timedelta(days=i)) for i in range(6, -1, -1)]
-        totals_by_date = {
-            row['date']: row['minutes']
-            for row in queryset.filter(date__gte=days[0])
-            .values('date')
-            .annotate(minutes=Sum('minutes'))
+        week_start = today - timedelta(days=today.weekday())
+        month_start = today.replace(day=1)
+        quarter_start = month_start.replace(month=(today.month - 1) // 3 * 3 + 1)
+        periods = {
+            'week': (week_start, week_start + timedelta(days=6)),
+            'month': (month_start, _add_months(month_start, 1) - timedelta(days=1)),
+            'quarter': (quarter_start, _add_months(quarter_start, 3) - timedelta(days=1)),
         }
-        per_day = [
-            {"date": str(day), "minutes": totals_by_date.get(day, 0)}
-            for day in days
-        ]
 
-        today_minutes = totals_by_date.get(today, 0)
-        week_total_minutes = queryset.filter(date__gte=week_start).aggregate(s=Sum('minutes'))['s'] or 0
+        def total(**lookups):
+            return Coalesce(Sum('minutes', filter=Q(**lookups)), 0)
+
+        # Every figure is a filtered SUM over the user's (user, date, minutes) index.
+        totals = self.get_queryset().aggregate(
+            total=Coalesce(Sum('minutes'), 0),
+            **{f'day_{i}': total(date=day) for i, day in enumerate(days)},
+            **{name: total(date__range=bounds) for name, bounds in periods.items()},
+            **{f'range_{i}': total(date__range=bounds) for i, bounds in enumerate(ranges)},
+        )
 
         return Response({
-            "total_minutes": total_minutes,
-            "today_minutes": today_minutes,
-            "week_total_minutes": week_total_minutes,
-            "per_day": per_day
+            "total_minutes": totals['total'],
+            "today_minutes": totals['day_6'],
+            "week_total_minutes": totals['week'],
+            "month_total_minutes": totals['month'],
+            "quarter_total_minutes": totals['quarter'],
+            "per_day": [
+                {"date": str(day), "minutes": totals[f'day_{i}']}
+                for i, day in enumerate(days)
+            ],
+            "ranges": [
+                {"start": str(start), "end": str(end), "minutes": totals[f'range_{i}']}
+                for i, (start, end) in enumerate(ranges)
+            ],
         })
 
+
+def _add_months(day, months):
+    month = day.month - 1 + months
+    return day.replace(year=day.year + month // 12, month=month % 12 + 1)
+
+
+def _summary_ranges(request):
+    """The ``ranges`` parameter as (start, end) date pairs."""
+    value = request.query_params.get('ranges', '')
+    ranges = []
+    for item in filter(None, value.split(',')):
+        start, _, end = item.partition('..')
+        try:
+            bounds = parse_date(start), parse_date(end)
+        except ValueError:
+            bounds = None, None
+        if None in bounds or bounds[0] > bounds[1]:
+            raise ValidationError({'ranges': f'Expected YYYY-MM-DD..YYYY-MM-DD, got "{item}".'})
+        ranges.append(bounds)
+    if len(ranges) > MAX_SUMMARY_RANGES:
+        raise ValidationError({'ranges': f'At most {MAX_SUMMARY_RANGES} ranges.'})
+    return ranges
+
+
+def _report_date(request, name, default):
+    value = request.query_params.get(name)
+    if not value:
+        return default
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: 'Expected a date (YYYY-MM-DD).'})
+    return parsed
+
+
+def _group_by(request):
+    groups = [g for g in request.query_params.get('group_by', '').split(',') if g]
+    unknown = sorted(set(groups) - set(GROUPS) - set(BUCKETS))
+    if unknown:
+        raise ValidationError({'group_by': f"Unknown grouping: {', '.join(unknown)}."})
+    # A period among the groups is the same as ``bucket``.
+    buckets = [g for g in groups if g in BUCKETS]
+    if request.query_params.get('bucket'):
+        buckets.append(request.query_params['bucket'])
+    if len(set(buckets)) > 1:
+        raise ValidationError({'bucket': 'Only one of day, week or month.'})
+    return list(dict.fromkeys(g for g in groups if g in GROUPS)), _bucket(buckets[0] if buckets else None)
+
+
+def _bucket(value, default=None):
+    if not value:
+        return default
+    if value not in BUCKETS:
+        raise ValidationError({'bucket': f"Expected one of: {', '.join(BUCKETS)}."})
+    return value
+
+
+class TeamTimeReportViewSet(viewsets.ViewSet):
+    """Time logged across a team, read from the daily rollups (admins and managers only)."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def _team_id(self, request, pk):
+        if not pk.isdigit():
+            raise ValidationError({'team': 'Expected a team id.'})
+        team_id = int(pk)
+        memberships = get_memberships(request)
+        if not memberships.is_member(team_id):
+            raise PermissionDenied("You're not a member of this team.")
+        if not memberships.can_manage_tasks(team_id):
+            raise PermissionDenied("Only admins and managers can view team time reports.")
+        return team_id
+
+    def _period(self, request):
+        today = timezone.localdate()
+        this_week = today - timedelta(days=today.weekday())
+        start = _report_date(request, 'start', this_week - timedelta(weeks=REPORT_WEEKS - 1))
+        end = _report_date(request, 'end', today)
+        if start > end:
+            raise ValidationError({'start': 'Must not be after end.'})
+        return start, end
+
+    @extend_schema(parameters=[
+        OpenApiParameter('start', str, description="First day (YYYY-MM-DD); default: Monday three weeks ago."),
+        OpenApiParameter('end', str, description="Last day (YYYY-MM-DD), inclusive; default: today."),
+    ])
+    def retrieve(self, request, pk=None):
+        """Totals per project, per user and per week."""
+        team_id = self._team_id(request, pk)
+        start, end = self._period(request)
+        return Response({
+            "team": team_id,
+            "start": str(start),
+            "end": str(end),
+            **team_report(team_id, start, end),
+        })
+
+    @extend_schema(parameters=[
+        OpenApiParameter('group_by', str, description="Comma-separated subset of: project, task, user "
+                                                      "(default: project); may include one of day, week, month."),
+        OpenApiParameter('bucket', str, description="Also group by period: day, week or month."),
+        OpenApiParameter('start', str, description="First day (YYYY-MM-DD); default: Monday three weeks ago."),
+        OpenApiParameter('end', str, description="Last day (YYYY-MM-DD), inclusive; default: today."),
+    ])
+    @action(detail=True, methods=['get'])
+    def groups(self, request, pk=None):
+        """Minutes and cost per combination of the requested groups, in one grouped query."""
+        team_id = self._team_id(request, pk)
+        groups, bucket = _group_by(request)
+        if not groups and not bucket:
+            groups = ['project']
+        start, end = self._period(request)
+        return Response({
+            "team": team_id,
+            "start": str(start),
+            "end": str(end),
+            "group_by": groups,
+            "bucket": bucket,
+            "results": grouped(team_id, start, end, groups, bucket),
+        })
+
+    @extend_schema(parameters=[
+        OpenApiParameter('bucket', str, description="Period of the burn-down series: day, week (default) or month."),
+    ])
+    @action(detail=True, methods=['get'])
+    def budget(self, request, pk=None):
+        """Each project's budget against the cost of all time logged on it, with a cumulative series."""
+        team_id = self._team_id(request, pk)
+        bucket = _bucket(request.query_params.get('bucket'), default='week')
+        return Response({
+            "team": team_id,
+            "bucket": bucket,
+            "default_hourly_rate": str(settings.TIME_REPORT_DEFAULT_HOURLY_RATE),
+            "projects": budget_burn(team_id, bucket),
+        })
+
+
+class RunningTimerViewSet(viewsets.ViewSet):
+    """The caller's server-side timer (start/stop/heartbeat) and their teams' running timers."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    @action(detail=False, methods=['get'])
+    def current(self, request):
+        timer = timers.current(request.user)
+        return Response({"timer": timer and timers.with_elapsed(timers.describe(timer))})
+
+    @extend_schema(request=TimerStartSerializer)
+    @action(detail=False, methods=['post'])
+    def start(self, request):
+        """Start a timer on a task; one already running is stopped and its time logged."""
+        serializer = TimerStartSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        try:
+            timer, logged = timers.start(request.user, **serializer.validated_data)
+        except IntegrityError:
+            raise ValidationError({'detail': 'A timer was just started on another device.'})
+        return Response({
+            "timer": timers.with_elapsed(timers.describe(timer)),
+            "logged": logged and TimeEntrySerializer(logged).data,
+        }, status=status.HTTP_201_CREATED)
+
+    @extend_schema(request=TimerStopSerializer)
+    @action(detail=False, methods=['post'])
+    def stop(self, request):
+        """Stop the timer and log its time as an entry (unless ``discard``)."""
+        serializer = TimerStopSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        stopped = timers.stop(request.user, **serializer.validated_data)
+        if stopped is None:
+            return Response({"detail": "No timer is running."}, status=status.HTTP_404_NOT_FOUND)
+        _, entry = stopped
+        return Response({"logged": entry and TimeEntrySerializer(entry).data})
+
+    @action(detail=False, methods=['post'])
+    def heartbeat(self, request):
+        timer = timers.heartbeat(request.user)
+        if timer is None:
+            return Response({"detail": "No timer is running."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"timer": timers.with_elapsed(timers.describe(timer))})
+
+    @extend_schema(parameters=[OpenApiParameter('team', int, required=True)])
+    @action(detail=False, methods=['get'])
+    def team(self, request):
+        """Running timers of one of the caller's teams, served from the cache."""
+        team = request.query_params.get('team', '')
+        if not team.isdigit():
+            raise ValidationError({'team': 'Expected a team id.'})
+        if not get_memberships(request).is_member(int(team)):
+            raise PermissionDenied("You're not a member of this team.")
+        now = timezone.now()
+        return Response({"results": [timers.with_elapsed(timer, now) for timer in timers.team_timers(int(team))]})
@@ -1,5 +1,4 @@
 from django.conf import settings
-from django.core.mail import send_mail
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
@@ -11,7 +10,9 @@ from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from apps.teams.models import TeamMembership
+from apps.jobs.queue import enqueue
+from apps.notify.services import send_email
+from apps.teams.models import Team, TeamMembership
 from apps.users.throttles import AuthRateThrottle, RegisterRateThrottle
 from apps.users.turnstile import verify_turnstile
 from apps.users.models import CustomUser, PasswordResetToken, EmailVerificationToken
@@ -27,17 +28,17 @@ from apps.users.serializers import (
 
 
 def send_verification_email(user):
-    """Create a verification token and email the activation link to the user."""
+    """Create a verification token and queue the activation email to the user."""
     token = EmailVerificationToken.objects.create(user=user)
     link = f"{settings.FRONTEND_URL}/verify-email?token={token.token}"
-    send_mail(
+    enqueue(
+        send_email,
         subject="Verify your email",
         message=(
             "Welcome to Project Manager!\n\n"
             f"Confirm your email to activate your account:\n{link}\n\n"
             "The link expires in 24 hours."
         ),
-        from_email=None,  # uses DEFAULT_FROM_EMAIL
         recipient_list=[user.email],
     )
 
@@ -143,6 +144,12 @@ class UserViewSet(viewsets.ViewSet):
         serializer = UserSerializer(request.user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        # Names and emails are embedded in team, project and task responses.
+        team_ids = {
+            *TeamMembership.objects.filter(user=request.user).values_list('team_id', flat=True),
+            *request.user.teams_created.values_list('id', flat=True),
+        }
+        Team.bump_versions(*team_ids)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @extend_schema(
@@ -191,10 +198,10 @@ class RequestPasswordResetView(APIView):
             token = PasswordResetToken.objects.create(user=user)
             reset_link = f"{settings.FRONTEND_URL}/reset-password?token={token.token}"
 
-            send_mail(
+            enqueue(
+                send_email,
                 subject="Password Reset Request",
                 message=f"Click the link to reset your password: {reset_link}",
-                from_email=None,  # uses DEFAULT_FROM_EMAIL
                 recipient_list=[email],
             )
 
@@ -12,7 +12,7 @@ from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.security.websocket import OriginValidator
 from django.conf import settings
 
-from apps.notify.middleware import JwtAuthMiddleware
+from apps.notify.middleware import AdmissionLimitMiddleware, JwtAuthMiddleware
 import apps.notify.routing
 
 application = ProtocolTypeRouter({
@@ -20,8 +20,9 @@ application = ProtocolTypeRouter({
     # OriginValidator pins which browser origins may open a WebSocket. Defaults
     # to "*" for local dev/tests; in production set CHANNELS_ALLOWED_ORIGINS to
     # the frontend origin (it lives on a different host than the API).
+    # Handshakes over the admission rate are refused before authentication.
     "websocket": OriginValidator(
-        JwtAuthMiddleware(URLRouter(apps.notify.routing.websocket_urlpatterns)),
+        AdmissionLimitMiddleware(JwtAuthMiddleware(URLRouter(apps.notify.routing.websocket_urlpatterns))),
         settings.CHANNELS_ALLOWED_ORIGINS,
     ),
 })
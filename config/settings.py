@@ -7,6 +7,7 @@ Deployment checklist: https://docs.djangoproject.com/en/5.2/howto/deployment/che
 import os
 import sys
 from datetime import timedelta
+from decimal import Decimal
 from pathlib import Path
 
 from corsheaders.defaults import default_headers
@@ -75,6 +76,8 @@ INSTALLED_APPS = [
     'apps.notify',
     'apps.logs',
     'apps.timetrack',
+    'apps.jobs',
+    'apps.search',
 ]
 
 AUTH_USER_MODEL = 'users.CustomUser'
@@ -208,6 +211,62 @@ else:
         "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"},
     }
 
+# WebSocket handshakes (apps/notify/middleware.py): users named by access tokens
+# are cached per process for a short while, and handshakes beyond the admission
+# rate are refused so a reconnect storm cannot swamp the database.
+WS_USER_CACHE_SIZE = int(os.getenv("WS_USER_CACHE_SIZE", "10000"))
+WS_USER_CACHE_TTL = int(os.getenv("WS_USER_CACHE_TTL", "60"))  # seconds
+WS_ADMISSION_RATE = float(os.getenv("WS_ADMISSION_RATE", "200"))  # handshakes per second; 0 disables
+WS_ADMISSION_BURST = int(os.getenv("WS_ADMISSION_BURST", "500"))
+
+# --- Cache ------------------------------------------------------------------
+# Backs the versioned response cache (apps/common/cache.py). Redis when
+# REDIS_URL is set, so every process sees the same team versions; otherwise a
+# per-process local-memory cache (development and tests).
+if REDIS_URL and not TESTING:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", "300"))  # seconds
+
+# --- Background jobs --------------------------------------------------------
+# Email and WebSocket side effects are queued in the database and executed by
+# `python manage.py run_jobs`. With JOBS_RUN_INLINE they run immediately inside
+# the request instead (always during tests; the default when no worker runs).
+JOBS_RUN_INLINE = TESTING or os.getenv("JOBS_RUN_INLINE", "true").lower() == "true"
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "5"))
+JOBS_RETRY_BACKOFF = 10  # seconds before the first retry; doubles on each attempt
+JOBS_LOCK_TIMEOUT = 300  # seconds before a job claimed by a dead worker is retried
+
+# --- Notification coalescing ------------------------------------------------
+# Same-type notifications for a user within the window (seconds) are folded into
+# one digest row, pushed at most once more per window, up to the max batch per
+# row (without a job worker each fold is pushed at once). 0 disables it (the
+# default in tests, where each event gets its own row).
+NOTIFY_COALESCE_WINDOW = int(os.getenv("NOTIFY_COALESCE_WINDOW", "0" if TESTING else "5"))
+NOTIFY_COALESCE_MAX_BATCH = int(os.getenv("NOTIFY_COALESCE_MAX_BATCH", "20"))
+
+# --- Activity log retention -------------------------------------------------
+# `python manage.py archive_activity` (run e.g. daily) moves whole months older
+# than the retention period into gzipped JSONL files under the archive dir.
+ACTIVITY_LOG_RETENTION_DAYS = int(os.getenv("ACTIVITY_LOG_RETENTION_DAYS", "365"))
+ACTIVITY_LOG_ARCHIVE_DIR = Path(os.getenv("ACTIVITY_LOG_ARCHIVE_DIR", BASE_DIR / "archive" / "activity"))
+
+# --- Time reports -----------------------------------------------------------
+# Hourly rate for members without their own rate when time is priced against
+# project budgets.
+TIME_REPORT_DEFAULT_HOURLY_RATE = Decimal(os.getenv("TIME_REPORT_DEFAULT_HOURLY_RATE", "0"))
+# A running timer no open tab has sent a heartbeat for in this many minutes is
+# abandoned: it is stopped with its time counted up to the last heartbeat.
+TIMER_ABANDON_MINUTES = int(os.getenv("TIMER_ABANDON_MINUTES", "240"))
+
 # --- CORS / CSRF ------------------------------------------------------------
 CORS_ALLOWED_ORIGINS = env_list("CORS_ALLOWED_ORIGINS", "http://localhost:3000" if DEBUG else "")
 CSRF_TRUSTED_ORIGINS = env_list("CSRF_TRUSTED_ORIGINS")
@@ -249,6 +308,10 @@ EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "true").lower() == "true"
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "no-reply@projectmanager.local")
+# Users on digest delivery get their notification emails batched into one
+# message at most this often (sent by the job worker, or `send_email_digests`;
+# digest delivery is only offered with JOBS_RUN_INLINE=false).
+EMAIL_DIGEST_MINUTES = int(os.getenv("EMAIL_DIGEST_MINUTES", "15"))
 
 # --- Sentry (error monitoring) ----------------------------------------------
 # Disabled unless SENTRY_DSN is set, so local/dev/tests send nothing.
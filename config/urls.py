@@ -30,12 +30,13 @@ from apps.logs.views import ActivityLogViewSet
 
 from apps.notify.views import NotificationViewSet
 from apps.projects.views import ProjectViewSet
+from apps.search.views import search, typeahead
 from apps.taskfiles.views import TaskFileViewSet
 from apps.tasks.views import TaskViewSet, MyTaskViewSet
 from apps.teams.views import (
     TeamViewSet, invitation_detail, invitation_accept, invitation_decline,
 )
-from apps.timetrack.views import TimeEntryViewSet
+from apps.timetrack.views import RunningTimerViewSet, TeamTimeReportViewSet, TimeEntryViewSet
 
 from apps.users.views import RequestPasswordResetView, ConfirmPasswordResetView, ThrottledTokenObtainPairView
 from django.conf import settings
@@ -75,6 +76,8 @@ router.register('logs', ActivityLogViewSet, basename='logs')
 router.register('teams', TeamViewSet, basename='teams')
 router.register("my-tasks", MyTaskViewSet, basename="my-tasks")
 router.register("time-entries", TimeEntryViewSet, basename="timeentry")
+router.register("time-reports", TeamTimeReportViewSet, basename="time-reports")
+router.register("timers", RunningTimerViewSet, basename="timers")
 #  Final urlpatterns
 urlpatterns = [
                   path('admin/', admin.site.urls),
@@ -89,6 +92,8 @@ urlpatterns = [
                        download_task_file,
                        name='download_task_file'
                        ),
+                  path('api/search/', search, name='search'),
+                  path('api/search/typeahead/', typeahead, name='typeahead'),
                   path('api/invitations/<uuid:token>/', invitation_detail, name='invitation-detail'),
                   path('api/invitations/<uuid:token>/accept/', invitation_accept, name='invitation-accept'),
                   path('api/invitations/<uuid:token>/decline/', invitation_decline, name='invitation-decline'),
@@ -4,6 +4,7 @@ import React from "react";
 import ProtectedRoute from "@/components/ProtectedRoute";
 import Sidebar from "@/components/Sidebar";
 import Topbar from "@/components/Topbar";
+import TimerSync from "@/components/TimerSync";
 
 export default function DashboardLayout({
   children,
@@ -12,6 +13,7 @@ export default function DashboardLayout({
 }) {
   return (
     <ProtectedRoute>
+      <TimerSync />
       <div className="flex h-screen bg-zinc-950 text-white">
         {/* Single instance of Sidebar */}
         <Sidebar />
@@ -2,9 +2,9 @@
 
 import React, { useEffect, useState } from "react";
 import Link from "next/link";
-import { getProjects, getTimeSummary, getActivity } from "@/lib/api";
+import { getProjectSummaries, getTimeSummary, getActivity } from "@/lib/api";
 import { useAuth } from "@/lib/useAuth";
-import type { Project, TimeSummary, ActivityLog } from "@/lib/types";
+import type { ProjectSummary, TimeSummary, ActivityLog } from "@/lib/types";
 import StatCard from "@/components/StatCard";
 import WeekBars from "@/components/WeekBars";
 import ActivityFeed from "@/components/ActivityFeed";
@@ -35,13 +35,13 @@ const PROJECT_COLORS = [
 
 export default function DashboardPage() {
   const { user } = useAuth();
-  const [projects, setProjects] = useState<Project[]>([]);
+  const [projects, setProjects] = useState<ProjectSummary[]>([]);
   const [summary, setSummary] = useState<TimeSummary | null>(null);
   const [activity, setActivity] = useState<ActivityLog[]>([]);
 
   useEffect(() => {
     Promise.all([
-      getProjects(),
+      getProjectSummaries(),
       getTimeSummary().catch(() => null),
       getActivity(6).catch(() => [] as ActivityLog[]),
     ]).then(([p, s, a]) => {
@@ -51,10 +51,10 @@ export default function DashboardPage() {
     });
   }, []);
 
-  const allTasks = projects.flatMap((p) => p.tasks ?? []);
-  const total = allTasks.length;
-  const done = allTasks.filter((t) => t.status === "done").length;
-  const inProgress = allTasks.filter((t) => t.status === "in_progress").length;
+  // Counters come aggregated from the compact list, not from every task.
+  const total = projects.reduce((sum, p) => sum + p.task_count, 0);
+  const done = projects.reduce((sum, p) => sum + (p.stats.by_status.done ?? 0), 0);
+  const inProgress = projects.reduce((sum, p) => sum + (p.stats.by_status.in_progress ?? 0), 0);
   const completion = total ? Math.round((done / total) * 100) : 0;
   const weekMinutes = summary?.week_total_minutes ?? 0;
   const todayMinutes = summary?.today_minutes ?? 0;
@@ -111,9 +111,8 @@ export default function DashboardPage() {
             <p className="text-sm text-zinc-400">No projects yet.</p>
           ) : (
             projects.map((p, i) => {
-              const tasks = p.tasks ?? [];
-              const projDone = tasks.filter((t) => t.status === "done").length;
-              const pct = tasks.length ? Math.round((projDone / tasks.length) * 100) : 0;
+              const projDone = p.stats.by_status.done ?? 0;
+              const pct = p.task_count ? Math.round((projDone / p.task_count) * 100) : 0;
               const color = PROJECT_COLORS[i % PROJECT_COLORS.length];
               return (
                 <Link key={p.id} href={`/dashboard/projects/${p.id}`} className="group block">
@@ -1,7 +1,9 @@
 "use client";
-import { useState } from "react";
+import { useEffect, useState } from "react";
 import { useAuth } from "@/components/AuthProvider";
 import axiosClient from "@/lib/axiosClient";
+import { getNotificationPreferences, updateNotificationPreferences } from "@/lib/api";
+import type { NotificationPreferences } from "@/lib/types";
 import { useRouter } from "next/navigation";
 
 export default function ProfilePage() {
@@ -11,8 +13,19 @@ export default function ProfilePage() {
   const [loading, setLoading] = useState(false);
   const [success, setSuccess] = useState("");
   const [error, setError] = useState("");
+  const [emailDelivery, setEmailDelivery] = useState<NotificationPreferences["email_delivery"]>("immediate");
+  const [digestAvailable, setDigestAvailable] = useState(false);
   const router = useRouter();
 
+  useEffect(() => {
+    getNotificationPreferences()
+      .then(prefs => {
+        setEmailDelivery(prefs.email_delivery);
+        setDigestAvailable(prefs.digest_available);
+      })
+      .catch(() => {});
+  }, []);
+
   // Handles profile update
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
@@ -24,6 +37,9 @@ export default function ProfilePage() {
         `/users/update-profile/`,
         { first_name, last_name }
       );
+      if (digestAvailable) {
+        await updateNotificationPreferences({ email_delivery: emailDelivery });
+      }
       setSuccess("Profile updated successfully!");
       refreshUser();
     } catch {
@@ -73,6 +89,16 @@ export default function ProfilePage() {
             disabled
           />
         </div>
+        {digestAvailable && (
+          <label className="flex items-center gap-2 text-gray-400">
+            <input
+              type="checkbox"
+              checked={emailDelivery === "digest"}
+              onChange={e => setEmailDelivery(e.target.checked ? "digest" : "immediate")}
+            />
+            Batch notification emails into a digest every few minutes
+          </label>
+        )}
         <button
           type="submit"
           className="w-full mt-3 py-2 rounded bg-emerald-600 text-white font-semibold hover:bg-emerald-700 transition"
@@ -1,6 +1,8 @@
 "use client";
-import { useState, useEffect, useCallback } from "react";
+import { useState, useEffect, useCallback, useRef } from "react";
 import axiosClient from "@/lib/axiosClient";
+import { applyTaskChanges, getTaskChanges } from "@/lib/api";
+import { subscribeBoard, type BoardFrame } from "@/lib/liveBoard";
 import KanbanBoard from "@/components/KanbanBoard";
 import AddTaskModal from "@/components/AddTaskModal";
 import EditTaskModal from "@/components/EditTaskModal";
@@ -28,6 +30,8 @@ export default function ProjectDetailsPage() {
   const [showEditProject, setShowEditProject] = useState(false);
   const [showInvite, setShowInvite] = useState(false);
   const [totalMinutes, setTotalMinutes] = useState(0);
+  // Board version the task list is synced to; task edits only fetch the delta.
+  const boardVersion = useRef(0);
 
 
   const totalTasks = tasks.length;
@@ -42,13 +46,14 @@ export default function ProjectDetailsPage() {
     setLoading(true);
     setError("");
     try {
-      const [projectRes, tasksRes, timeRes] = await Promise.all([
+      const [projectRes, board, timeRes] = await Promise.all([
         axiosClient.get(`/projects/${id}/`),
-        axiosClient.get(`/projects/${id}/tasks/`),
+        getTaskChanges(id, 0),
         axiosClient.get(`/time-entries/summary/?project=${id}`),
       ]);
       setProject(projectRes.data);
-      setTasks(tasksRes.data.results || []);
+      setTasks(applyTaskChanges([], board));
+      boardVersion.current = board.version;
       setTotalMinutes(timeRes.data.total_minutes || 0);
 
       const tid = projectRes.data.team?.id || projectRes.data.team_id || projectRes.data.team;
@@ -73,6 +78,49 @@ export default function ProjectDetailsPage() {
     fetchAll();
   }, [fetchAll]);
 
+  // After a task add/edit/delete, fetch only what changed since the last sync.
+  const syncTasks = useCallback(async () => {
+    try {
+      const delta = await getTaskChanges(id, boardVersion.current);
+      setTasks((ts) => applyTaskChanges(ts, delta));
+      boardVersion.current = delta.version;
+    } catch {
+      fetchAll();
+    }
+  }, [id, fetchAll]);
+
+  // Live board: other members' task writes arrive as deltas over the socket.
+  // Each write bumps the board version by one; a gap means a missed frame
+  // (or a reconnect), so fetch the delta over REST instead.
+  useEffect(() => {
+    const projectId = Number(id);
+    const unsubscribe = subscribeBoard(projectId);
+    const onEvent = (e: Event) => {
+      const data = (e as CustomEvent<{ event: string; project?: number; version?: number }>).detail;
+      if (data.project !== projectId) return;
+      if (data.event === "subscribed") {
+        if ((data.version ?? 0) > boardVersion.current) syncTasks();
+        return;
+      }
+      const frame = data as BoardFrame<Task>;
+      if (frame.event !== "board" || frame.kind !== "task" || frame.version === undefined) return;
+      if (frame.version <= boardVersion.current) return;
+      if (frame.version > boardVersion.current + 1) {
+        syncTasks();
+        return;
+      }
+      // can_manage depends on the viewer, so pushed tasks leave it out.
+      const changed = frame.changed.map((t) => ({ ...t, can_manage: canManageRef.current }));
+      setTasks((ts) => applyTaskChanges(ts, { version: frame.version!, changed, deleted: frame.deleted }));
+      boardVersion.current = frame.version;
+    };
+    window.addEventListener("ws:event", onEvent);
+    return () => {
+      window.removeEventListener("ws:event", onEvent);
+      unsubscribe();
+    };
+  }, [id, syncTasks]);
+
   // Optimistically move the card; revert if the request fails.
   async function handleStatusChange(taskId: number, newStatus: string) {
     const previous = tasks;
@@ -108,6 +156,8 @@ export default function ProjectDetailsPage() {
   )?.role;
   // Only admins/managers create, edit or delete tasks (developers move status only).
   const canManageTasks = myRole === "admin" || myRole === "manager";
+  const canManageRef = useRef(canManageTasks);
+  canManageRef.current = canManageTasks;
   // Only accepted members can be assigned to tasks.
   const acceptedMembers = members.filter((m) => m.status === "accepted");
 
@@ -261,8 +311,9 @@ export default function ProjectDetailsPage() {
           open={showAdd}
           onClose={() => setShowAdd(false)}
           projectId={id}
+          teamId={project?.team?.id}
           teamMembers={acceptedMembers}
-          onAdded={fetchAll}
+          onAdded={syncTasks}
         />
       )}
       {editTask && (
@@ -272,7 +323,7 @@ export default function ProjectDetailsPage() {
           teamMembers={acceptedMembers}
           projectId={Number(id)}
           onClose={() => setEditTask(null)}
-          onSaved={fetchAll}
+          onSaved={syncTasks}
         />
       )}
       {viewTask && (
@@ -290,10 +341,10 @@ export default function ProjectDetailsPage() {
             if (window.confirm("Delete this task?")) {
               await axiosClient.delete(`/projects/${id}/tasks/${viewTask.id}/`);
               setViewTask(null);
-              fetchAll();
+              syncTasks();
             }
           } : undefined}
-          onTaskUpdated={fetchAll}
+          onTaskUpdated={syncTasks}
         />
       )}
     </div>
@@ -18,7 +18,7 @@ export default function ProjectsPage() {
   useEffect(() => {
     setLoading(true);
     axiosClient
-      .get(`/projects/`)
+      .get(`/projects/?compact=true`) // cards only need the task counters
       .then(res => setProjects(Array.isArray(res.data.results) ? res.data.results : []))
       .finally(() => setLoading(false));
 
@@ -2,8 +2,8 @@
 
 import React, { useEffect, useState } from "react";
 import { PieChart, Pie, Cell, Tooltip, ResponsiveContainer } from "recharts";
-import { getProjects, getTimeSummary } from "@/lib/api";
-import type { Project, TimeSummary } from "@/lib/types";
+import { getProjects, getTeamBudgetReport, getTeams, getTeamTimeReport, getTimeSummary } from "@/lib/api";
+import type { Project, Team, TeamBudgetReport, TeamTimeReport, TimeSummary } from "@/lib/types";
 import StatCard from "@/components/StatCard";
 import { stringToColor } from "@/lib/color";
 
@@ -38,13 +38,37 @@ interface Member {
 export default function ReportsPage() {
   const [projects, setProjects] = useState<Project[]>([]);
   const [summary, setSummary] = useState<TimeSummary | null>(null);
+  // Team time reports are only served to admins and managers; other teams drop out.
+  const [teamReports, setTeamReports] = useState<{ team: Team; report: TeamTimeReport }[]>([]);
+  const [reportTeam, setReportTeam] = useState<number | null>(null);
 
   useEffect(() => {
     Promise.all([getProjects(), getTimeSummary().catch(() => null)]).then(([p, s]) => {
       setProjects(p);
       setSummary(s);
     });
+    getTeams()
+      .then((teams) =>
+        Promise.all(teams.map((team) => getTeamTimeReport(team.id).then((report) => ({ team, report })).catch(() => null)))
+      )
+      .then((reports) => {
+        const available = reports.filter((r): r is { team: Team; report: TeamTimeReport } => r !== null);
+        setTeamReports(available);
+        setReportTeam(available[0]?.team.id ?? null);
+      })
+      .catch(() => setTeamReports([]));
   }, []);
+  const teamReport = teamReports.find((r) => r.team.id === reportTeam)?.report ?? null;
+  const [budget, setBudget] = useState<TeamBudgetReport | null>(null);
+
+  useEffect(() => {
+    if (reportTeam === null) return;
+    getTeamBudgetReport(reportTeam)
+      .then(setBudget)
+      .catch(() => setBudget(null));
+  }, [reportTeam]);
+  const budgeted = budget?.projects.filter((p) => p.budget !== null) ?? [];
+  const maxWeek = Math.max(1, ...(teamReport?.by_week.map((w) => w.minutes) ?? []));
 
   const allTasks = projects.flatMap((p) => p.tasks ?? []);
   const total = allTasks.length;
@@ -222,6 +246,103 @@ export default function ReportsPage() {
           </table>
         )}
       </section>
+
+      {/* Team time (admins and managers) */}
+      {teamReport && (
+        <section className="rounded-2xl border border-zinc-800 bg-zinc-900/60 p-5">
+          <div className="mb-4 flex flex-wrap items-center justify-between gap-3">
+            <div>
+              <h2 className="font-semibold text-white">Team time</h2>
+              <p className="text-xs text-zinc-400">
+                {teamReport.start} – {teamReport.end} · {formatHours(teamReport.total_minutes)} logged
+              </p>
+            </div>
+            {teamReports.length > 1 && (
+              <select
+                value={reportTeam ?? ""}
+                onChange={(e) => setReportTeam(Number(e.target.value))}
+                className="rounded-lg border border-zinc-700 bg-zinc-800 px-3 py-1.5 text-sm text-white"
+              >
+                {teamReports.map(({ team }) => (
+                  <option key={team.id} value={team.id}>
+                    {team.name}
+                  </option>
+                ))}
+              </select>
+            )}
+          </div>
+          <div className="grid gap-6 lg:grid-cols-3">
+            <div>
+              <h3 className="mb-2 text-xs uppercase tracking-wide text-zinc-400">By project</h3>
+              {teamReport.by_project.length === 0 ? (
+                <p className="text-sm text-zinc-400">No time logged.</p>
+              ) : (
+                <ul className="space-y-1.5 text-sm">
+                  {teamReport.by_project.map((p) => (
+                    <li key={p.project} className="flex justify-between text-zinc-300">
+                      <span>{p.name}</span>
+                      <span className="text-zinc-400">{formatHours(p.minutes)}</span>
+                    </li>
+                  ))}
+                </ul>
+              )}
+            </div>
+            <div>
+              <h3 className="mb-2 text-xs uppercase tracking-wide text-zinc-400">By member</h3>
+              <ul className="space-y-1.5 text-sm">
+                {teamReport.by_user.map((u) => (
+                  <li key={u.user} className="flex justify-between text-zinc-300">
+                    <span>{`${u.first_name} ${u.last_name}`.trim() || u.email}</span>
+                    <span className="text-zinc-400">{formatHours(u.minutes)}</span>
+                  </li>
+                ))}
+              </ul>
+            </div>
+            <div>
+              <h3 className="mb-2 text-xs uppercase tracking-wide text-zinc-400">By week</h3>
+              <ul className="space-y-2 text-sm">
+                {teamReport.by_week.map((w) => (
+                  <li key={w.week}>
+                    <div className="mb-1 flex justify-between text-zinc-300">
+                      <span>Week of {w.week}</span>
+                      <span className="text-zinc-400">{formatHours(w.minutes)}</span>
+                    </div>
+                    <div className="h-2 w-full overflow-hidden rounded-full bg-zinc-800">
+                      <div
+                        className="h-full rounded-full bg-sky-400"
+                        style={{ width: `${Math.round((w.minutes / maxWeek) * 100)}%` }}
+                      />
+                    </div>
+                  </li>
+                ))}
+              </ul>
+            </div>
+          </div>
+          {budgeted.length > 0 && (
+            <div className="mt-6">
+              <h3 className="mb-2 text-xs uppercase tracking-wide text-zinc-400">Budget burn</h3>
+              <ul className="space-y-3 text-sm">
+                {budgeted.map((p) => (
+                  <li key={p.project}>
+                    <div className="mb-1 flex justify-between text-zinc-300">
+                      <span>{p.name}</span>
+                      <span className={Number(p.remaining) < 0 ? "text-rose-400" : "text-zinc-400"}>
+                        {p.spent} of {p.budget} · {p.burned_percent ?? 0}%
+                      </span>
+                    </div>
+                    <div className="h-2 w-full overflow-hidden rounded-full bg-zinc-800">
+                      <div
+                        className={`h-full rounded-full ${Number(p.remaining) < 0 ? "bg-rose-400" : "bg-amber-400"}`}
+                        style={{ width: `${Math.min(100, p.burned_percent ?? 0)}%` }}
+                      />
+                    </div>
+                  </li>
+                ))}
+              </ul>
+            </div>
+          )}
+        </section>
+      )}
     </div>
   );
 }
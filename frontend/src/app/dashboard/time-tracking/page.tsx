@@ -1,8 +1,9 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { Download } from "lucide-react";
-import { getAllTimeEntries, getTimeSummary } from "@/lib/api";
+import { Download, Upload } from "lucide-react";
+import { getAllTimeEntries, getTimeSummary, importTimeEntries } from "@/lib/api";
+import { getErrorMessage } from "@/lib/errors";
 import type { TimeEntry, TimeSummary } from "@/lib/types";
 import WeekBars from "@/components/WeekBars";
 import { useTimerStore } from "@/lib/timerStore";
@@ -37,12 +38,34 @@ export default function TimeTrackingPage() {
   const timer = useTimerStore((s) => s.timer);
   const getElapsed = useTimerStore((s) => s.getElapsed);
 
-  useEffect(() => {
+  const [importMessage, setImportMessage] = useState<string | null>(null);
+
+  function load() {
     Promise.all([getAllTimeEntries(), getTimeSummary().catch(() => null)]).then(([e, s]) => {
       setEntries(e);
       setSummary(s);
     });
-  }, []);
+  }
+
+  useEffect(load, []);
+
+  async function importCSV(file: File) {
+    try {
+      const result = await importTimeEntries(file);
+      if (result.errors.length) {
+        const first = result.errors
+          .slice(0, 3)
+          .map((e) => `row ${e.row}: ${Object.values(e.errors).flat().join(" ")}`)
+          .join("; ");
+        setImportMessage(`Nothing imported, ${result.errors.length} invalid row(s) — ${first}`);
+      } else {
+        setImportMessage(`Imported ${result.created} entries.`);
+        load();
+      }
+    } catch (err) {
+      setImportMessage(getErrorMessage(err, "Import failed."));
+    }
+  }
 
   // Tick once per second while a timer runs, so the elapsed clock stays live.
   useEffect(() => {
@@ -138,6 +161,14 @@ export default function TimeTrackingPage() {
             <div className="h-full rounded-full bg-emerald-400 transition-all" style={{ width: `${targetPct}%` }} />
           </div>
           <div className="mt-2 text-xs text-emerald-400">{targetPct}% of target</div>
+          <div className="mt-4 flex items-center justify-between border-t border-zinc-800 pt-4 text-sm">
+            <span className="text-zinc-400">This month</span>
+            <span className="text-zinc-300">{formatMinutes(summary?.month_total_minutes ?? 0)}</span>
+          </div>
+          <div className="mt-2 flex items-center justify-between text-sm">
+            <span className="text-zinc-400">This quarter</span>
+            <span className="text-zinc-300">{formatMinutes(summary?.quarter_total_minutes ?? 0)}</span>
+          </div>
         </div>
       </section>
 
@@ -159,8 +190,26 @@ export default function TimeTrackingPage() {
               <Download size={16} />
               Export
             </button>
+            <label
+              title="CSV with columns task_id, date, minutes, note"
+              className="flex cursor-pointer items-center gap-2 rounded-lg border border-zinc-700 px-3 py-1.5 text-sm font-semibold text-zinc-200 transition hover:bg-zinc-800"
+            >
+              <Upload size={16} />
+              Import
+              <input
+                type="file"
+                accept=".csv,text/csv"
+                className="hidden"
+                onChange={(e) => {
+                  const file = e.target.files?.[0];
+                  e.target.value = "";
+                  if (file) importCSV(file);
+                }}
+              />
+            </label>
           </div>
         </div>
+        {importMessage && <p className="border-b border-zinc-800 px-5 py-3 text-sm text-zinc-300">{importMessage}</p>}
         {filtered.length === 0 ? (
           <p className="px-5 py-6 text-sm text-zinc-400">No time entries.</p>
         ) : (
@@ -1,6 +1,7 @@
 "use client";
-import { useState, type FormEvent } from "react";
+import { useEffect, useState, type FormEvent } from "react";
 import axiosClient from "@/lib/axiosClient";
+import { getSuggestions, type UserSuggestion } from "@/lib/api";
 import type { TeamMember } from "@/lib/types";
 import { getErrorMessage } from "@/lib/errors";
 import Modal from "@/components/Modal";
@@ -9,6 +10,7 @@ type AddTaskModalProps = {
   open: boolean;
   onClose: () => void;
   projectId: string | number;
+  teamId?: number;
   teamMembers: TeamMember[];
   onAdded?: () => void;
 };
@@ -17,6 +19,7 @@ export default function AddTaskModal({
   open,
   onClose,
   projectId,
+  teamId,
   teamMembers,
   onAdded,
 }: AddTaskModalProps) {
@@ -25,9 +28,28 @@ export default function AddTaskModal({
   const [dueDate, setDueDate] = useState("");
   const [priority, setPriority] = useState("medium");
   const [assignee, setAssignee] = useState<number | "">("");
+  const [assigneeQuery, setAssigneeQuery] = useState("");
+  const [suggestions, setSuggestions] = useState<UserSuggestion[] | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
 
+  // Filter assignees on the server as the user types (debounced).
+  useEffect(() => {
+    const q = assigneeQuery.trim();
+    if (!q || !teamId) {
+      setSuggestions(null);
+      return;
+    }
+    const timer = setTimeout(() => {
+      getSuggestions(q, { type: "user", team: teamId })
+        .then((found) => setSuggestions(found as UserSuggestion[]))
+        .catch(() => setSuggestions(null));
+    }, 150);
+    return () => clearTimeout(timer);
+  }, [assigneeQuery, teamId]);
+
+  const assigneeOptions = suggestions ?? teamMembers.map((m) => m.user);
+
   const handleSubmit = async (e: FormEvent) => {
     e.preventDefault();
     setLoading(true);
@@ -108,6 +130,14 @@ export default function AddTaskModal({
         </label>
 
         <label className="text-sm">Assignee
+          {teamId && (
+            <input
+                className="mt-1 bg-zinc-800 p-2 rounded w-full"
+                placeholder="Search members…"
+                value={assigneeQuery}
+                onChange={(e) => setAssigneeQuery(e.target.value)}
+            />
+          )}
           <select
               value={assignee}
               onChange={e => setAssignee(Number(e.target.value) || "")}
@@ -115,9 +145,9 @@ export default function AddTaskModal({
           >
 
             <option value="">— No assignee —</option>
-            {teamMembers.map((m) => (
-                <option key={m.user.id} value={m.user.id}>
-                  {m.user.first_name} {m.user.last_name}
+            {assigneeOptions.map((u) => (
+                <option key={u.id} value={u.id}>
+                  {u.first_name} {u.last_name}
                 </option>
             ))}
           </select>
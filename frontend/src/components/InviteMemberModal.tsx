@@ -1,6 +1,7 @@
 "use client";
-import { useState, type FormEvent } from "react";
+import { useEffect, useState, type FormEvent } from "react";
 import axiosClient from "@/lib/axiosClient";
+import { getSuggestions, type UserSuggestion } from "@/lib/api";
 import { getErrorMessage } from "@/lib/errors";
 import Modal from "@/components/Modal";
 
@@ -18,6 +19,22 @@ export default function InviteMemberModal({ open, onClose, teamId, onInvited }:
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
   const [success, setSuccess] = useState("");
+  // People from the user's other teams, suggested as the email is typed.
+  const [suggestions, setSuggestions] = useState<UserSuggestion[]>([]);
+
+  useEffect(() => {
+    const q = email.trim();
+    if (!q) {
+      setSuggestions([]);
+      return;
+    }
+    const timer = setTimeout(() => {
+      getSuggestions(q, { type: "user" })
+        .then((found) => setSuggestions(found as UserSuggestion[]))
+        .catch(() => setSuggestions([]));
+    }, 150);
+    return () => clearTimeout(timer);
+  }, [email]);
 
   const handleSubmit = async (e: FormEvent) => {
     e.preventDefault();
@@ -42,7 +59,12 @@ export default function InviteMemberModal({ open, onClose, teamId, onInvited }:
     <Modal open={open} onClose={onClose} title="Invite Member" widthClass="max-w-md">
       <form className="flex flex-col gap-4" onSubmit={handleSubmit}>
         <label className="text-sm">Email
-          <input className="mt-1 bg-zinc-800 p-2 rounded w-full" type="email" value={email} onChange={e=>setEmail(e.target.value)} required/>
+          <input className="mt-1 bg-zinc-800 p-2 rounded w-full" type="email" value={email} onChange={e=>setEmail(e.target.value)} list="invite-suggestions" required/>
+          <datalist id="invite-suggestions">
+            {suggestions.map(u => (
+              <option key={u.id} value={u.email}>{u.first_name} {u.last_name}</option>
+            ))}
+          </datalist>
         </label>
         <label className="text-sm">Role
           <select className="mt-1 bg-zinc-800 p-2 rounded w-full" value={role} onChange={e=>setRole(e.target.value)}>
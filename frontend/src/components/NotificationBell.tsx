@@ -3,6 +3,7 @@
 import React, { useCallback, useEffect, useRef, useState } from "react";
 import { Bell } from "lucide-react";
 import { getNotifications, getUnreadNotificationCount, markAllNotificationsRead } from "@/lib/api";
+import { attachBoardSocket } from "@/lib/liveBoard";
 import { refreshAccessToken } from "@/lib/token";
 import type { NotificationItem } from "@/lib/types";
 
@@ -17,10 +18,19 @@ function timeAgo(iso: string) {
 }
 
 /** Derive the WebSocket URL from the REST API URL (http(s)://host/api -> ws(s)://host/ws/...). */
-function notificationsWsUrl(token: string) {
+function notificationsWsUrl(token: string, lastSeenId: number) {
   const api = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000/api";
   const base = api.replace(/\/api\/?$/, "").replace(/^http/, "ws");
-  return `${base}/ws/notifications/?token=${encodeURIComponent(token)}`;
+  // With the newest id we have, the server replays what was missed while offline.
+  const replay = lastSeenId > 0 ? `&last_seen_id=${lastSeenId}` : "";
+  return `${base}/ws/notifications/?token=${encodeURIComponent(token)}${replay}`;
+}
+
+/** Upsert notifications into the list (newest first); a digest that grew replaces its old version. */
+function mergeNotifications(items: NotificationItem[], added: NotificationItem[]): NotificationItem[] {
+  const byId = new Map(items.map((n) => [n.id, n]));
+  added.forEach((n) => byId.set(n.id, { ...byId.get(n.id), ...n }));
+  return Array.from(byId.values()).sort((a, b) => b.id - a.id);
 }
 
 /** Bell with an unread badge and a live WebSocket feed of notifications. */
@@ -29,6 +39,8 @@ export default function NotificationBell() {
   const [unread, setUnread] = useState(0);
   const [open, setOpen] = useState(false);
   const containerRef = useRef<HTMLDivElement>(null);
+  const lastSeenId = useRef(0);
+  lastSeenId.current = Math.max(lastSeenId.current, ...items.map((n) => n.id));
 
   const refresh = useCallback(async () => {
     try {
@@ -51,19 +63,70 @@ export default function NotificationBell() {
     let stopped = false;
     let reconnectTimer: ReturnType<typeof setTimeout>;
     let ws: WebSocket | null = null;
+    let attempts = 0;
 
     function connect() {
       const token = typeof window !== "undefined" ? localStorage.getItem("access") : null;
       if (!token) return;
-      ws = new WebSocket(notificationsWsUrl(token));
-      ws.onmessage = () => {
-        setUnread((c) => c + 1); // instant feedback
-        setTimeout(refresh, 700); // the DB row is written right after the push
+      const socket = new WebSocket(notificationsWsUrl(token, lastSeenId.current));
+      ws = socket;
+      // Open boards follow their project over this same socket.
+      ws.onopen = () => {
+        attempts = 0;
+        attachBoardSocket((message) => socket.send(JSON.stringify(message)));
+      };
+      ws.onmessage = (msg) => {
+        let data: {
+          event?: string; unread?: number; id?: number; count?: number;
+          message?: string; type?: string; timestamp?: string;
+          notifications?: NotificationItem[]; complete?: boolean;
+        } = {};
+        try {
+          data = JSON.parse(msg.data);
+        } catch {
+          /* not JSON — treat as a plain notification */
+        }
+        if (data.event === "unread_count") {
+          // Pushed when notifications are read (possibly in another tab).
+          setUnread(data.unread ?? 0);
+          return;
+        }
+        if (data.event === "replay") {
+          // Sent on reconnect: what arrived while the socket was down.
+          if (!data.complete) {
+            refresh();
+            return;
+          }
+          setItems((current) => mergeNotifications(current, data.notifications ?? []));
+          setUnread(data.unread ?? 0);
+          return;
+        }
+        if (data.event) {
+          // Other live events (e.g. timers) are for whoever listens on the window.
+          window.dispatchEvent(new CustomEvent("ws:event", { detail: data }));
+          return;
+        }
+        // New notifications carry the server's count; fall back to +1.
+        setUnread((c) => (typeof data.unread === "number" ? data.unread : c + 1));
+        if (typeof data.id === "number") {
+          const pushed: NotificationItem = {
+            id: data.id, message: data.message ?? "", type: data.type ?? "general", count: data.count ?? 1,
+            is_read: false, created_at: data.timestamp ?? new Date().toISOString(),
+          };
+          setItems((current) => mergeNotifications(current, [pushed]));
+        } else {
+          refresh();
+        }
       };
       ws.onclose = () => {
+        attachBoardSocket(null);
         if (stopped) return;
         // The token may have expired (15 min); refresh it before reconnecting so
         // the live feed recovers instead of looping forever with a stale token.
+        // Back off (with jitter, so tabs dropped by a deploy do not come back
+        // in lockstep) while the server keeps refusing the handshake.
+        attempts += 1;
+        const delay = Math.min(5000 * 2 ** (attempts - 1), 60000) * (0.5 + Math.random());
         reconnectTimer = setTimeout(async () => {
           try {
             await refreshAccessToken();
@@ -71,7 +134,7 @@ export default function NotificationBell() {
             /* refresh failed (logged out / expired) — connect() will no-op */
           }
           connect();
-        }, 5000);
+        }, delay);
       };
     }
     connect();
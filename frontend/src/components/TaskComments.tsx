@@ -1,6 +1,7 @@
 "use client";
 import { useEffect, useState } from "react";
 import axiosClient from "@/lib/axiosClient";
+import type { BoardFrame } from "@/lib/liveBoard";
 
 type CommentType = {
   id: number;
@@ -11,6 +12,29 @@ type CommentType = {
   replies: CommentType[];
 };
 
+/** Upsert pushed comments (a reply goes under its parent) and drop deleted ones. */
+function applyCommentChanges(comments: CommentType[], changed: CommentType[], deleted: number[]): CommentType[] {
+  const gone = new Set(deleted);
+  let next = comments
+    .filter((c) => !gone.has(c.id))
+    .map((c) => ({ ...c, replies: (c.replies || []).filter((r) => !gone.has(r.id)) }));
+  changed.forEach((comment) => {
+    if (comment.parent === null) {
+      const existing = next.find((c) => c.id === comment.id);
+      next = existing
+        ? next.map((c) => (c.id === comment.id ? { ...comment, replies: c.replies } : c))
+        : [...next, comment];
+    } else {
+      next = next.map((c) =>
+        c.id !== comment.parent
+          ? c
+          : { ...c, replies: [...c.replies.filter((r) => r.id !== comment.id), comment] }
+      );
+    }
+  });
+  return next;
+}
+
 type TaskCommentsProps = {
   projectId: string;
   taskId: string;
@@ -51,6 +75,17 @@ export default function TaskComments({
     // eslint-disable-next-line
   }, [projectId, taskId]);
 
+  // Live: apply other members' comment changes pushed for this task.
+  useEffect(() => {
+    const onEvent = (e: Event) => {
+      const frame = (e as CustomEvent<BoardFrame<CommentType>>).detail;
+      if (frame.event !== "board" || frame.kind !== "comment" || String(frame.task) !== String(taskId)) return;
+      setComments((current) => applyCommentChanges(current, frame.changed, frame.deleted));
+    };
+    window.addEventListener("ws:event", onEvent);
+    return () => window.removeEventListener("ws:event", onEvent);
+  }, [taskId]);
+
   // Add new root comment
   const handleAddComment = async (e: React.FormEvent) => {
     e.preventDefault();
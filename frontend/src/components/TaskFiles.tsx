@@ -1,6 +1,7 @@
 "use client";
 import { useEffect, useRef, useState } from "react";
 import axiosClient from "@/lib/axiosClient";
+import type { BoardFrame } from "@/lib/liveBoard";
 import { Paperclip, X } from "lucide-react";
 import { getErrorMessage } from "@/lib/errors";
 
@@ -83,6 +84,18 @@ export default function TaskFiles({
     // eslint-disable-next-line
   }, [projectId, taskId]);
 
+  // Live: reload when another member adds or removes a file of this task
+  // (previews are fetched as authenticated blobs, so the list is refetched).
+  useEffect(() => {
+    const onEvent = (e: Event) => {
+      const frame = (e as CustomEvent<BoardFrame>).detail;
+      if (frame.event === "board" && frame.kind === "file" && String(frame.task) === String(taskId)) fetchFiles();
+    };
+    window.addEventListener("ws:event", onEvent);
+    return () => window.removeEventListener("ws:event", onEvent);
+    // eslint-disable-next-line
+  }, [projectId, taskId]);
+
   // Revoke any outstanding object URLs on unmount.
   useEffect(() => () => {
     Object.values(previewsRef.current).forEach((u) => URL.revokeObjectURL(u));
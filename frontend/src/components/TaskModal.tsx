@@ -3,7 +3,10 @@ import React, { useState, useEffect } from "react";
 import { X, Edit2, Trash2, Play, Pause, PlusCircle, Save, AlertTriangle } from "lucide-react";
 import { StatusBadge, PriorityBadge } from "@/components/TaskBadge";
 import { useTimerStore } from "@/lib/timerStore";
-import { getTimeEntriesForTask, createTimeEntry, editTimeEntry, deleteTimeEntry } from "@/lib/api";
+import {
+  getTimeEntriesForTask, createTimeEntry, editTimeEntry, deleteTimeEntry,
+  startServerTimer, stopServerTimer,
+} from "@/lib/api";
 import type { Task, TeamMember, TimeEntry } from "@/lib/types";
 import TaskFiles from "@/components/TaskFiles";
 import TaskComments from "@/components/TaskComments";
@@ -47,8 +50,6 @@ export default function TaskModal({
   // Timer store (global)
   const {
     timer,
-    startTimer,
-    stopTimer,
     resetTimer,
     getElapsed,
   } = useTimerStore();
@@ -144,40 +145,38 @@ export default function TaskModal({
   const effectiveProjectId = projectId || task?.project?.id?.toString() || "";
 
   // --- Timer Handlers ---
-  function handleStartTimer() {
-    if (isOtherTaskActive) {
-      // Stop other timer before starting new one
-      stopTimer();
-      resetTimer();
+  // The timer runs on the server (so it survives reloads and other devices);
+  // stopping it there logs the time entry.
+  async function handleStartTimer() {
+    try {
+      const { timer: started } = await startServerTimer(task.id);
+      useTimerStore.getState().syncFromServer(started);
+      setTimeEntryError(null);
+    } catch {
+      setTimeEntryError("Failed to start the timer.");
     }
-    startTimer(taskId);
-    setTimeEntryError(null);
   }
 
   async function handleStopTimer() {
-    stopTimer();
-    // Save time entry if there is elapsed time
-    const elapsedSec = useTimerStore.getState().getElapsed();
-    // Any tracked session counts as at least one minute (a short session used to
-    // round to 0 and be discarded silently).
-    if (elapsedSec > 0) {
-      const minutes = Math.max(1, Math.round(elapsedSec / 60));
-      try {
-        await createTimeEntry({
-          task_id: task.id,
-          minutes,
-          date: new Date().toISOString().slice(0, 10),
-          note: "Tracked with timer",
-        });
-        getTimeEntriesForTask(task.id).then(setTimeEntries);
-      } catch {
-        setTimeEntryError("Failed to save time entry.");
-      }
+    try {
+      const logged = await stopServerTimer({ note: "Tracked with timer" });
+      if (logged) getTimeEntriesForTask(task.id).then(setTimeEntries);
+    } catch {
+      setTimeEntryError("Failed to save time entry.");
     }
     resetTimer();
     setLocalElapsed(0);
   }
 
+  async function handleStopOtherTimer() {
+    try {
+      await stopServerTimer({ note: "Tracked with timer" });
+    } catch {
+      /* already stopped elsewhere */
+    }
+    resetTimer();
+  }
+
   // Manual add
   async function handleAddManualTime() {
     const minutes = parseInt(manualMinutes, 10);
@@ -304,7 +303,7 @@ export default function TaskModal({
                   Timer is already running on another task (Task ID: <b>{otherTaskId}</b>).
                   <button
                     className="ml-2 px-2 py-1 rounded bg-yellow-700 hover:bg-yellow-800 text-white font-bold text-xs"
-                    onClick={() => { stopTimer(); resetTimer(); }}
+                    onClick={handleStopOtherTimer}
                   >
                     Stop other timer
                   </button>
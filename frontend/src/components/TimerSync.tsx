@@ -0,0 +1,47 @@
+"use client";
+
+import { useEffect } from "react";
+import { useAuth } from "@/components/AuthProvider";
+import { getCurrentTimer, timerHeartbeat } from "@/lib/api";
+import { useTimerStore } from "@/lib/timerStore";
+import type { RunningTimer } from "@/lib/types";
+
+const HEARTBEAT_MS = 60_000;
+
+/**
+ * Keeps the local timer in step with the server-side one: loads it on mount,
+ * sends a heartbeat while it runs, and follows `timer` events pushed over the
+ * notifications socket when another device starts or stops it.
+ */
+export default function TimerSync() {
+  const running = useTimerStore((s) => s.timer.running);
+  const syncFromServer = useTimerStore((s) => s.syncFromServer);
+  const { user } = useAuth();
+  const me = user?.id;
+
+  useEffect(() => {
+    getCurrentTimer().then(syncFromServer).catch(() => {});
+  }, [syncFromServer]);
+
+  useEffect(() => {
+    if (!running) return;
+    const id = setInterval(() => {
+      timerHeartbeat().then(syncFromServer).catch(() => {});
+    }, HEARTBEAT_MS);
+    return () => clearInterval(id);
+  }, [running, syncFromServer]);
+
+  useEffect(() => {
+    const onEvent = (e: Event) => {
+      const data = (e as CustomEvent<{ event: string; action?: string; timer?: RunningTimer }>).detail;
+      if (data.event !== "timer" || !data.timer) return;
+      // Teammates' timers arrive too; only our own drives the local clock.
+      if (data.timer.user !== me) return;
+      syncFromServer(data.action === "started" ? data.timer : null);
+    };
+    window.addEventListener("ws:event", onEvent);
+    return () => window.removeEventListener("ws:event", onEvent);
+  }, [me, syncFromServer]);
+
+  return null;
+}
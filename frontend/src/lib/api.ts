@@ -1,6 +1,6 @@
 
 import axiosClient from "./axiosClient";
-import type { Project, Team, Task, TimeEntry, TimeSummary, ActivityLog, NotificationItem } from "./types";
+import type { Project, ProjectSummary, Team, Task, TimeEntry, TimeSummary, TimeImportResult, RunningTimer, TeamTimeReport, TeamBudgetReport, ActivityLog, NotificationItem, NotificationPreferences } from "./types";
 
 /** Paginated Response */
 interface Paginated<T> {
@@ -16,6 +16,12 @@ export async function getProjects(): Promise<Project[]> {
   return res.data.results;
 }
 
+// Task counters per project instead of every task (dashboard stats, cards)
+export async function getProjectSummaries(): Promise<ProjectSummary[]> {
+  const res = await axiosClient.get<Paginated<ProjectSummary>>("/projects/", { params: { compact: true } });
+  return res.data.results;
+}
+
 export async function getProjectById(id: number): Promise<Project> {
   const res = await axiosClient.get<Project>(`/projects/${id}/`);
   return res.data;
@@ -70,6 +76,26 @@ export async function editTask(projectId: number, taskId: number, payload: Parti
   return res.data;
 }
 
+/** Board delta: tasks changed or deleted after `since` (0 = whole board). */
+export interface TaskChanges {
+  version: number;
+  changed: Task[];
+  deleted: number[];
+}
+
+export async function getTaskChanges(projectId: number | string, since: number): Promise<TaskChanges> {
+  const res = await axiosClient.get<TaskChanges>(`/projects/${projectId}/tasks/changes/?since=${since}`);
+  return res.data;
+}
+
+/** Apply a delta to a board's task list (updates in place, appends new, drops deleted). */
+export function applyTaskChanges(tasks: Task[], { changed, deleted }: TaskChanges): Task[] {
+  const byId = new Map(tasks.map((t) => [t.id, t]));
+  changed.forEach((t) => byId.set(t.id, t));
+  deleted.forEach((id) => byId.delete(id));
+  return Array.from(byId.values()).sort((a, b) => b.id - a.id);
+}
+
 
 export async function getMyTasks(): Promise<Task[]> {
   const res = await axiosClient.get<Paginated<Task>>("/my-tasks/");
@@ -98,10 +124,65 @@ export async function deleteTimeEntry(entryId: number): Promise<void> {
 }
 
 /* ---- TIME SUMMARY ---- */
+/* ----- SERVER-SIDE TIMER ----- */
+export async function getCurrentTimer(): Promise<RunningTimer | null> {
+  const res = await axiosClient.get<{ timer: RunningTimer | null }>("/timers/current/");
+  return res.data.timer;
+}
+/** Start a timer; a timer already running is stopped and its time logged (returned as `logged`). */
+export async function startServerTimer(
+  taskId: number,
+  note = ""
+): Promise<{ timer: RunningTimer; logged: TimeEntry | null }> {
+  const res = await axiosClient.post("/timers/start/", { task_id: taskId, note });
+  return res.data;
+}
+export async function stopServerTimer(options: { note?: string; discard?: boolean } = {}): Promise<TimeEntry | null> {
+  const res = await axiosClient.post<{ logged: TimeEntry | null }>("/timers/stop/", options);
+  return res.data.logged;
+}
+/** Resolves to null when no timer runs any more (stopped on another device). */
+export async function timerHeartbeat(): Promise<RunningTimer | null> {
+  const res = await axiosClient.post<{ timer: RunningTimer }>("/timers/heartbeat/", null, {
+    validateStatus: (status) => status === 200 || status === 404,
+  });
+  return res.status === 200 ? res.data.timer : null;
+}
+export async function getTeamTimers(teamId: number): Promise<RunningTimer[]> {
+  const res = await axiosClient.get<{ results: RunningTimer[] }>("/timers/team/", { params: { team: teamId } });
+  return res.data.results;
+}
+
+/** Import a CSV (task_id,date,minutes,note) of up to 1000 entries; all rows or none are saved. */
+export async function importTimeEntries(file: File): Promise<TimeImportResult> {
+  const form = new FormData();
+  form.append("file", file);
+  const res = await axiosClient.post<TimeImportResult>("/time-entries/bulk/", form, {
+    validateStatus: (status) => status === 201 || status === 400,
+  });
+  return res.data;
+}
 export async function getTimeSummary(): Promise<TimeSummary> {
   const res = await axiosClient.get("/time-entries/summary/");
   return res.data;
 }
+export async function getTeamTimeReport(
+  teamId: number,
+  params: { start?: string; end?: string } = {}
+): Promise<TeamTimeReport> {
+  const res = await axiosClient.get<TeamTimeReport>(`/time-reports/${teamId}/`, { params });
+  return res.data;
+}
+export async function getTeamBudgetReport(
+  teamId: number,
+  bucket: TeamBudgetReport["bucket"] = "week"
+): Promise<TeamBudgetReport> {
+  const res = await axiosClient.get<TeamBudgetReport>(`/time-reports/${teamId}/budget/`, { params: { bucket } });
+  return res.data;
+}
+export function setMemberRate(teamId: number, userId: number, hourlyRate: string | null): Promise<void> {
+  return axiosClient.post(`/teams/${teamId}/set-rate/`, { user_id: userId, hourly_rate: hourlyRate }).then(() => {});
+}
 export async function getAllTimeEntries(): Promise<TimeEntry[]> {
   // Follow pagination so the table and CSV export see the full history, not just
   // the first page.
@@ -146,3 +227,42 @@ export async function getUnreadNotificationCount(): Promise<number> {
 export async function markAllNotificationsRead(): Promise<void> {
   await axiosClient.post("/notifications/mark_all_read/");
 }
+
+export async function getNotificationPreferences(): Promise<NotificationPreferences> {
+  const res = await axiosClient.get<NotificationPreferences>("/notifications/preferences/");
+  return res.data;
+}
+
+export async function updateNotificationPreferences(
+  changes: Partial<Omit<NotificationPreferences, "digest_available">>
+): Promise<NotificationPreferences> {
+  const res = await axiosClient.patch<NotificationPreferences>("/notifications/preferences/", changes);
+  return res.data;
+}
+
+/* ----- TYPEAHEAD ----- */
+export interface UserSuggestion {
+  type: "user";
+  id: number;
+  first_name: string;
+  last_name: string;
+  email: string;
+}
+
+export interface ProjectSuggestion {
+  type: "project";
+  id: number;
+  name: string;
+  team: number;
+}
+
+export type Suggestion = UserSuggestion | ProjectSuggestion;
+
+/** Server-side picker suggestions; `team` narrows to one team's members/projects. */
+export async function getSuggestions(
+  q: string,
+  params: { type?: Suggestion["type"]; team?: number } = {}
+): Promise<Suggestion[]> {
+  const res = await axiosClient.get<{ results: Suggestion[] }>("/search/typeahead/", { params: { q, ...params } });
+  return res.data.results;
+}
@@ -0,0 +1,45 @@
+/**
+ * Live board subscriptions over the notifications socket.
+ *
+ * Pages call `subscribeBoard(projectId)` while a board is open; the socket
+ * (owned by NotificationBell) sends the subscribe/unsubscribe messages and
+ * re-subscribes everything after a reconnect. Board deltas then arrive as
+ * `{"event": "board"}` frames on the window's "ws:event".
+ */
+type Send = (message: { action: "subscribe" | "unsubscribe"; project: number }) => void;
+
+const open = new Map<number, number>(); // project id -> number of open boards
+let send: Send | null = null;
+
+/** Called by the socket owner when it connects (with a sender) or drops (null). */
+export function attachBoardSocket(sender: Send | null) {
+  send = sender;
+  if (sender) open.forEach((_, project) => sender({ action: "subscribe", project }));
+}
+
+/** Follow a project's board; returns the function that stops following it. */
+export function subscribeBoard(projectId: number): () => void {
+  const count = open.get(projectId) ?? 0;
+  open.set(projectId, count + 1);
+  if (count === 0) send?.({ action: "subscribe", project: projectId });
+  return () => {
+    const left = (open.get(projectId) ?? 1) - 1;
+    if (left > 0) {
+      open.set(projectId, left);
+      return;
+    }
+    open.delete(projectId);
+    send?.({ action: "unsubscribe", project: projectId });
+  };
+}
+
+/** A board delta pushed by the server (`changed` rows are tasks, comments or files, per `kind`). */
+export interface BoardFrame<T = unknown> {
+  event: "board";
+  project: number;
+  kind: "task" | "comment" | "file";
+  changed: T[];
+  deleted: number[];
+  version?: number; // task frames: board version the change was written under
+  task?: number; // comment and file frames: the task they belong to
+}
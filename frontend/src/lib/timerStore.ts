@@ -14,6 +14,8 @@ interface TimerStore {
   stopTimer: () => void;
   resetTimer: () => void;
   getElapsed: () => number; // total elapsed seconds
+  /** Mirror the server's running timer (null: none runs). */
+  syncFromServer: (timer: { task: number; started_at: string } | null) => void;
 }
 
 export const useTimerStore = create<TimerStore>()(
@@ -69,7 +71,21 @@ export const useTimerStore = create<TimerStore>()(
           return timer.elapsed + Math.floor((Date.now() - timer.startTime) / 1000);
         }
         return timer.elapsed;
-      }
+      },
+      syncFromServer: (serverTimer) => {
+        if (!serverTimer) {
+          get().resetTimer();
+          return;
+        }
+        set({
+          timer: {
+            running: true,
+            taskId: String(serverTimer.task),
+            startTime: Date.parse(serverTimer.started_at),
+            elapsed: 0,
+          },
+        });
+      },
     }),
     {
       name: "global-task-timer",
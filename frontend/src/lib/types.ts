@@ -55,6 +55,8 @@ export interface Task {
   created_by: User;
   project: { id: number; name: string };
   created_at: string;
+  updated_at?: string;
+  version?: number; // project version of the task's last write (delta sync)
   minutes?: number;
   can_manage?: boolean; // requesting user may edit/delete (admin/manager)
 }
@@ -75,6 +77,24 @@ export interface Project {
   task_count?: number;
 }
 
+// Compact project list row (GET /projects/?compact=true): counters instead of tasks
+export interface ProjectSummary {
+  id: number;
+  name: string;
+  description: string;
+  team: { id: number; name: string };
+  created_by: User;
+  created_at: string;
+  budget?: number | string | null;
+  due_date?: string | null;
+  task_count: number;
+  stats: {
+    by_status: Record<string, number>;
+    by_priority: Record<string, number>;
+    overdue: number;
+  };
+}
+
 // Time Entry
 export interface TimeEntry {
   id: number;
@@ -95,7 +115,69 @@ export interface TimeSummary {
   total_minutes: number;
   today_minutes: number;
   week_total_minutes: number;
+  month_total_minutes: number;
+  quarter_total_minutes: number;
   per_day: TimeSummaryDay[];
+  ranges: { start: string; end: string; minutes: number }[];
+}
+
+// Server-side running timer
+export interface RunningTimer {
+  user: number;
+  user_email: string;
+  user_first_name: string;
+  user_last_name: string;
+  task: number;
+  task_title: string;
+  project: number;
+  team: number;
+  note: string;
+  started_at: string;
+  last_heartbeat: string;
+  elapsed_seconds: number;
+}
+
+export interface TimeImportResult {
+  created: number;
+  errors: { row: number; errors: Record<string, string[]> }[];
+}
+
+// Team time report (admins and managers)
+export interface TeamTimeReport {
+  team: number;
+  start: string;
+  end: string;
+  total_minutes: number;
+  by_project: { project: number; name: string; minutes: number }[];
+  by_user: { user: number; first_name: string; last_name: string; email: string; minutes: number }[];
+  by_week: { week: string; minutes: number }[];
+}
+
+export interface BudgetBurnPoint {
+  period: string;
+  minutes: number;
+  cost: string;
+  spent: string;
+  remaining: string | null;
+}
+
+export interface ProjectBudgetBurn {
+  project: number;
+  name: string;
+  budget: string | null;
+  due_date: string | null;
+  minutes: number;
+  spent: string;
+  remaining: string | null;
+  burned_percent: number | null;
+  series: BudgetBurnPoint[];
+}
+
+export interface TeamBudgetReport {
+  team: number;
+  bucket: "day" | "week" | "month";
+  default_hourly_rate: string;
+  projects: ProjectBudgetBurn[];
 }
 
 // Comments (threaded)
@@ -131,6 +213,12 @@ export interface NotificationItem {
   type: string;
   is_read: boolean;
   created_at: string;
+  count: number; // events folded into this (digest) notification
+}
+
+export interface NotificationPreferences {
+  email_delivery: "immediate" | "digest"; // digest: one batched email every few minutes
+  digest_available: boolean; // false when the server runs no job worker to send digests
 }
 
 // Activity log entry (audit feed)
@@ -13,6 +13,15 @@ def media_root(settings, tmp_path):
     settings.MEDIA_ROOT = tmp_path / "media"
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with empty caches; database ids are reused across tests."""
+    from django.core.cache import cache
+    from apps.notify.middleware import user_cache
+    cache.clear()
+    user_cache.clear()
+
+
 @pytest.fixture
 def user(db):
     from tests.factories import UserFactory
@@ -20,10 +29,18 @@ def user(db):
 
 
 @pytest.fixture
-def auth_client(user):
-    client = APIClient()
-    client.force_authenticate(user=user)
-    return client
+def client_for():
+    """Build API clients authenticated as a given user."""
+    def build(user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+    return build
+
+
+@pytest.fixture
+def auth_client(user, client_for):
+    return client_for(user)
 
 
 @pytest.fixture
@@ -35,6 +52,21 @@ def team(db, user):
     return team
 
 
+@pytest.fixture
+def member(team):
+    """A developer in ``team``, next to ``user`` as its admin."""
+    from tests.factories import UserFactory
+    from apps.teams.models import TeamMembership
+    member = UserFactory()
+    TeamMembership.objects.create(team=team, user=member, role='developer', status='accepted')
+    return member
+
+
+@pytest.fixture
+def member_client(member, client_for):
+    return client_for(member)
+
+
 @pytest.fixture
 def project(team):
     from tests.factories import ProjectFactory
@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.common.cache import cache_stats
+from apps.teams.models import TeamMembership
+from tests.factories import TeamFactory, UserFactory
+
+
+@pytest.mark.django_db
+def test_repeated_reads_are_served_from_cache(task, auth_client):
+    url = reverse("projects-list")
+
+    first = auth_client.get(url)
+    with CaptureQueriesContext(connection) as ctx:
+        second = auth_client.get(url)
+
+    assert first["X-Cache"] == "MISS"
+    assert second["X-Cache"] == "HIT"
+    assert second.data == first.data
+    assert len(ctx.captured_queries) == 1  # ETag stamp; memberships come from the cache too
+    assert cache_stats()["projects"] == {"hit": 1, "miss": 1}
+
+
+@pytest.mark.django_db
+def test_cache_is_per_user(project, task, auth_client, member_client):
+    url = reverse("project-tasks-list", args=[project.id])
+    auth_client.get(url)
+
+    res = member_client.get(url)
+    assert res["X-Cache"] == "MISS"
+    assert res.data["results"][0]["can_manage"] is False
+
+
+@pytest.mark.django_db
+def test_task_writes_invalidate_project_and_task_reads(project, task, auth_client, member_client):
+    tasks_url = reverse("project-tasks-list", args=[project.id])
+    member_client.get(reverse("projects-list"))
+    member_client.get(tasks_url)
+
+    res = auth_client.post(tasks_url, {
+        "title": "Fresh", "description": "d", "project": project.id, "status": "todo",
+        "priority": "low", "due_date": timezone.now() + timedelta(days=3),
+    })
+    assert res.status_code == 201
+
+    projects = member_client.get(reverse("projects-list"))
+    tasks = member_client.get(tasks_url)
+    assert projects["X-Cache"] == tasks["X-Cache"] == "MISS"
+    assert "Fresh" in {t["title"] for t in projects.data["results"][0]["tasks"]}
+    assert tasks.data["count"] == 2
+
+
+@pytest.mark.django_db
+def test_other_teams_writes_keep_task_cache_warm(user, project, auth_client):
+    tasks_url = reverse("project-tasks-list", args=[project.id])
+    other_team = TeamFactory()
+    TeamMembership.objects.create(team=other_team, user=user, role="admin", status="accepted")
+    auth_client.get(tasks_url)
+
+    auth_client.post(reverse("projects-list"), {"name": "Elsewhere", "team": other_team.id})
+
+    assert auth_client.get(tasks_url)["X-Cache"] == "HIT"
+
+
+@pytest.mark.django_db
+def test_role_change_invalidates_team_reads(team, auth_client, member, member_client):
+    url = reverse("teams-detail", args=[team.id])
+    assert member_client.get(url).data["is_admin"] is False
+
+    auth_client.post(reverse("teams-change-role", args=[team.id]), {"user_id": member.id, "role": "admin"})
+
+    res = member_client.get(url)
+    assert res["X-Cache"] == "MISS"
+    assert res.data["is_admin"] is True
+
+
+@pytest.mark.django_db
+def test_removed_member_stops_seeing_cached_projects(team, project, auth_client, member, member_client):
+    assert member_client.get(reverse("projects-list")).data["count"] == 1
+
+    auth_client.post(reverse("teams-remove-member", args=[team.id]), {"user_id": member.id})
+
+    assert member_client.get(reverse("projects-list")).data["count"] == 0
+    assert member_client.get(reverse("project-tasks-list", args=[project.id])).data["count"] == 0
+
+
+@pytest.mark.django_db
+def test_invite_acceptance_invalidates_team_reads(team, auth_client, client_for):
+    invitee = UserFactory()
+    auth_client.post(reverse("teams-invite-member", args=[team.id]), {"email": invitee.email, "role": "developer"})
+    membership = TeamMembership.objects.get(team=team, user=invitee)
+    before = auth_client.get(reverse("teams-detail", args=[team.id]))
+
+    client_for(invitee).post(reverse("invitation-accept", args=[membership.invite_token]))
+
+    after = auth_client.get(reverse("teams-detail", args=[team.id]))
+    assert after["X-Cache"] == "MISS"
+    statuses = {m["user"]["email"]: m["status"] for m in after.data["members"]}
+    assert statuses[invitee.email] == "accepted"
+    assert before.data != after.data
+
+
+@pytest.mark.django_db
+def test_profile_update_invalidates_teammates_reads(project, task, auth_client, member_client):
+    url = reverse("project-tasks-list", args=[project.id])
+    member_client.get(url)
+
+    auth_client.patch(reverse("user-update-profile"), {"first_name": "Renamed"})
+
+    res = member_client.get(url)
+    assert res["X-Cache"] == "MISS"
+    assert res.data["results"][0]["created_by"].startswith("Renamed ")
+
+
+@pytest.mark.django_db
+def test_writes_outside_the_api_move_cache_and_etag_together(project, task, auth_client):
+    url = reverse("project-tasks-list", args=[project.id])
+    first = auth_client.get(url)
+
+    task.title = "Renamed in the shell"
+    task.save()
+
+    res = auth_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert res.status_code == 200 and res["X-Cache"] == "MISS"
+    assert res["ETag"] != first["ETag"]
+    assert res.data["results"][0]["title"] == "Renamed in the shell"
+    assert auth_client.get(url, HTTP_IF_NONE_MATCH=res["ETag"]).status_code == 304
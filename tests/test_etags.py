@@ -0,0 +1,172 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.projects.models import Project
+from tests.factories import TaskFactory
+
+
+@pytest.fixture
+def board(team, project, task, auth_client, member, member_client):
+    """The shared team fixtures, with the task assigned to the developer."""
+    task.assigned_to = member
+    task.save()
+    return {
+        "team": team, "project": project, "task": task,
+        "manager": auth_client, "developer": member_client, "developer_user": member,
+    }
+
+
+def _urls(board):
+    project, task = board["project"], board["task"]
+    return [
+        reverse("projects-list"),
+        reverse("projects-list") + "?compact=true",
+        reverse("projects-detail", args=[project.id]),
+        reverse("project-tasks-list", args=[project.id]),
+        reverse("project-tasks-detail", args=[project.id, task.id]),
+    ]
+
+
+def _etags(client, urls):
+    etags = {}
+    for url in urls:
+        res = client.get(url)
+        assert res.status_code == 200, url
+        etags[url] = res["ETag"]
+    return etags
+
+
+@pytest.mark.django_db
+def test_matching_etag_answers_304_without_serializing(board):
+    url = reverse("project-tasks-list", args=[board["project"].id])
+    etag = board["manager"].get(url)["ETag"]
+    cache.clear()  # make sure a 304 does not come from the response cache
+
+    with patch("apps.tasks.serializers.TaskSerializer.to_representation") as to_representation:
+        res = board["manager"].get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert res.status_code == 304
+    assert res["ETag"] == etag
+    assert not res.content
+    to_representation.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_stale_or_foreign_etag_gets_full_response(board):
+    url = reverse("project-tasks-list", args=[board["project"].id])
+    manager_etag = board["manager"].get(url)["ETag"]
+
+    assert board["manager"].get(url, HTTP_IF_NONE_MATCH='"stale"').status_code == 200
+    # Payloads carry per-user fields (can_manage), so ETags are per user too.
+    res = board["developer"].get(url, HTTP_IF_NONE_MATCH=manager_etag)
+    assert res.status_code == 200
+    assert res["ETag"] != manager_etag
+
+
+def _create_task(board):
+    project = board["project"]
+    return board["manager"].post(reverse("project-tasks-list", args=[project.id]), {
+        "title": "New", "description": "d", "project": project.id, "status": "todo",
+        "priority": "low", "due_date": timezone.now() + timedelta(days=2),
+    })
+
+
+def _update_task(board):
+    project, task = board["project"], board["task"]
+    return board["manager"].patch(
+        reverse("project-tasks-detail", args=[project.id, task.id]), {"title": "Renamed"}
+    )
+
+
+def _move_task(board):
+    # Developers may only change the status of their own tasks.
+    project, task = board["project"], board["task"]
+    return board["developer"].patch(
+        reverse("project-tasks-detail", args=[project.id, task.id]), {"status": "done"}
+    )
+
+
+def _update_project(board):
+    project = board["project"]
+    return board["manager"].patch(reverse("projects-detail", args=[project.id]), {"description": "Changed"})
+
+
+def _change_role(board):
+    team = board["team"]
+    return board["manager"].post(
+        reverse("teams-change-role", args=[team.id]),
+        {"user_id": board["developer_user"].id, "role": "manager"},
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("mutate", [
+    _create_task, _update_task, _move_task, _update_project, _change_role,
+])
+def test_every_mutation_changes_the_etags(board, mutate):
+    urls = _urls(board)
+    before = _etags(board["developer"], urls)
+
+    assert mutate(board).status_code in (200, 201, 204)
+
+    after = _etags(board["developer"], urls)
+    assert {url for url in urls if before[url] == after[url]} == set()
+
+
+@pytest.mark.django_db
+def test_task_delete_changes_the_etags(board):
+    project = board["project"]
+    other = TaskFactory(project=project, created_by=project.created_by)
+    urls = _urls(board)
+    before = _etags(board["developer"], urls)
+
+    res = board["manager"].delete(reverse("project-tasks-detail", args=[project.id, other.id]))
+    assert res.status_code == 204
+
+    after = _etags(board["developer"], urls)
+    assert all(before[url] != after[url] for url in urls)
+
+
+@pytest.mark.django_db
+def test_project_create_and_delete_change_the_list_etag(board):
+    url = reverse("projects-list")
+    first = board["manager"].get(url)["ETag"]
+
+    res = board["manager"].post(url, {"name": "Second", "team": board["team"].id})
+    assert res.status_code == 201
+    second = board["manager"].get(url)["ETag"]
+
+    created = Project.objects.get(name="Second")
+    assert board["manager"].delete(reverse("projects-detail", args=[created.id])).status_code == 204
+    third = board["manager"].get(url)["ETag"]
+
+    assert second != first
+    assert third != second  # back to the original set of projects, so first == third is fine
+
+
+@pytest.mark.django_db
+def test_compact_etag_follows_overdue_tasks(board):
+    url = reverse("projects-list") + "?compact=true"
+    etag = board["manager"].get(url)["ETag"]
+    cache.clear()
+
+    later = timezone.now() + timedelta(days=30)  # the task's due date has passed
+    with patch("django.utils.timezone.now", return_value=later):
+        res = board["manager"].get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert res.status_code == 200
+    assert res.data["results"][0]["stats"]["overdue"] == 1
+
+
+@pytest.mark.django_db
+def test_unrelated_team_writes_keep_etags(board):
+    url = reverse("project-tasks-list", args=[board["project"].id])
+    etag = board["developer"].get(url)["ETag"]
+    TaskFactory()  # another team's project
+
+    assert board["developer"].get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
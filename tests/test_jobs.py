@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.jobs.models import DeadJob, Job
+from apps.jobs.queue import enqueue, run_pending
+from apps.notify.models import Notification
+from apps.notify.services import notify_user
+from tests.factories import UserFactory
+
+CALLS = []
+
+
+def record_call(value):
+    CALLS.append(value)
+
+
+def always_fails(value):
+    raise RuntimeError(f"boom {value}")
+
+
+@pytest.fixture
+def queued(settings):
+    """Switch off inline mode so jobs are stored for the worker."""
+    settings.JOBS_RUN_INLINE = False
+    CALLS.clear()
+
+
+def test_enqueue_runs_inline_during_tests():
+    CALLS.clear()
+    assert enqueue(record_call, value=1) is None
+    assert CALLS == [1]
+
+
+@pytest.mark.django_db
+def test_enqueue_stores_job_and_worker_runs_it(queued):
+    job = enqueue(record_call, value="x")
+    assert job.name == "tests.test_jobs.record_call"
+    assert job.kwargs == {"value": "x"}
+    assert CALLS == []
+
+    assert run_pending() == 1
+    assert CALLS == ["x"]
+    assert not Job.objects.exists()
+
+
+@pytest.mark.django_db
+def test_delayed_job_waits_until_due(queued):
+    enqueue(record_call, value=1, delay=timedelta(minutes=5))
+    assert run_pending() == 0
+    Job.objects.update(run_at=timezone.now())
+    assert run_pending() == 1
+
+
+@pytest.mark.django_db
+def test_failed_job_is_retried_then_dead_lettered(queued):
+    enqueue(always_fails, value=7, max_attempts=2)
+
+    run_pending()
+    job = Job.objects.get()
+    assert job.status == Job.STATUS_PENDING
+    assert job.attempts == 1
+    assert "boom 7" in job.last_error
+    assert job.run_at > timezone.now()
+
+    Job.objects.update(run_at=timezone.now())
+    run_pending()
+    assert not Job.objects.exists()
+    dead = DeadJob.objects.get()
+    assert dead.attempts == 2
+    assert dead.kwargs == {"value": 7}
+    assert "RuntimeError" in dead.error
+
+
+@pytest.mark.django_db
+def test_stale_running_job_is_released(queued):
+    job = enqueue(record_call, value=3)
+    Job.objects.filter(id=job.id).update(
+        status=Job.STATUS_RUNNING, locked_at=timezone.now() - timedelta(hours=1)
+    )
+    assert run_pending() == 1
+    assert CALLS == [3]
+
+
+@pytest.mark.django_db
+def test_notify_user_defers_email_to_worker(queued):
+    user = UserFactory()
+    notify_user(user, "Assigned", email_subject="New task", email_body="You got a task")
+
+    # The notification row is written right away; delivery waits for the worker.
+    assert Notification.objects.filter(user=user).count() == 1
+    assert len(mail.outbox) == 0
+    assert Job.objects.count() == 2
+
+    call_command("run_jobs", "--once")
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [user.email]
+    assert not Job.objects.exists()
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from rest_framework_simplejwt.tokens import AccessToken
+
+from config.asgi import application
+from tests.factories import ProjectFactory, TaskFactory, TeamFactory, UserFactory
+
+
+@database_sync_to_async
+def _board(role="admin"):
+    user = UserFactory()
+    team = TeamFactory()
+    team.membership_set.create(user=user, role=role, status="accepted")
+    return user, ProjectFactory(team=team)
+
+
+async def _connect(user):
+    communicator = WebsocketCommunicator(application, f"/ws/notifications/?token={AccessToken.for_user(user)}")
+    connected, _ = await communicator.connect()
+    assert connected
+    return communicator
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_subscribe_is_limited_to_team_members():
+    user, project = await _board()
+    stranger_project = await database_sync_to_async(ProjectFactory)()
+    communicator = await _connect(user)
+
+    await communicator.send_json_to({"action": "subscribe", "project": stranger_project.id})
+    assert (await communicator.receive_json_from())["event"] == "error"
+    await communicator.send_json_to({"action": "subscribe", "project": "x"})
+    assert (await communicator.receive_json_from())["event"] == "error"
+
+    await communicator.send_json_to({"action": "subscribe", "project": project.id})
+    assert await communicator.receive_json_from() == {"event": "subscribed", "project": project.id, "version": 0}
+    await communicator.send_json_to({"action": "unsubscribe", "project": project.id})
+    assert await communicator.receive_json_from() == {"event": "unsubscribed", "project": project.id}
+    await communicator.disconnect()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_task_writes_reach_subscribed_boards_only(client_for):
+    user, project = await _board()
+    other_user, other_project = await _board()
+    watcher, idle = await _connect(user), await _connect(other_user)
+    await watcher.send_json_to({"action": "subscribe", "project": project.id})
+    await watcher.receive_json_from()
+    await idle.send_json_to({"action": "subscribe", "project": other_project.id})
+    await idle.receive_json_from()
+
+    client = client_for(user)
+    res = await database_sync_to_async(client.post)(
+        f"/api/projects/{project.id}/tasks/",
+        {"title": "Live", "description": "", "project": project.id, "status": "todo", "priority": "low",
+         "due_date": "2030-01-01"},
+        format="json",
+    )
+    assert res.status_code == 201
+
+    # The actor's own notifications go to user_<id>; board frames carry "event": "board".
+    frame = await watcher.receive_json_from()
+    while frame.get("event") != "board":
+        frame = await watcher.receive_json_from()
+    assert frame["project"] == project.id and frame["kind"] == "task"
+    assert frame["deleted"] == [] and frame["changed"][0]["title"] == "Live"
+    assert frame["version"] == frame["changed"][0]["version"]
+    assert "can_manage" not in frame["changed"][0]
+
+    task_id, created_version = frame["changed"][0]["id"], frame["version"]
+    res = await database_sync_to_async(client.delete)(f"/api/projects/{project.id}/tasks/{task_id}/")
+    assert res.status_code == 204
+    frame = await watcher.receive_json_from()
+    while frame.get("event") != "board":
+        frame = await watcher.receive_json_from()
+    assert frame["deleted"] == [task_id] and frame["version"] == created_version + 1
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(idle.receive_json_from(), timeout=0.5)
+    await watcher.disconnect()
+    await idle.disconnect()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_comment_changes_are_pushed_with_their_task(client_for):
+    user, project = await _board()
+    task = await database_sync_to_async(TaskFactory)(project=project)
+    watcher = await _connect(user)
+    await watcher.send_json_to({"action": "subscribe", "project": project.id})
+    await watcher.receive_json_from()
+
+    client = client_for(user)
+    res = await database_sync_to_async(client.post)(
+        f"/api/projects/{project.id}/tasks/{task.id}/comments/", {"text": "Looks good"}, format="json",
+    )
+    assert res.status_code == 201
+    frame = await watcher.receive_json_from()
+    assert frame["kind"] == "comment" and frame["task"] == task.id
+    assert frame["changed"][0]["text"] == "Looks good" and frame["changed"][0]["parent"] is None
+
+    comment_id = frame["changed"][0]["id"]
+    await database_sync_to_async(client.delete)(f"/api/projects/{project.id}/tasks/{task.id}/comments/{comment_id}/")
+    frame = await watcher.receive_json_from()
+    assert frame["kind"] == "comment" and frame["deleted"] == [comment_id]
+    await watcher.disconnect()
@@ -1,5 +1,16 @@
+import csv
+import gzip
+import importlib
+import io
+import json
+import re
+from datetime import datetime, timezone as dt_timezone
+
 import pytest
+from django.core.management import call_command
+from django.db.migrations.loader import MigrationLoader
 from django.urls import reverse
+from django.utils import timezone
 
 from apps.logs.services import log_activity
 from tests.factories import (
@@ -128,4 +139,187 @@ def test_logs_are_ordered_by_timestamp(auth_client):
     url = reverse("logs-list")
     res = auth_client.get(url)
     timestamps = [log["timestamp"] for log in res.data["results"]]
-    assert timestamps == sorted(timestamps, reverse=True)
\ No newline at end of file
+    assert timestamps == sorted(timestamps, reverse=True)
+
+
+def _entry_at(when, **kwargs):
+    log = ActivityLogFactory(**kwargs)
+    ActivityLog.objects.filter(pk=log.pk).update(timestamp=when)  # auto_now_add ignores the factory value
+    return log
+
+
+@pytest.mark.django_db
+def test_archive_activity_moves_old_months_to_gzipped_jsonl(tmp_path, settings):
+    now = timezone.now()
+    january = datetime(now.year - 2, 1, 15, tzinfo=dt_timezone.utc)
+    old = [_entry_at(january, target_repr=f"Task {n}") for n in range(3)]
+    _entry_at(datetime(now.year - 2, 2, 3, tzinfo=dt_timezone.utc))
+    recent = ActivityLogFactory()
+
+    call_command("archive_activity", days=365, dir=str(tmp_path))
+
+    assert list(ActivityLog.objects.values_list("id", flat=True)) == [recent.id]
+    with gzip.open(tmp_path / f"activity-{now.year - 2}-01.jsonl.gz", "rt") as archive:
+        records = [json.loads(line) for line in archive]
+    assert [record["id"] for record in records] == [log.id for log in old]
+    assert records[0]["target_repr"] == "Task 0"
+    assert old[0].team_id and records[0]["team_id"] == old[0].team_id
+    assert records[0]["timestamp"] == january.isoformat()
+    assert (tmp_path / f"activity-{now.year - 2}-02.jsonl.gz").exists()
+
+
+def _partition_migration():
+    return importlib.import_module("apps.logs.migrations.0003_partition_activitylog")
+
+
+def _activitylog_at_partition_migration():
+    state = MigrationLoader(None).project_state(("logs", "0003_partition_activitylog"))
+    return state.apps.get_model("logs", "ActivityLog")
+
+
+def test_partition_migration_freezes_its_indexes_and_foreign_keys():
+    migration = _partition_migration()
+    model = _activitylog_at_partition_migration()
+
+    assert set(migration.INDEXES) == {index.name for index in model._meta.indexes}
+    assert migration.FOREIGN_KEYS == {
+        field.column: field.related_model._meta.db_table
+        for field in model._meta.concrete_fields if field.is_relation
+    }
+
+
+def test_partition_convert_only_references_columns_of_its_migration(monkeypatch):
+    from apps.logs import partitions
+
+    statements = []
+
+    class Cursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, sql, params=None):
+            statements.append(sql)
+
+        def fetchone(self):
+            return (None,)
+
+    class Connection:
+        vendor = "postgresql"
+        alias = "default"
+
+        def cursor(self):
+            return Cursor()
+
+    monkeypatch.setattr(partitions, "is_partitioned", lambda connection: False)
+    monkeypatch.setattr(partitions, "create_partition", lambda connection, month: False)
+    migration = _partition_migration()
+    partitions.convert(Connection(), timezone.now(), migration.FOREIGN_KEYS, migration.INDEXES)
+
+    columns = {field.column for field in _activitylog_at_partition_migration()._meta.concrete_fields}
+    referenced = set()
+    for sql in statements:
+        referenced.update(re.findall(r"FOREIGN KEY \((\w+)\)", sql))
+        for index_columns in re.findall(r"CREATE INDEX \w+ ON \w+ \((.*)\)", sql):
+            referenced.update(re.findall(r'"?(\w+)"?(?: DESC)?(?:,|$)', index_columns))
+    assert referenced == {"user_id", "project_id", "timestamp"}
+    assert referenced <= columns
+
+
+@pytest.mark.django_db
+def test_archive_activity_appends_to_an_existing_month(tmp_path):
+    year = timezone.now().year - 2
+    first = _entry_at(datetime(year, 5, 1, tzinfo=dt_timezone.utc))
+    call_command("archive_activity", dir=str(tmp_path))
+    second = _entry_at(datetime(year, 5, 2, tzinfo=dt_timezone.utc))
+    call_command("archive_activity", dir=str(tmp_path))
+
+    with gzip.open(tmp_path / f"activity-{year}-05.jsonl.gz", "rt") as archive:
+        assert [json.loads(line)["id"] for line in archive] == [first.id, second.id]
+
+
+@pytest.mark.django_db
+def test_archive_activity_dry_run_changes_nothing(tmp_path):
+    log = _entry_at(datetime(timezone.now().year - 2, 3, 1, tzinfo=dt_timezone.utc))
+
+    call_command("archive_activity", dir=str(tmp_path), dry_run=True)
+
+    assert ActivityLog.objects.filter(pk=log.pk).exists()
+    assert not any(tmp_path.iterdir())
+
+
+@pytest.fixture
+def export_setup(auth_client):
+    user = auth_client.handler._force_user
+    team = TeamFactory()
+    TeamMembership.objects.create(team=team, user=user, role="developer", status="accepted")
+    project = ProjectFactory(team=team)
+    logs = [
+        _entry_at(datetime(2025, 1, 10, tzinfo=dt_timezone.utc), project=project, user=user, target_repr="=cmd()"),
+        _entry_at(datetime(2025, 2, 10, tzinfo=dt_timezone.utc), project=project, target_type="comment"),
+        _entry_at(datetime(2025, 3, 10, tzinfo=dt_timezone.utc), project=project),
+    ]
+    ActivityLogFactory()  # another team
+    return user, project, logs
+
+
+def _export(client, **params):
+    res = client.get(reverse("logs-export"), params)
+    assert res.status_code == 200
+    assert res.streaming
+    return res, b"".join(res.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_export_streams_csv_oldest_first(auth_client, export_setup):
+    user, project, logs = export_setup
+
+    res, body = _export(auth_client)
+
+    assert res["Content-Type"].startswith("text/csv")
+    assert res["Content-Disposition"].startswith("attachment;")
+    records = list(csv.DictReader(io.StringIO(body)))
+    assert [int(r["id"]) for r in records] == [log.id for log in logs]
+    assert records[0]["user_email"] == user.email
+    assert records[0]["project_id"] == str(project.id)
+    assert records[0]["target_repr"] == "'=cmd()"  # not run as a spreadsheet formula
+
+
+@pytest.mark.django_db
+def test_export_jsonl_honors_filters_and_range(auth_client, export_setup):
+    user, project, logs = export_setup
+
+    _, body = _export(auth_client, output="jsonl", since="2025-02-01", until="2025-04-01T00:00:00Z")
+    assert [json.loads(line)["id"] for line in body.splitlines()] == [logs[1].id, logs[2].id]
+
+    _, body = _export(auth_client, output="jsonl", target_type="comment")
+    assert [json.loads(line)["id"] for line in body.splitlines()] == [logs[1].id]
+
+    _, body = _export(auth_client, output="jsonl", user=user.id)
+    assert [json.loads(line)["id"] for line in body.splitlines()] == [logs[0].id]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [{"output": "xlsx"}, {"since": "last week"}, {"until": "2025-13-01"}])
+def test_export_rejects_bad_parameters(auth_client, params):
+    assert auth_client.get(reverse("logs-export"), params).status_code == 400
+
+
+def test_asgi_export_pulls_one_chunk_at_a_time():
+    from asgiref.sync import async_to_sync
+    from apps.logs.export import asynchronous
+
+    pulled = []
+
+    def chunks():
+        for n in range(3):
+            pulled.append(n)
+            yield str(n)
+
+    async def first_chunk():
+        return await asynchronous(chunks()).__anext__()
+
+    assert async_to_sync(first_chunk)() == "0"
+    assert pulled == [0]  # not read into a list up front
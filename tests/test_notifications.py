@@ -1,3 +1,6 @@
+import os
+import time
+
 import pytest
 from django.urls import reverse
 from unittest.mock import patch, AsyncMock
@@ -168,4 +171,313 @@ def test_mark_all_read(auth_client):
     NotificationFactory(user=user, is_read=False)
     res = auth_client.post(reverse("notifications-mark-all-read"))
     assert res.status_code == 200
-    assert Notification.objects.filter(user=user, is_read=False).count() == 0
\ No newline at end of file
+    assert Notification.objects.filter(user=user, is_read=False).count() == 0
+
+@pytest.mark.django_db
+@patch("apps.notify.services.get_channel_layer")
+def test_notify_team_fans_out_in_one_batch(mock_get_channel_layer):
+    from apps.notify.services import notify_team
+    from tests.factories import TeamFactory
+    mock_layer = mock_get_channel_layer.return_value
+    mock_layer.group_send = AsyncMock()
+    actor, *members = UserFactory.create_batch(4)
+    team = TeamFactory(members=[actor, *members])
+
+    notify_team(team, "Task moved", exclude_user_ids={actor.id}, type="task")
+
+    assert set(Notification.objects.values_list("user_id", flat=True)) == {m.id for m in members}
+    groups = {call.args[0] for call in mock_layer.group_send.call_args_list}
+    assert groups == {f"user_{m.id}" for m in members}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("team_size", [2, 25])
+def test_notify_team_query_count_is_flat_in_team_size(team_size, django_assert_num_queries):
+    # Regression benchmark: one SELECT for the member ids, one bulk INSERT and
+    # the counter upkeep (UPDATE + read back, then a grouped COUNT and one bulk
+    # INSERT for counters that do not exist yet), however large the team is.
+    from apps.notify.services import notify_team
+    from tests.factories import TeamFactory
+    team = TeamFactory(members=UserFactory.create_batch(team_size))
+
+    with django_assert_num_queries(6):
+        notify_team(team, "Board updated", type="task")
+    assert Notification.objects.count() == team_size
+    with django_assert_num_queries(4):
+        notify_team(team, "Board updated again", type="task")
+
+
+@pytest.mark.skipif(not os.environ.get("NOTIFY_FANOUT_BENCHMARK"), reason="set NOTIFY_FANOUT_BENCHMARK=1 to run")
+@pytest.mark.django_db
+def test_benchmark_notify_team_latency_by_team_size():
+    # Wall time of one fan-out (rows, counters and pushes through the channel
+    # layer) for teams of 10 to 2000: per member it should not grow with size.
+    from apps.notify.services import notify_team
+    from apps.teams.models import TeamMembership
+    from apps.users.models import CustomUser
+    from tests.factories import TeamFactory
+    per_member = {}
+    for size in (10, 100, 500, 2000):
+        team = TeamFactory()
+        members = CustomUser.objects.bulk_create(
+            CustomUser(email=f"fanout{size}-{n}@example.com") for n in range(size)
+        )
+        TeamMembership.objects.bulk_create(
+            TeamMembership(team=team, user=member, role="developer", status="accepted") for member in members
+        )
+        notify_team(team, "Warm up", type="task")  # counters exist from here on
+        started = time.perf_counter()
+        notify_team(team, "Board updated", type="task")
+        elapsed = time.perf_counter() - started
+        per_member[size] = elapsed / size
+        print(f"notify_team to {size} members: {elapsed * 1000:.1f} ms ({per_member[size] * 1e6:.0f} us/member)")
+    assert per_member[2000] <= per_member[10] * 2
+    assert per_member[2000] * 2000 < 1
+
+
+@pytest.mark.django_db
+def test_unread_counter_follows_notify_and_mark_read(auth_client):
+    from apps.notify.models import UnreadCounter
+    from apps.notify.services import notify_team
+    from tests.factories import TeamFactory
+    user = auth_client.handler._force_user
+    team = TeamFactory(members=[user])
+
+    notify_user(user=user, message="one", type="general")
+    notify_team(team, "two", type="task")
+    notify_user(user=user, message="not saved", type="general", save=False)
+    assert UnreadCounter.objects.get(user=user).count == 2
+
+    note = Notification.objects.filter(user=user).first()
+    auth_client.post(reverse("notifications-mark-as-read", args=[note.id]))
+    auth_client.post(reverse("notifications-mark-as-read", args=[note.id]))  # already read
+    assert auth_client.get(reverse("notifications-unread-count")).data["unread"] == 1
+
+    auth_client.post(reverse("notifications-mark-all-read"))
+    assert UnreadCounter.objects.get(user=user).count == 0
+
+
+@pytest.mark.django_db
+def test_unread_count_is_a_single_lookup(auth_client, django_assert_max_num_queries):
+    user = auth_client.handler._force_user
+    for _ in range(3):
+        notify_user(user=user, message="hello", type="general")
+    with django_assert_max_num_queries(2):  # session user + counter row, no COUNT(*)
+        res = auth_client.get(reverse("notifications-unread-count"))
+    assert res.data["unread"] == 3
+
+
+@pytest.mark.django_db
+def test_unread_counter_follows_deletes_and_saves_elsewhere(auth_client):
+    user = auth_client.handler._force_user
+    for _ in range(3):
+        notify_user(user=user, message="hello", type="general")
+    url = reverse("notifications-unread-count")
+    notes = list(Notification.objects.filter(user=user).order_by("id"))
+
+    notes[0].delete()
+    assert auth_client.get(url).data["unread"] == 2
+
+    notes[1].is_read = True
+    notes[1].save()  # e.g. the admin
+    assert auth_client.get(url).data["unread"] == 1
+
+    Notification.objects.filter(user=user).delete()
+    notify_user(user=user, message="again", type="general")
+    assert auth_client.get(url).data["unread"] == 1
+
+
+@pytest.mark.django_db
+def test_unread_counter_is_recounted_after_drift(auth_client):
+    from django.core.cache import cache
+    user = auth_client.handler._force_user
+    for _ in range(2):
+        notify_user(user=user, message="hello", type="general")
+    Notification.objects.filter(user=user).update(is_read=True)  # sends no signal
+    url = reverse("notifications-unread-count")
+    assert auth_client.get(url).data["unread"] == 2  # trusted until the recount is due
+
+    cache.clear()
+    assert auth_client.get(url).data["unread"] == 0
+
+
+@pytest.mark.django_db
+@patch("apps.notify.services.get_channel_layer")
+def test_pushes_carry_the_unread_count(mock_get_channel_layer, auth_client):
+    mock_layer = mock_get_channel_layer.return_value
+    mock_layer.group_send = AsyncMock()
+    user = auth_client.handler._force_user
+
+    notify_user(user=user, message="first", type="general")
+    notify_user(user=user, message="second", type="general")
+    _, payload = mock_layer.group_send.call_args[0]
+    assert payload["data"]["unread"] == 2
+
+    auth_client.post(reverse("notifications-mark-all-read"))
+    group, payload = mock_layer.group_send.call_args[0]
+    assert group == f"user_{user.id}"
+    assert payload == {"type": "unread_count", "unread": 0}
+
+
+@pytest.fixture
+def coalescing(settings):
+    settings.NOTIFY_COALESCE_WINDOW = 60
+    settings.NOTIFY_COALESCE_MAX_BATCH = 20
+    return settings
+
+
+@pytest.mark.django_db
+def test_a_burst_for_one_user_becomes_one_digest_row(coalescing, auth_client):
+    from apps.notify.services import coalescing_stats, unread_count
+    user = auth_client.handler._force_user
+
+    for n in range(1, 6):
+        notify_user(user=user, message=f"Task {n} moved", type="task")
+    notify_user(user=user, message="Invited", type="invite")
+
+    digest, invite = Notification.objects.filter(user=user).order_by("id")
+    assert (digest.count, digest.message) == (5, "Task 5 moved (+4 more)")
+    assert invite.count == 1
+    assert unread_count(user) == 2
+    assert coalescing_stats()["rows_saved"] == 4
+
+    # A read digest is closed; the next event starts a new row.
+    auth_client.post(reverse("notifications-mark-all-read"))
+    notify_user(user=user, message="Task 6 moved", type="task")
+    assert Notification.objects.filter(user=user, type="task").count() == 2
+
+
+@pytest.mark.django_db
+def test_digests_respect_the_max_batch(coalescing):
+    from apps.notify.services import notify_team
+    from tests.factories import TeamFactory
+    coalescing.NOTIFY_COALESCE_MAX_BATCH = 2
+    members = UserFactory.create_batch(3)
+    team = TeamFactory(members=members)
+
+    for n in range(3):
+        notify_team(team, f"Board change {n}", type="task")
+
+    for member in members:
+        assert list(Notification.objects.filter(user=member).order_by("id").values_list("count", flat=True)) == [2, 1]
+
+
+@pytest.mark.django_db
+@patch("apps.notify.services.get_channel_layer")
+def test_folded_events_share_one_delayed_digest_push(mock_get_channel_layer, coalescing):
+    from apps.jobs.models import Job
+    from apps.jobs.queue import run_pending
+    from apps.notify.services import coalescing_stats
+    mock_layer = mock_get_channel_layer.return_value
+    mock_layer.group_send = AsyncMock()
+    coalescing.JOBS_RUN_INLINE = False
+    user = UserFactory()
+
+    for n in range(1, 6):
+        notify_user(user=user, message=f"Comment {n}", type="comment")
+
+    # The first event goes out at once; events 2-5 share one push of the digest.
+    assert sorted(Job.objects.values_list("name", flat=True)) == [
+        "apps.notify.services.push_notifications", "apps.notify.services.push_to_users",
+    ]
+    assert coalescing_stats() == {"events": 5, "rows_saved": 4, "frames_saved": 3}
+
+    Job.objects.update(run_at=Job.objects.order_by("run_at").first().run_at)
+    run_pending()
+    _, payload = mock_layer.group_send.call_args[0]
+    note = Notification.objects.get(user=user)
+    assert payload["data"] == {
+        "message": "Comment 5 (+4 more)", "type": "comment", "timestamp": note.created_at.isoformat(),
+        "id": note.id, "count": 5, "unread": 1,
+    }
+
+    # With the digest pushed, the next fold queues a new push.
+    notify_user(user=user, message="Comment 6", type="comment")
+    assert Job.objects.filter(name="apps.notify.services.push_notifications").count() == 1
+
+
+def _digest_user(**kwargs):
+    from apps.notify.models import NotificationPreference
+    user = UserFactory(**kwargs)
+    NotificationPreference.objects.create(user=user, email_delivery=NotificationPreference.EMAIL_DIGEST)
+    return user
+
+
+@pytest.mark.django_db
+def test_digest_users_get_one_email_per_run_over_one_connection(settings, mailoutbox):
+    from apps.jobs.models import Job
+    from apps.notify.models import PendingEmail
+    from apps.notify.services import get_connection, send_email_digests
+    settings.JOBS_RUN_INLINE = False
+    busy, quiet, immediate = _digest_user(), _digest_user(), UserFactory()
+
+    for n in range(1, 4):
+        notify_user(user=busy, message=f"Task {n}", email_subject=f"Task {n} assigned", email_body=f"Body {n}")
+    notify_user(user=quiet, message="Invite", email_subject="Team invite", email_body="Join us")
+    notify_user(user=immediate, message="Invite", email_subject="Team invite", email_body="Join us")
+
+    assert PendingEmail.objects.count() == 4
+    assert Job.objects.filter(name="apps.notify.services.send_email").count() == 1
+    assert Job.objects.filter(name="apps.notify.services.send_email_digests").count() == 1
+
+    with patch("apps.notify.services.get_connection", wraps=get_connection) as opened:
+        assert send_email_digests() == 2
+    assert opened.call_count == 1
+    digests = {message.to[0]: message for message in mailoutbox}
+    assert digests[busy.email].subject == "3 new notifications"
+    assert "Task 1 assigned\n\nBody 1" in digests[busy.email].body and "Body 3" in digests[busy.email].body
+    assert (digests[quiet.email].subject, digests[quiet.email].body) == ("Team invite", "Join us")
+    assert not PendingEmail.objects.exists()
+
+
+@pytest.mark.django_db
+def test_failed_digests_are_kept_for_the_next_run(settings, mailoutbox):
+    from django.core.mail import EmailMessage
+    from apps.jobs.models import Job
+    from apps.notify.models import PendingEmail
+    from apps.notify.services import send_email_digests
+    settings.JOBS_RUN_INLINE = False
+    failing, ok = _digest_user(), _digest_user()
+    notify_user(user=failing, message="A", email_subject="A", email_body="A")
+    notify_user(user=ok, message="B", email_subject="B", email_body="B")
+    real_send = EmailMessage.send
+
+    def send(message, *args, **kwargs):
+        if message.to == [failing.email]:
+            raise OSError("SMTP refused")
+        return real_send(message, *args, **kwargs)
+
+    Job.objects.all().delete()
+    with patch.object(EmailMessage, "send", autospec=True, side_effect=send):
+        assert send_email_digests() == 1
+    assert [message.to for message in mailoutbox] == [[ok.email]]
+    assert list(PendingEmail.objects.values_list("user_id", flat=True)) == [failing.id]
+    assert Job.objects.filter(name="apps.notify.services.send_email_digests").count() == 1
+
+
+@pytest.mark.django_db
+def test_notification_preferences_endpoint(settings, auth_client, api_client):
+    settings.JOBS_RUN_INLINE = False
+    url = reverse("notifications-preferences")
+
+    assert auth_client.get(url).data == {"email_delivery": "immediate", "digest_available": True}
+    assert auth_client.patch(url, {"email_delivery": "weekly"}, format="json").status_code == 400
+    res = auth_client.patch(url, {"email_delivery": "digest"}, format="json")
+    assert res.status_code == 200 and auth_client.get(url).data["email_delivery"] == "digest"
+    assert api_client.get(url).status_code == 401
+
+
+@pytest.mark.django_db
+def test_digests_need_a_job_worker(settings, auth_client, mailoutbox):
+    from apps.notify.models import PendingEmail
+    user = _digest_user()  # chosen while a worker ran
+    url = reverse("notifications-preferences")
+    assert settings.JOBS_RUN_INLINE
+
+    assert auth_client.get(url).data["digest_available"] is False
+    assert auth_client.patch(url, {"email_delivery": "digest"}, format="json").status_code == 400
+
+    # Nothing would ever send a held email: it goes out at once instead.
+    notify_user(user=user, message="Hi", email_subject="Hello", email_body="There")
+    assert [message.subject for message in mailoutbox] == ["Hello"]
+    assert not PendingEmail.objects.exists()
@@ -0,0 +1,80 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.logs.services import log_activity
+from apps.timetrack.models import TimeEntry
+from tests.factories import NotificationFactory, TaskFactory
+
+
+def _walk(client, url):
+    """Follow cursor ``next`` links from ``url``; return pages of ids and the queries run."""
+    pages, queries = [], []
+    while url:
+        with CaptureQueriesContext(connection) as ctx:
+            res = client.get(url)
+        assert res.status_code == 200
+        assert "count" not in res.data
+        pages.append([row["id"] for row in res.data["results"]])
+        queries.extend(q["sql"] for q in ctx.captured_queries)
+        url = res.data["next"]
+    return pages, queries
+
+
+@pytest.mark.django_db
+def test_task_list_cursor_pagination(auth_client, project):
+    tasks = TaskFactory.create_batch(13, project=project)
+    url = reverse("project-tasks-list", args=[project.id]) + "?pagination=cursor"
+
+    pages, queries = _walk(auth_client, url)
+    assert [len(page) for page in pages] == [10, 3]
+    assert sum(pages, []) == sorted((t.id for t in tasks), reverse=True)
+    assert not any("COUNT(" in sql for sql in queries)
+    assert not any("OFFSET" in sql for sql in queries)
+
+
+@pytest.mark.django_db
+def test_activity_log_cursor_pagination(auth_client, project):
+    user = auth_client.handler._force_user
+    for i in range(12):
+        log_activity(user, "updated", "task", i, f"Task {i}", project)
+
+    pages, _ = _walk(auth_client, reverse("logs-list") + "?pagination=cursor")
+    assert [len(page) for page in pages] == [10, 2]
+    assert len(set(sum(pages, []))) == 12
+
+
+@pytest.mark.django_db
+def test_notification_and_time_entry_cursor_pagination(auth_client, project):
+    user = auth_client.handler._force_user
+    NotificationFactory.create_batch(11, user=user)
+    task = TaskFactory(project=project)
+    for minutes in range(1, 12):
+        TimeEntry.objects.create(user=user, task=task, minutes=minutes, date=timezone.now().date())
+
+    for name in ("notifications-list", "timeentry-list", "my-tasks-list"):
+        pages, _ = _walk(auth_client, reverse(name) + "?pagination=cursor")
+        assert len(set(sum(pages, []))) == sum(len(page) for page in pages)
+
+
+@pytest.mark.django_db
+def test_cursor_links_keep_filters(auth_client, project):
+    TaskFactory.create_batch(12, project=project, status="done")
+    TaskFactory(project=project, status="todo")
+    url = reverse("project-tasks-list", args=[project.id]) + "?pagination=cursor&status=done"
+
+    res = auth_client.get(url)
+    query = parse_qs(urlparse(res.data["next"]).query)
+    assert query["status"] == ["done"]
+    assert "cursor" in query
+
+
+@pytest.mark.django_db
+def test_page_number_pagination_is_still_the_default(auth_client, project):
+    TaskFactory.create_batch(3, project=project)
+    res = auth_client.get(reverse("project-tasks-list", args=[project.id]))
+    assert res.data["count"] == 3
@@ -85,3 +85,61 @@ def test_delete_project_by_non_member_should_fail(api_client):
     url = reverse("projects-detail", args=[project.id])
     res = api_client.delete(url)
     assert res.status_code == 404
+
+
+def _compact_projects(client):
+    return client.get(reverse("projects-list") + "?compact=true")
+
+
+@pytest.mark.django_db
+def test_compact_list_returns_task_counters(auth_client):
+    from datetime import timedelta
+    from django.utils import timezone
+    from tests.factories import TaskFactory
+    team = TeamFactory()
+    TeamMembership.objects.create(team=team, user=auth_client.handler._force_user, role='developer', status='accepted')
+    project = ProjectFactory(team=team)
+    past = timezone.now() - timedelta(days=1)
+    TaskFactory(project=project, status="todo", priority="high", due_date=past)
+    TaskFactory(project=project, status="in_progress", priority="low")
+    TaskFactory(project=project, status="done", priority="high", due_date=past)
+    ProjectFactory()  # another team's project
+
+    res = _compact_projects(auth_client)
+    assert res.status_code == 200
+    assert res.data["count"] == 1
+    data = res.data["results"][0]
+    assert "tasks" not in data
+    assert data["task_count"] == 3
+    assert data["stats"] == {
+        "by_status": {"todo": 1, "in_progress": 1, "done": 1},
+        "by_priority": {"low": 1, "medium": 0, "high": 2},
+        "overdue": 1,  # done tasks are never overdue
+    }
+
+
+@pytest.mark.django_db
+def test_compact_list_cost_does_not_grow_with_tasks(auth_client):
+    # Regression benchmark: payload size and query count stay flat as a
+    # project's task count grows, unlike the full list which embeds every task.
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from tests.factories import TaskFactory
+    team = TeamFactory()
+    TeamMembership.objects.create(team=team, user=auth_client.handler._force_user, role='admin', status='accepted')
+    project = ProjectFactory(team=team)
+
+    measurements = []
+    for extra_tasks in (1, 30):
+        TaskFactory.create_batch(extra_tasks, project=project)
+        cache.clear()  # factory writes bypass the API's cache invalidation
+        with CaptureQueriesContext(connection) as ctx:
+            res = _compact_projects(auth_client)
+        measurements.append((len(res.content), len(ctx.captured_queries)))
+
+    (small_size, small_queries), (large_size, large_queries) = measurements
+    assert large_queries == small_queries
+    assert large_size - small_size < 16  # only the counter digits grow
+    full = auth_client.get(reverse("projects-list"))
+    assert len(full.content) > 10 * large_size
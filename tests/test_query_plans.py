@@ -0,0 +1,53 @@
+"""The scoped list endpoints must reach their rows through indexes, not table scans."""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.logs.services import log_activity
+from tests.factories import ProjectFactory, TaskFactory
+
+
+def _plan(sql):
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # Tiny test tables make sequential scans cheapest; ask whether an index plan exists.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("EXPLAIN " + sql)
+        else:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql)
+        return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+
+def _list_plans(client, url, table):
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get(url).status_code == 200
+    return [
+        _plan(query["sql"]) for query in ctx.captured_queries
+        if f'FROM "{table}"' in query["sql"] and "COUNT(*)" not in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name, table", [
+    ("logs-list", "logs_activitylog"),
+    ("project-tasks-list", "tasks_task"),
+    ("projects-list", "projects_project"),
+])
+def test_scoped_lists_use_index_scans(auth_client, user, project, url_name, table):
+    other = ProjectFactory()  # another team's rows must not matter to the plan
+    for target in (project, other):
+        task = TaskFactory(project=target)
+        log_activity(user, "created", "task", task.id, task.title, target)
+    url = reverse(url_name, args=[project.id] if url_name == "project-tasks-list" else [])
+
+    plans = _list_plans(auth_client, url, table)
+
+    assert plans
+    for plan in plans:
+        assert "Seq Scan" not in plan
+        assert f"SCAN {table}" not in plan
+    if table == "logs_activitylog":
+        # The (team, -timestamp) index also yields the newest-first order.
+        assert "logs_team_ts_idx" in plans[0]
+        assert "TEMP B-TREE" not in plans[0]
@@ -0,0 +1,119 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from apps.search.indexes import install
+from tests.factories import CommentFactory, ProjectFactory, TaskFactory
+
+
+@pytest.fixture
+def project(team):
+    """A project in the shared team, with fixed searchable text."""
+    return ProjectFactory(team=team, name="Website relaunch", description="Marketing site")
+
+
+def _search(client, q, **params):
+    res = client.get(reverse("search"), {"q": q, **params})
+    assert res.status_code == 200
+    return res.data["results"]
+
+
+@pytest.mark.django_db
+def test_search_finds_tasks_comments_and_projects(auth_client, project):
+    task = TaskFactory(project=project, title="Deploy backend", description="Roll out the new API")
+    comment = CommentFactory(task=task, text="The deployment failed on staging")
+    TaskFactory(project=project, title="Write docs", description="User guide")
+
+    hits = _search(auth_client, "deploy")
+
+    assert {(hit["type"], hit["id"]) for hit in hits} == {("task", task.id), ("comment", comment.id)}
+    comment_hit = next(hit for hit in hits if hit["type"] == "comment")
+    assert comment_hit["task_id"] == task.id
+    assert comment_hit["project"] == {"id": project.id, "name": project.name}
+    assert _search(auth_client, "relaunch")[0] == {
+        "type": "project", "id": project.id, "title": "Website relaunch", "excerpt": "Marketing site",
+        "project": {"id": project.id, "name": project.name}, "task_id": None,
+        "rank": _search(auth_client, "relaunch")[0]["rank"],
+    }
+
+
+@pytest.mark.django_db
+def test_search_matches_prefixes_and_requires_every_word(auth_client, project):
+    task = TaskFactory(project=project, title="Database migration", description="Move to PostgreSQL")
+
+    assert [hit["id"] for hit in _search(auth_client, "datab migr", type="task")] == [task.id]
+    assert _search(auth_client, "database frontend", type="task") == []
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="PostgreSQL tsvector only")
+def test_search_matches_partial_words_on_postgresql(auth_client, project):
+    # A stemmed vector stores "deploy" and "migrat", which these prefixes miss.
+    task = TaskFactory(project=project, title="Deployment migrations", description="")
+
+    assert [hit["id"] for hit in _search(auth_client, "deploymen migrati", type="task")] == [task.id]
+
+
+@pytest.mark.django_db
+def test_search_ranks_title_matches_first(auth_client, project):
+    in_description = TaskFactory(project=project, title="Sprint chores", description="Update the invoice template")
+    in_title = TaskFactory(project=project, title="Invoice export", description="CSV for accounting")
+
+    assert [hit["id"] for hit in _search(auth_client, "invoice", type="task")] == [in_title.id, in_description.id]
+
+
+@pytest.mark.django_db
+def test_search_is_scoped_to_the_users_teams(auth_client, project):
+    TaskFactory(title="Secret roadmap")  # another team
+    CommentFactory(text="Secret plans")  # another team
+    mine = TaskFactory(project=project, title="Secret santa")
+
+    assert [(hit["type"], hit["id"]) for hit in _search(auth_client, "secret")] == [("task", mine.id)]
+
+
+@pytest.mark.django_db
+def test_search_index_follows_updates_and_deletes(auth_client, project):
+    task = TaskFactory(project=project, title="Old title", description="")
+    task.title = "Fresh title"
+    task.save()
+    assert [hit["id"] for hit in _search(auth_client, "fresh")] == [task.id]
+    assert _search(auth_client, "old") == []
+
+    task.delete()
+    assert _search(auth_client, "fresh") == []
+
+
+@pytest.mark.django_db
+def test_install_repairs_dropped_triggers(auth_client, project):
+    # SQLite table rebuilds in later migrations drop triggers; post_migrate repairs them.
+    if connection.vendor != "sqlite":
+        pytest.skip("SQLite FTS5 triggers only")
+    before = TaskFactory(project=project, title="Survives repair")
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TRIGGER search_task_fts_ai")
+    install(connection)
+    install(connection)
+    after = TaskFactory(project=project, title="Created after repair")
+
+    assert {hit["id"] for hit in _search(auth_client, "repair")} == {before.id, after.id}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [{}, {"q": "  "}, {"q": "!!"}, {"q": "x", "type": "user"}])
+def test_search_rejects_bad_queries(auth_client, params):
+    assert auth_client.get(reverse("search"), params).status_code == 400
+
+
+@pytest.mark.django_db
+def test_search_requires_login(api_client):
+    assert api_client.get(reverse("search"), {"q": "x"}).status_code == 401
+
+
+@pytest.mark.django_db
+def test_task_list_search_uses_full_text_index(auth_client, project):
+    match = TaskFactory(project=project, title="Payment gateway", description="")
+    TaskFactory(project=project, title="Newsletter", description="")
+
+    res = auth_client.get(reverse("project-tasks-list", args=[project.id]), {"search": "paym"})
+
+    assert [task["id"] for task in res.data["results"]] == [match.id]
@@ -287,3 +287,232 @@ def test_my_tasks_returns_only_own_tasks(auth_client):
     assert res.status_code == 200
     ids = {t["id"] for t in res.data["results"]}
     assert ids == {mine_created.id, mine_assigned.id}
+
+
+@pytest.mark.django_db
+def test_task_update_queries_memberships_once(auth_client):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    user = auth_client.handler._force_user
+    team = TeamFactory()
+    TeamMembership.objects.create(team=team, user=user, role="manager", status="accepted")
+    project = ProjectFactory(team=team)
+    task = TaskFactory(project=project)
+    url = reverse("project-tasks-detail", args=[project.id, task.id])
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = auth_client.patch(url, {"title": "Renamed"})
+    assert res.status_code == 200
+    own_lookups = [
+        q["sql"] for q in ctx.captured_queries
+        if 'FROM "teams_teammembership"' in q["sql"]
+        and f'"user_id" = {user.id}' in q["sql"]
+        and "status" in q["sql"]
+    ]
+    assert len(own_lookups) == 1
+
+
+def _changes(client, project, since):
+    res = client.get(reverse("project-tasks-changes", args=[project.id]) + f"?since={since}")
+    assert res.status_code == 200
+    return res.data
+
+
+@pytest.mark.django_db
+def test_changes_since_zero_loads_the_board(auth_client, project):
+    tasks = TaskFactory.create_batch(3, project=project)
+    TaskFactory()  # another project
+
+    data = _changes(auth_client, project, 0)
+    assert [t["id"] for t in data["changed"]] == [t.id for t in tasks]
+    assert data["deleted"] == []
+    assert data["version"] == max(t["version"] for t in data["changed"])
+
+
+@pytest.mark.django_db
+def test_changes_returns_only_rows_changed_since_version(auth_client, project):
+    kept, edited, removed = TaskFactory.create_batch(3, project=project)
+    since = _changes(auth_client, project, 0)["version"]
+
+    created = auth_client.post(reverse("project-tasks-list", args=[project.id]), {
+        "title": "Created", "description": "d", "project": project.id, "status": "todo",
+        "priority": "low", "due_date": timezone.now() + timedelta(days=2),
+    })
+    assert created.status_code == 201
+    auth_client.patch(reverse("project-tasks-detail", args=[project.id, edited.id]), {"status": "done"})
+    auth_client.delete(reverse("project-tasks-detail", args=[project.id, removed.id]))
+
+    data = _changes(auth_client, project, since)
+    changed = {t["title"]: t for t in data["changed"]}
+    assert set(changed) == {"Created", edited.title}
+    assert changed[edited.title]["status"] == "done"
+    assert data["deleted"] == [removed.id]
+    assert data["version"] > since
+
+    # Nothing happened after the last sync.
+    assert _changes(auth_client, project, data["version"]) == {"version": data["version"], "changed": [], "deleted": []}
+
+
+@pytest.mark.django_db
+def test_changes_query_count_does_not_grow_with_board_size(auth_client, project, django_assert_max_num_queries):
+    TaskFactory.create_batch(40, project=project)
+    since = _changes(auth_client, project, 0)["version"]
+    TaskFactory(project=project)
+
+    with django_assert_max_num_queries(5):
+        data = _changes(auth_client, project, since)
+    assert len(data["changed"]) == 1
+
+
+@pytest.mark.django_db
+def test_task_versions_are_monotonic_per_project(auth_client, project):
+    task = TaskFactory(project=project)
+    first = task.version
+    task.title = "Again"
+    task.save()
+    assert task.version > first
+    project.refresh_from_db()
+    assert project.version == task.version
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("since", ["", "abc", "-1"])
+def test_changes_requires_a_version(auth_client, project, since):
+    res = auth_client.get(reverse("project-tasks-changes", args=[project.id]) + f"?since={since}")
+    assert res.status_code == 400
+
+
+@pytest.mark.django_db
+def test_changes_forbidden_for_non_members(api_client):
+    project = ProjectFactory()
+    TaskFactory(project=project).delete()
+    api_client.force_authenticate(user=UserFactory())
+    res = api_client.get(reverse("project-tasks-changes", args=[project.id]) + "?since=0")
+    assert res.status_code == 403
+
+
+def _bulk(client, project, payload):
+    return client.post(reverse("project-tasks-bulk", args=[project.id]), payload, format="json")
+
+
+@pytest.mark.django_db
+def test_bulk_create_tasks(auth_client, project, member):
+    from apps.logs.models import ActivityLog
+    from apps.notify.models import Notification
+    due = (timezone.now() + timedelta(days=3)).isoformat()
+
+    res = _bulk(auth_client, project, {"op": "create", "tasks": [
+        {"title": "A", "status": "todo", "priority": "low", "due_date": due, "assigned_to": member.id},
+        {"title": "B", "status": "todo", "priority": "high", "due_date": due, "assigned_to": member.id},
+    ]})
+
+    assert res.status_code == 201
+    assert [t["title"] for t in res.data["changed"]] == ["A", "B"]
+    assert Task.objects.filter(project=project).count() == 2
+    assert ActivityLog.objects.filter(action="created", project=project).count() == 2
+    # One coalesced notification for the assignee.
+    assert list(Notification.objects.filter(user=member).values_list("message", flat=True)) == [
+        f"2 new tasks assigned to you in '{project.name}'"
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_status_move_is_one_batch(auth_client, user, project, member, django_assert_max_num_queries):
+    from apps.logs.models import ActivityLog
+    from apps.notify.models import Notification
+    tasks = TaskFactory.create_batch(30, project=project)
+    since = _changes(auth_client, project, 0)["version"]
+
+    with django_assert_max_num_queries(20):
+        res = _bulk(auth_client, project, {"op": "status", "ids": [t.id for t in tasks], "status": "done"})
+
+    assert res.status_code == 200
+    assert Task.objects.filter(project=project, status="done").count() == 30
+    assert ActivityLog.objects.filter(action="updated", project=project).count() == 30
+    assert list(Notification.objects.filter(user=member).values_list("message", flat=True)) == [
+        f"{user.first_name} moved 30 tasks to Done"
+    ]
+    delta = _changes(auth_client, project, since)
+    assert len(delta["changed"]) == 30 and delta["version"] == res.data["version"]
+
+
+@pytest.mark.django_db
+def test_bulk_reassign_and_delete(auth_client, project):
+    assignee = UserFactory()
+    TeamMembership.objects.create(team=project.team, user=assignee, role="developer", status="accepted")
+    first, second, third = TaskFactory.create_batch(3, project=project)
+
+    res = _bulk(auth_client, project, {"op": "reassign", "ids": [first.id, second.id], "assigned_to": assignee.id})
+    assert res.status_code == 200
+    assert set(Task.objects.filter(assigned_to=assignee).values_list("id", flat=True)) == {first.id, second.id}
+
+    res = _bulk(auth_client, project, {"op": "delete", "ids": [second.id, third.id]})
+    assert res.status_code == 200
+    assert res.data["deleted"] == [second.id, third.id]
+    assert list(Task.objects.filter(project=project).values_list("id", flat=True)) == [first.id]
+    assert _changes(auth_client, project, 0)["deleted"] == [second.id, third.id]
+
+
+@pytest.mark.django_db
+def test_bulk_is_all_or_nothing(auth_client, project):
+    task = TaskFactory(project=project)
+    foreign = TaskFactory()
+
+    res = _bulk(auth_client, project, {"op": "status", "ids": [task.id, foreign.id], "status": "done"})
+
+    assert res.status_code == 400
+    task.refresh_from_db()
+    assert task.status == "todo"
+
+
+@pytest.mark.django_db
+def test_bulk_rejects_assignee_outside_team(auth_client, project):
+    task = TaskFactory(project=project)
+    res = _bulk(auth_client, project, {"op": "reassign", "ids": [task.id], "assigned_to": UserFactory().id})
+    assert res.status_code == 403
+
+
+@pytest.mark.django_db
+def test_bulk_developer_may_only_move_own_tasks(api_client):
+    developer = UserFactory()
+    team = TeamFactory(members=[developer])
+    project = ProjectFactory(team=team)
+    own = TaskFactory(project=project, assigned_to=developer)
+    other = TaskFactory(project=project)
+    api_client.force_authenticate(user=developer)
+
+    assert _bulk(api_client, project, {"op": "status", "ids": [own.id], "status": "done"}).status_code == 200
+    assert _bulk(api_client, project, {"op": "status", "ids": [own.id, other.id], "status": "todo"}).status_code == 403
+    assert _bulk(api_client, project, {"op": "delete", "ids": [own.id]}).status_code == 403
+    own.refresh_from_db()
+    assert own.status == "done"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("payload", [
+    {"op": "status", "ids": [1]},
+    {"op": "reassign", "ids": [1]},
+    {"op": "delete"},
+    {"op": "create"},
+    {"op": "archive", "ids": [1]},
+])
+def test_bulk_validates_payload(auth_client, project, payload):
+    assert _bulk(auth_client, project, payload).status_code == 400
+
+
+@pytest.mark.django_db
+def test_task_team_is_copied_from_the_project_and_follows_moves(project):
+    from apps.logs.models import ActivityLog
+    from apps.logs.services import log_activity
+
+    task = TaskFactory(project=project)
+    log_activity(task.created_by, "created", "task", task.id, task.title, project)
+    assert task.team_id == project.team_id
+
+    new_team = TeamFactory()
+    project.team = new_team
+    project.save()
+
+    task.refresh_from_db()
+    assert task.team_id == new_team.id
+    assert set(ActivityLog.objects.filter(project=project).values_list("team_id", flat=True)) == {new_team.id}
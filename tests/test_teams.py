@@ -115,6 +115,53 @@ def test_remove_member(auth_client):
     assert not TeamMembership.objects.filter(team=team, user=member).exists()
 
 
+@pytest.mark.django_db
+def test_removed_member_loses_access_despite_cached_memberships(auth_client):
+    from rest_framework.test import APIClient
+    from tests.factories import ProjectFactory
+
+    team = TeamFactory(created_by=auth_client.handler._force_user)
+    TeamMembership.objects.create(team=team, user=auth_client.handler._force_user, role="admin", status="accepted")
+    member = UserFactory()
+    TeamMembership.objects.create(team=team, user=member, role="developer", status="accepted")
+    project = ProjectFactory(team=team)
+    member_client = APIClient()
+    member_client.force_authenticate(user=member)
+    tasks_url = reverse("project-tasks-list", args=[project.id])
+    assert member_client.get(tasks_url).status_code == 200  # roles now cached
+
+    auth_client.post(reverse("teams-remove-member", args=[team.id]), {"user_id": member.id})
+
+    assert member_client.get(tasks_url).data["results"] == []
+    assert member_client.get(reverse("projects-list")).data["results"] == []
+
+
+@pytest.mark.django_db
+def test_queryset_and_cascade_deletes_revoke_cached_memberships(auth_client):
+    from rest_framework.test import APIClient
+    from tests.factories import ProjectFactory
+
+    team = TeamFactory(created_by=auth_client.handler._force_user)
+    TeamMembership.objects.create(team=team, user=auth_client.handler._force_user, role="admin", status="accepted")
+    member = UserFactory()
+    TeamMembership.objects.create(team=team, user=member, role="developer", status="accepted")
+    project = ProjectFactory(team=team)
+    member_client = APIClient()
+    member_client.force_authenticate(user=member)
+    tasks_url = reverse("project-tasks-list", args=[project.id])
+    assert member_client.get(tasks_url).status_code == 200  # roles now cached
+
+    # What the admin's "delete selected" action does: no model delete() runs.
+    TeamMembership.objects.filter(team=team, user=member).delete()
+
+    assert member_client.get(tasks_url).data["results"] == []
+    assert member_client.get(reverse("projects-list")).data["results"] == []
+
+    assert auth_client.get(reverse("projects-list")).data["count"] == 1
+    team.delete()  # cascades to the memberships
+    assert auth_client.get(reverse("projects-list")).data["results"] == []
+
+
 @pytest.mark.django_db
 def test_change_member_role(auth_client):
     team = TeamFactory(created_by=auth_client.handler._force_user)
@@ -293,3 +340,25 @@ def test_register_invite_by_token_activates_and_accepts(api_client):
     assert placeholder.has_usable_password()
     m.refresh_from_db()
     assert m.status == "accepted"
+
+
+@pytest.mark.django_db
+def test_membership_resolver_loads_roles_once(django_assert_num_queries):
+    from apps.teams.membership import MembershipResolver
+    user = UserFactory()
+    admin_team = TeamFactory()
+    dev_team = TeamFactory()
+    pending_team = TeamFactory()
+    TeamMembership.objects.create(team=admin_team, user=user, role="admin", status="accepted")
+    TeamMembership.objects.create(team=dev_team, user=user, role="developer", status="accepted")
+    TeamMembership.objects.create(team=pending_team, user=user, role="admin", status="pending")
+
+    resolver = MembershipResolver(user)
+    with django_assert_num_queries(1):
+        assert resolver.is_admin(admin_team)
+        assert resolver.can_manage_tasks(admin_team.id)
+        assert resolver.is_member(dev_team)
+        assert not resolver.can_manage_tasks(dev_team)
+        assert resolver.role(dev_team) == "developer"
+        assert not resolver.is_member(pending_team)
+        assert resolver.team_ids() == {admin_team.id, dev_team.id}
@@ -0,0 +1,152 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.teams.models import TeamMembership
+from apps.timetrack.models import RunningTimer, TimeEntry
+from tests.factories import TaskFactory, TeamFactory, UserFactory
+
+
+def _start(client, task, **data):
+    return client.post(reverse("timers-start"), {"task_id": task.id, **data}, format="json")
+
+
+def _rewind(user, minutes):
+    """Pretend the user's timer started ``minutes`` ago."""
+    RunningTimer.objects.filter(user=user).update(started_at=timezone.now() - timedelta(minutes=minutes))
+
+
+@pytest.mark.django_db
+def test_start_and_stop_logs_the_elapsed_time(auth_client, user, task):
+    res = _start(auth_client, task, note="Pairing")
+    assert res.status_code == 201
+    assert res.data["timer"]["task"] == task.id and res.data["logged"] is None
+    assert auth_client.get(reverse("timers-current")).data["timer"]["note"] == "Pairing"
+
+    _rewind(user, 42)
+    res = auth_client.post(reverse("timers-stop"), {}, format="json")
+    assert res.status_code == 200
+    entry = TimeEntry.objects.get(user=user)
+    assert (entry.task_id, entry.minutes, entry.note) == (task.id, 42, "Pairing")
+    assert res.data["logged"]["id"] == entry.id
+    assert auth_client.get(reverse("timers-current")).data["timer"] is None
+    assert auth_client.post(reverse("timers-stop"), {}, format="json").status_code == 404
+
+
+@pytest.mark.django_db
+def test_starting_another_task_logs_the_running_one(auth_client, user, task):
+    other = TaskFactory(project=task.project)
+    _start(auth_client, task)
+    _rewind(user, 10)
+
+    res = _start(auth_client, other)
+    assert res.data["logged"]["minutes"] == 10
+    assert RunningTimer.objects.get(user=user).task_id == other.id
+
+    auth_client.post(reverse("timers-stop"), {"discard": True}, format="json")
+    assert TimeEntry.objects.count() == 1 and not RunningTimer.objects.exists()
+
+
+@pytest.mark.django_db
+def test_timers_only_run_on_tasks_of_the_users_teams(auth_client):
+    foreign = TaskFactory()
+    assert _start(auth_client, foreign).status_code == 400
+
+
+@pytest.mark.django_db
+def test_heartbeat_keeps_the_timer_and_its_start(auth_client, user, task):
+    assert auth_client.post(reverse("timers-heartbeat")).status_code == 404
+    _start(auth_client, task)
+    _rewind(user, 5)
+
+    res = auth_client.post(reverse("timers-heartbeat"))
+    assert res.status_code == 200
+    assert res.data["timer"]["elapsed_seconds"] >= 300
+    timer = RunningTimer.objects.get(user=user)
+    assert timer.last_heartbeat > timer.started_at
+
+
+@pytest.mark.django_db
+def test_abandoned_timers_log_time_up_to_their_last_heartbeat(auth_client, user, team, task, settings):
+    settings.TIMER_ABANDON_MINUTES = 240
+    _start(auth_client, task)
+    now = timezone.now()
+    RunningTimer.objects.filter(user=user).update(
+        started_at=now - timedelta(hours=10), last_heartbeat=now - timedelta(hours=9),
+    )
+
+    assert auth_client.post(reverse("timers-heartbeat")).status_code == 404  # not revived
+    assert auth_client.get(reverse("timers-current")).data["timer"] is None
+    assert TimeEntry.objects.get(user=user).minutes == 60
+
+    # Teammates' abandoned timers are stopped when the team's list is rebuilt.
+    colleague = UserFactory()
+    TeamMembership.objects.create(team=team, user=colleague, role="developer", status="accepted")
+    RunningTimer.objects.create(user=colleague, task=task, team=team,
+                                started_at=now - timedelta(hours=6), last_heartbeat=now - timedelta(hours=5))
+    assert auth_client.get(reverse("timers-team"), {"team": team.id}).data["results"] == []
+    assert TimeEntry.objects.get(user=colleague).minutes == 60
+
+
+@pytest.mark.django_db
+def test_moving_a_project_moves_its_running_timers(auth_client, user, team, task):
+    _start(auth_client, task)
+    new_team = TeamFactory()
+    TeamMembership.objects.create(team=new_team, user=user, role="admin", status="accepted")
+    url = reverse("timers-team")
+    assert len(auth_client.get(url, {"team": team.id}).data["results"]) == 1
+
+    task.project.team = new_team
+    task.project.save()
+
+    assert RunningTimer.objects.get(user=user).team_id == new_team.id
+    assert auth_client.get(url, {"team": team.id}).data["results"] == []
+    assert len(auth_client.get(url, {"team": new_team.id}).data["results"]) == 1
+
+
+@pytest.mark.django_db
+def test_team_timers_come_from_the_cache(auth_client, user, team, task, django_assert_num_queries):
+    colleague = UserFactory()
+    TeamMembership.objects.create(team=team, user=colleague, role="developer", status="accepted")
+    RunningTimer.objects.create(user=colleague, task=task, team=team,
+                                started_at=timezone.now(), last_heartbeat=timezone.now())
+    _start(auth_client, task)
+
+    url = reverse("timers-team")
+    assert [t["user"] for t in auth_client.get(url, {"team": team.id}).data["results"]] == [colleague.id, user.id]
+    with django_assert_num_queries(0):
+        res = auth_client.get(url, {"team": team.id})
+    assert len(res.data["results"]) == 2
+
+    auth_client.post(reverse("timers-stop"), {}, format="json")
+    assert [t["user"] for t in auth_client.get(url, {"team": team.id}).data["results"]] == [colleague.id]
+    assert auth_client.get(url, {"team": TeamFactory().id}).status_code == 403
+    assert auth_client.get(url, {"team": "x"}).status_code == 400
+
+
+@pytest.mark.django_db
+@patch("apps.notify.services.get_channel_layer")
+def test_start_and_stop_are_pushed_to_the_team(mock_get_channel_layer, auth_client, user, team, task,
+                                               django_capture_on_commit_callbacks):
+    mock_layer = mock_get_channel_layer.return_value
+    mock_layer.group_send = AsyncMock()
+    colleague = UserFactory()
+    TeamMembership.objects.create(team=team, user=colleague, role="developer", status="accepted")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _start(auth_client, task)
+    frames = {call.args[0]: call.args[1] for call in mock_layer.group_send.call_args_list}
+    assert set(frames) == {f"user_{user.id}", f"user_{colleague.id}"}
+    frame = frames[f"user_{user.id}"]
+    assert frame["type"] == "frame"
+    assert (frame["data"]["event"], frame["data"]["action"], frame["data"]["timer"]["task"]) == ("timer", "started", task.id)
+
+    mock_layer.group_send.reset_mock()
+    with django_capture_on_commit_callbacks(execute=True):
+        auth_client.post(reverse("timers-stop"), {}, format="json")
+    assert mock_layer.group_send.call_args.args[1]["data"]["action"] == "stopped"
+    assert cache.get(f"timers:team:{team.id}") is None
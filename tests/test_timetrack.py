@@ -1,10 +1,18 @@
+import os
+import time
 from datetime import timedelta
+from decimal import Decimal
 
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
-from apps.timetrack.models import TimeEntry
+from apps.teams.models import TeamMembership
+from apps.timetrack.models import TimeEntry, TimeRollup
 from tests.factories import UserFactory, TeamFactory, ProjectFactory, TaskFactory
 
 
@@ -99,3 +107,322 @@ def test_summary_aggregates_minutes(auth_client):
     assert res.data["today_minutes"] == 50
     assert len(res.data["per_day"]) == 7
     assert res.data["per_day"][-1]["minutes"] == 50  # today is the last bucket
+
+
+@pytest.mark.django_db
+def test_summary_is_one_query_with_month_quarter_and_custom_ranges(auth_client, user, task):
+    today = timezone.localdate()
+    month_start = today.replace(day=1)
+    quarter_start = month_start.replace(month=(today.month - 1) // 3 * 3 + 1)
+    TimeEntry.objects.create(user=user, task=task, minutes=30, date=today)
+    TimeEntry.objects.create(user=user, task=task, minutes=20, date=quarter_start)
+    TimeEntry.objects.create(user=user, task=task, minutes=5, date=quarter_start - timedelta(days=1))
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = auth_client.get(reverse("timeentry-summary"), {
+            "ranges": f"{quarter_start - timedelta(days=1)}..{quarter_start - timedelta(days=1)},{month_start}..{today}",
+        })
+    assert res.status_code == 200
+    assert len(ctx.captured_queries) == 1
+    assert res.data["total_minutes"] == 55
+    assert res.data["month_total_minutes"] == (50 if month_start == quarter_start else 30)
+    assert res.data["quarter_total_minutes"] == 50
+    assert [r["minutes"] for r in res.data["ranges"]] == [5, res.data["month_total_minutes"]]
+
+    res = auth_client.get(reverse("timeentry-summary"), {"ranges": "2025-02-01..2025-01-01"})
+    assert res.status_code == 400
+
+
+@pytest.mark.django_db
+def test_entries_carry_their_tasks_project(auth_client, user, task):
+    entry = TimeEntry.objects.create(user=user, task=task, minutes=30, date=timezone.localdate())
+    assert (entry.project_id, entry.team_id) == (task.project_id, task.team_id)
+    other = TaskFactory(project=ProjectFactory(team=task.project.team))
+    TimeEntry.objects.create(user=user, task=other, minutes=10, date=timezone.localdate())
+
+    res = auth_client.get(reverse("timeentry-summary"), {"project": task.project_id})
+    assert res.data["total_minutes"] == 30
+
+
+def _rollups():
+    return {
+        (row.user_id, row.task_id, row.date): (row.minutes, row.entries)
+        for row in TimeRollup.objects.all()
+    }
+
+
+@pytest.mark.django_db
+def test_rollups_follow_entry_create_update_and_delete(auth_client, user, task):
+    other_task = TaskFactory(project=task.project)
+    today = timezone.localdate()
+    yesterday = today - timedelta(days=1)
+    for minutes in (30, 20):
+        res = auth_client.post(reverse("timeentry-list"), {"task_id": task.id, "minutes": minutes, "date": str(today)})
+        assert res.status_code == 201
+    entry_id = res.data["id"]
+    rollup = TimeRollup.objects.get()
+    assert (rollup.project_id, rollup.team_id) == (task.project_id, task.team_id)
+    assert _rollups() == {(user.id, task.id, today): (50, 2)}
+
+    auth_client.patch(reverse("timeentry-detail", args=[entry_id]), {"minutes": 25})
+    assert _rollups() == {(user.id, task.id, today): (55, 2)}
+
+    auth_client.patch(reverse("timeentry-detail", args=[entry_id]), {"task_id": other_task.id, "date": str(yesterday)})
+    assert _rollups() == {(user.id, task.id, today): (30, 1), (user.id, other_task.id, yesterday): (25, 1)}
+
+    auth_client.delete(reverse("timeentry-detail", args=[entry_id]))
+    assert _rollups() == {(user.id, task.id, today): (30, 1)}
+
+
+@pytest.mark.django_db
+def test_rebuild_command_recomputes_rollups(user, task):
+    today = timezone.localdate()
+    TimeEntry.objects.create(user=user, task=task, minutes=30, date=today)
+    TimeEntry.objects.create(user=user, task=task, minutes=20, date=today)
+    TimeEntry.objects.filter(user=user).update(minutes=10)  # bypasses the model
+
+    call_command("rebuild_time_rollups", "--team", str(task.team_id))
+    assert _rollups() == {(user.id, task.id, today): (20, 2)}
+
+
+@pytest.mark.django_db
+def test_rollups_follow_a_project_to_its_new_team(user, task):
+    TimeEntry.objects.create(user=user, task=task, minutes=30, date=timezone.localdate())
+    new_team = TeamFactory()
+    task.project.team = new_team
+    task.project.save()
+    assert TimeRollup.objects.get().team_id == new_team.id
+    assert TimeEntry.objects.get().team_id == new_team.id
+
+    # The rebuild reads the entries' own team column, without joining tasks.
+    from apps.timetrack.rollups import rebuild
+    with CaptureQueriesContext(connection) as ctx:
+        rebuild([new_team.id])
+    assert not any("tasks_task" in query["sql"] for query in ctx.captured_queries)
+    assert TimeRollup.objects.get().team_id == new_team.id
+
+
+@pytest.mark.django_db
+def test_team_report_totals_per_project_user_and_week(auth_client, user, team, task):
+    colleague = UserFactory()
+    TeamMembership.objects.create(team=team, user=colleague, role="developer", status="accepted")
+    second = TaskFactory(project=ProjectFactory(team=team))
+    monday = timezone.localdate() - timedelta(days=timezone.localdate().weekday())
+    TimeEntry.objects.create(user=user, task=task, minutes=30, date=monday)
+    TimeEntry.objects.create(user=colleague, task=task, minutes=45, date=monday - timedelta(days=1))
+    TimeEntry.objects.create(user=colleague, task=second, minutes=60, date=monday)
+    TimeEntry.objects.create(user=user, task=task, minutes=999, date=monday - timedelta(weeks=8))  # out of range
+    TimeEntry.objects.create(user=UserFactory(), task=_member_task(UserFactory()), minutes=5, date=monday)
+
+    res = auth_client.get(reverse("time-reports-detail", args=[team.id]))
+    assert res.status_code == 200
+    assert res.data["total_minutes"] == 135
+    assert [(row["project"], row["minutes"]) for row in res.data["by_project"]] == [
+        (task.project_id, 75), (second.project_id, 60),
+    ]
+    assert [(row["user"], row["minutes"]) for row in res.data["by_user"]] == [(colleague.id, 105), (user.id, 30)]
+    assert res.data["by_week"] == [
+        {"week": str(monday - timedelta(weeks=1)), "minutes": 45},
+        {"week": str(monday), "minutes": 90},
+    ]
+
+    res = auth_client.get(reverse("time-reports-detail", args=[team.id]), {"start": str(monday), "end": str(monday)})
+    assert res.data["total_minutes"] == 90
+
+
+@pytest.mark.django_db
+def test_team_report_is_for_managers_of_the_team(auth_client, user, team):
+    other = TeamFactory(members=[user])  # a developer there
+    assert auth_client.get(reverse("time-reports-detail", args=[other.id])).status_code == 403
+    assert auth_client.get(reverse("time-reports-detail", args=[TeamFactory().id])).status_code == 403
+    res = auth_client.get(reverse("time-reports-detail", args=[team.id]), {"start": "2025-13-01"})
+    assert res.status_code == 400
+    res = auth_client.get(reverse("time-reports-detail", args=[team.id]), {"start": "2025-02-01", "end": "2025-01-01"})
+    assert res.status_code == 400
+
+
+def _report(client, team, view="groups", **params):
+    res = client.get(reverse(f"time-reports-{view}", args=[team.id]), params)
+    assert res.status_code == 200, res.data
+    return res.data
+
+
+@pytest.fixture
+def rated_team(user, team, task, settings):
+    """Two members with 90 min and 120 min in the current week, one at a set rate."""
+    settings.TIME_REPORT_DEFAULT_HOURLY_RATE = Decimal("40")
+    TeamMembership.objects.filter(team=team, user=user).update(hourly_rate=Decimal("100"))
+    colleague = UserFactory()
+    TeamMembership.objects.create(team=team, user=colleague, role="developer", status="accepted")
+    monday = timezone.localdate() - timedelta(days=timezone.localdate().weekday())
+    TimeEntry.objects.create(user=user, task=task, minutes=90, date=monday)
+    TimeEntry.objects.create(user=colleague, task=task, minutes=120, date=monday)
+    return {"colleague": colleague, "monday": monday}
+
+
+@pytest.mark.django_db
+def test_groups_by_user_and_period_with_cost(auth_client, user, team, task, rated_team):
+    data = _report(auth_client, team, group_by="user,project", bucket="month")
+    assert data["group_by"] == ["user", "project"] and data["bucket"] == "month"
+    month = str(rated_team["monday"].replace(day=1))
+    assert [(row["user"], row["project"], row["period"], row["minutes"], row["cost"]) for row in data["results"]] == [
+        (rated_team["colleague"].id, task.project_id, month, 120, "80.00"),
+        (user.id, task.project_id, month, 90, "150.00"),
+    ]
+    assert _report(auth_client, team, group_by="task,day")["results"][0]["task_title"] == task.title
+
+    res = auth_client.get(reverse("time-reports-groups", args=[team.id]), {"group_by": "week", "bucket": "month"})
+    assert res.status_code == 400
+    res = auth_client.get(reverse("time-reports-groups", args=[team.id]), {"group_by": "colour"})
+    assert res.status_code == 400
+
+
+@pytest.mark.django_db
+def test_budget_burn_prices_time_at_member_rates(auth_client, user, team, task, rated_team):
+    task.project.budget = Decimal("500")
+    task.project.save()
+    ProjectFactory(team=team, name="Unbudgeted")
+    TimeEntry.objects.create(user=user, task=task, minutes=60, date=rated_team["monday"] - timedelta(weeks=1))
+
+    data = _report(auth_client, team, view="budget")
+    budgeted = next(p for p in data["projects"] if p["project"] == task.project_id)
+    assert (budgeted["minutes"], budgeted["spent"], budgeted["remaining"], budgeted["burned_percent"]) == (
+        270, "330.00", "170.00", 66.0,
+    )
+    assert [(point["cost"], point["spent"], point["remaining"]) for point in budgeted["series"]] == [
+        ("100.00", "100.00", "400.00"), ("230.00", "330.00", "170.00"),
+    ]
+    unbudgeted = next(p for p in data["projects"] if p["name"] == "Unbudgeted")
+    assert (unbudgeted["budget"], unbudgeted["remaining"], unbudgeted["series"]) == (None, None, [])
+
+
+@pytest.mark.django_db
+def test_admin_sets_member_hourly_rate(auth_client, team, rated_team):
+    url = reverse("teams-set-rate", args=[team.id])
+    res = auth_client.post(url, {"user_id": rated_team["colleague"].id, "hourly_rate": "60"}, format="json")
+    assert res.status_code == 200
+    assert TeamMembership.objects.get(team=team, user=rated_team["colleague"]).hourly_rate == Decimal("60")
+    assert auth_client.post(url, {"user_id": rated_team["colleague"].id, "hourly_rate": "-1"}, format="json").status_code == 400
+    assert auth_client.post(url, {"user_id": UserFactory().id, "hourly_rate": "10"}, format="json").status_code == 404
+
+
+@pytest.mark.django_db
+def test_group_report_is_one_query_however_many_entries(auth_client, user, team, task):
+    # Regression benchmark: the report reads rollups in one grouped query.
+    monday = timezone.localdate() - timedelta(days=timezone.localdate().weekday())
+    counts = []
+    for entries in (1, 40):
+        TimeEntry.objects.bulk_create(
+            TimeEntry(user=user, task=task, project=task.project, team=task.team, minutes=15,
+                      date=monday - timedelta(days=i % 20))
+            for i in range(entries)
+        )
+        call_command("rebuild_time_rollups")
+        warm = _report(auth_client, team, group_by="project,user", bucket="week")  # caches the roles
+        with CaptureQueriesContext(connection) as ctx:
+            data = _report(auth_client, team, group_by="project,user", bucket="week")
+        counts.append(len(ctx.captured_queries))
+        assert data == warm
+    assert counts == [1, 1]
+
+
+@pytest.mark.skipif(not os.environ.get("TIME_REPORT_BENCHMARK"), reason="set TIME_REPORT_BENCHMARK=1 to run")
+@pytest.mark.django_db
+def test_benchmark_group_report_at_a_million_entries(auth_client, user, team):
+    # 1M entries: 50 members x 400 days x 50 sessions over 5 tasks a day.
+    members = [user] + UserFactory.create_batch(49)
+    TeamMembership.objects.bulk_create(
+        TeamMembership(team=team, user=member, role="developer", status="accepted") for member in members[1:]
+    )
+    tasks = [TaskFactory(project=ProjectFactory(team=team)) for _ in range(20)]
+    today = timezone.localdate()
+
+    def entries():
+        for day in range(400):
+            for n, member in enumerate(members):
+                for session in range(50):
+                    task = tasks[(day + n + session % 5) % 20]
+                    yield TimeEntry(user=member, task=task, project=task.project, team=task.team,
+                                    date=today - timedelta(days=day), minutes=10)
+
+    TimeEntry.objects.bulk_create(entries(), batch_size=5000)
+    call_command("rebuild_time_rollups")
+    assert TimeEntry.objects.count() == 1_000_000
+
+    started = time.perf_counter()
+    data = _report(auth_client, team, group_by="project,user", bucket="week",
+                   start=str(today - timedelta(days=90)), end=str(today))
+    elapsed = time.perf_counter() - started
+    print(f"grouped report over {TimeRollup.objects.count()} rollups: {elapsed * 1000:.0f} ms")
+    assert sum(row["minutes"] for row in data["results"]) == 91 * 50 * 50 * 10
+    assert elapsed < 2
+
+
+@pytest.mark.django_db
+def test_bulk_import_json_array(auth_client, user, task):
+    today = str(timezone.localdate())
+    other = TaskFactory(project=task.project)
+    queries = []
+    for size in (2, 40):
+        rows = [{"task_id": (task, other)[i % 2].id, "date": today, "minutes": 30, "note": "sync"} for i in range(size)]
+        with CaptureQueriesContext(connection) as ctx:
+            res = auth_client.post(reverse("timeentry-bulk"), rows, format="json")
+        assert res.status_code == 201, res.data
+        assert res.data == {"created": size, "errors": []}
+        queries.append(len(ctx.captured_queries))
+    assert TimeEntry.objects.filter(user=user, project=task.project).count() == 42
+    assert _rollups() == {
+        (user.id, task.id, timezone.localdate()): (630, 21), (user.id, other.id, timezone.localdate()): (630, 21),
+    }
+    # No per-row queries: the second batch is 20 times larger but costs the same.
+    assert queries[1] <= queries[0]
+
+
+@pytest.mark.django_db
+def test_bulk_import_reports_every_bad_row_and_saves_nothing(auth_client, user, task):
+    foreign = _member_task(UserFactory())
+    today = str(timezone.localdate())
+    rows = [
+        {"task_id": task.id, "date": today, "minutes": 30},
+        {"task_id": foreign.id, "date": today, "minutes": 30},
+        {"task_id": task.id, "date": "yesterday", "minutes": 0},
+        "not an object",
+    ]
+    res = auth_client.post(reverse("timeentry-bulk"), rows, format="json")
+    assert res.status_code == 400
+    assert [(error["row"], sorted(error["errors"])) for error in res.data["errors"]] == [
+        (2, ["task_id"]), (3, ["date", "minutes"]), (4, ["non_field_errors"]),
+    ]
+    assert not TimeEntry.objects.exists() and not TimeRollup.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_import_csv_upload_adds_to_existing_rollups(auth_client, user, task):
+    today = timezone.localdate()
+    TimeEntry.objects.create(user=user, task=task, minutes=10, date=today)
+    upload = SimpleUploadedFile(
+        "time.csv", f"task_id,date,minutes,note\n{task.id},{today},20,csv\n{task.id},{today},5,\n".encode(),
+        content_type="text/csv",
+    )
+    res = auth_client.post(reverse("timeentry-bulk"), {"file": upload}, format="multipart")
+    assert res.status_code == 201, res.data
+    assert res.data["created"] == 2
+    assert _rollups() == {(user.id, task.id, today): (35, 3)}
+
+
+@pytest.mark.django_db
+def test_import_command_streams_a_file_and_skips_bad_rows(user, task, tmp_path, capsys):
+    path = tmp_path / "time.jsonl"
+    path.write_text("\n".join([
+        f'{{"task_id": {task.id}, "date": "2025-03-03", "minutes": 45}}',
+        "{broken",
+        f'{{"task_id": {task.id}, "date": "2025-03-04", "minutes": 15}}',
+    ]))
+
+    call_command("import_time_entries", str(path), "--user", user.email, "--chunk-size", "2")
+
+    out, err = capsys.readouterr()
+    assert "Imported 2 time entries; 1 invalid row(s) skipped." in out
+    assert "Row 2:" in err
+    assert sorted(TimeEntry.objects.values_list("minutes", flat=True)) == [15, 45]
+    assert TimeRollup.objects.count() == 2
@@ -0,0 +1,121 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from apps.projects.models import Project
+from apps.search.typeahead import PrefixTrie
+from apps.teams.models import TeamMembership
+from tests.factories import ProjectFactory, TeamFactory, UserFactory
+
+
+@pytest.fixture
+def teammates(user, team):
+    # The caller is a co-member too; keep random names from matching the queries.
+    user.first_name, user.last_name, user.email = "Team", "Owner", "owner@example.com"
+    user.save()
+
+    def member(first_name, last_name, email, status="accepted"):
+        person = UserFactory(first_name=first_name, last_name=last_name, email=email)
+        TeamMembership.objects.create(team=team, user=person, role="developer", status=status)
+        return person
+
+    return {
+        "ada": member("Ada", "Lovelace", "ada@example.com"),
+        "adam": member("Adam", "Smith", "asmith@example.com"),
+        "grace": member("Grace", "Hopper", "grace.hopper@navy.example"),
+        "pending": member("Adele", "Pending", "adele@example.com", status="pending"),
+    }
+
+
+def _suggest(client, q, **params):
+    res = client.get(reverse("typeahead"), {"q": q, **params})
+    assert res.status_code == 200
+    return res.data["results"]
+
+
+def _ids(results, type_):
+    return [hit["id"] for hit in results if hit["type"] == type_]
+
+
+def test_prefix_trie_finds_every_word_under_a_prefix():
+    trie = PrefixTrie()
+    for pk, word in enumerate(["ada", "adam", "adele", "grace"]):
+        trie.add(word, pk)
+    trie.discard("adele", 2)
+
+    assert trie.prefixed("ad") == {0, 1}
+    assert trie.prefixed("ada") == {0, 1}
+    assert trie.prefixed("x") == set()
+
+
+@pytest.mark.django_db
+def test_users_match_names_and_email_prefixes(auth_client, teammates):
+    UserFactory(first_name="Adalbert", last_name="Stranger")  # shares no team
+
+    assert _ids(_suggest(auth_client, "ada", type="user"), "user") == [teammates["ada"].id, teammates["adam"].id]
+    assert _ids(_suggest(auth_client, "hopp", type="user"), "user") == [teammates["grace"].id]
+    assert _ids(_suggest(auth_client, "navy", type="user"), "user") == [teammates["grace"].id]
+    assert _ids(_suggest(auth_client, "ada smi", type="user"), "user") == [teammates["adam"].id]
+    assert _suggest(auth_client, "ada", type="user")[0] == {
+        "type": "user", "id": teammates["ada"].id, "first_name": "Ada",
+        "last_name": "Lovelace", "email": "ada@example.com",
+    }
+
+
+@pytest.mark.django_db
+def test_projects_are_limited_to_the_users_teams(auth_client, team):
+    mine = ProjectFactory(team=team, name="Mobile app")
+    ProjectFactory(name="Mobile backend")  # another team
+
+    assert _suggest(auth_client, "mob", type="project") == [
+        {"type": "project", "id": mine.id, "name": "Mobile app", "team": team.id},
+    ]
+
+
+@pytest.mark.django_db
+def test_team_parameter_narrows_and_is_checked(auth_client, user, team, teammates):
+    other = TeamFactory()
+    TeamMembership.objects.create(team=other, user=user, role="admin", status="accepted")
+    outsider = UserFactory(first_name="Adaline", last_name="Other")
+    TeamMembership.objects.create(team=other, user=outsider, role="developer", status="accepted")
+
+    assert outsider.id in _ids(_suggest(auth_client, "ada", type="user"), "user")
+    assert outsider.id not in _ids(_suggest(auth_client, "ada", type="user", team=team.id), "user")
+    assert auth_client.get(reverse("typeahead"), {"q": "ada", "team": TeamFactory().id}).status_code == 403
+    assert auth_client.get(reverse("typeahead"), {"q": "ada", "team": "x"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_index_follows_saves_and_deletes(auth_client, team, teammates):
+    _suggest(auth_client, "ada")  # build the in-memory index
+    project = ProjectFactory(team=team, name="Zephyr")
+    assert _ids(_suggest(auth_client, "zeph"), "project") == [project.id]
+
+    project.name = "Aurora"
+    project.save()
+    assert _suggest(auth_client, "zeph") == []
+    assert _ids(_suggest(auth_client, "auro"), "project") == [project.id]
+
+    teammates["grace"].is_active = False
+    teammates["grace"].save()
+    project.delete()
+    assert _suggest(auth_client, "grace") == []
+    assert _suggest(auth_client, "auro") == []
+
+
+@pytest.mark.django_db
+def test_writes_without_signals_show_up_after_a_generation_bump(auth_client, team):
+    project = ProjectFactory(team=team, name="Nebula")
+    assert _ids(_suggest(auth_client, "neb"), "project") == [project.id]
+
+    Project.objects.filter(pk=project.pk).update(name="Quasar")  # e.g. another process
+    cache.delete("typeahead:project:gen")
+
+    assert _ids(_suggest(auth_client, "quas"), "project") == [project.id]
+
+
+@pytest.mark.django_db
+def test_typeahead_rejects_unknown_types_and_anonymous_users(auth_client, api_client):
+    assert auth_client.get(reverse("typeahead"), {"q": "a", "type": "task"}).status_code == 400
+    assert api_client.get(reverse("typeahead"), {"q": "a"}).status_code == 401
+    assert _suggest(auth_client, "") == []
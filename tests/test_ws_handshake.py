@@ -0,0 +1,123 @@
+import asyncio
+import os
+import time
+
+import pytest
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.notify import middleware
+from apps.notify.middleware import AdmissionLimitMiddleware, JwtAuthMiddleware, TokenBucket, UserCache
+from apps.notify.routing import websocket_urlpatterns
+from apps.notify.services import push_event
+from tests.factories import UserFactory
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _stack(bucket=None):
+    return AdmissionLimitMiddleware(JwtAuthMiddleware(URLRouter(websocket_urlpatterns)), bucket=bucket)
+
+
+def _count_loads(monkeypatch):
+    loads = []
+    load = middleware._load_user
+
+    async def counting(validated_token):
+        loads.append(validated_token["user_id"])
+        return await load(validated_token)
+
+    monkeypatch.setattr(middleware, "_load_user", counting)
+    return loads
+
+
+def test_user_cache_expires_and_evicts_least_recently_used():
+    clock = FakeClock()
+    cache = UserCache(size=2, ttl=60, clock=clock)
+    cache.put("1", "one")
+    cache.put("2", "two")
+    assert cache.get("1") == "one"  # now most recently used
+    cache.put("3", "three")
+    assert (cache.get("1"), cache.get("2"), cache.get("3")) == ("one", None, "three")
+
+    clock.now = 61
+    assert cache.get("1") is None
+
+
+def test_token_bucket_allows_a_burst_then_the_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock)
+    assert [bucket.take() for _ in range(4)] == [True, True, True, False]
+    clock.now = 0.5
+    assert [bucket.take(), bucket.take()] == [True, False]
+    clock.now = 100
+    assert sum(bucket.take() for _ in range(10)) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_handshakes_reuse_the_cached_user_until_it_is_deactivated(monkeypatch):
+    loads = _count_loads(monkeypatch)
+    user = await database_sync_to_async(UserFactory)()
+    app = _stack()
+
+    for token in (AccessToken.for_user(user), AccessToken.for_user(user)):
+        communicator = WebsocketCommunicator(app, f"/ws/notifications/?token={token}")
+        assert (await communicator.connect())[0]
+        await communicator.disconnect()
+    assert len(loads) == 1
+
+    user.is_active = False
+    await database_sync_to_async(user.save)()
+    communicator = WebsocketCommunicator(app, f"/ws/notifications/?token={AccessToken.for_user(user)}")
+    assert (await communicator.connect())[0] is False
+    assert len(loads) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_handshakes_over_the_admission_rate_are_refused():
+    user = await database_sync_to_async(UserFactory)()
+    app = _stack(TokenBucket(rate=0.001, burst=1))
+    token = AccessToken.for_user(user)
+
+    first = WebsocketCommunicator(app, f"/ws/notifications/?token={token}")
+    second = WebsocketCommunicator(app, f"/ws/notifications/?token={token}")
+    assert (await first.connect())[0]
+    assert (await second.connect())[0] is False
+    await first.disconnect()
+
+
+@pytest.mark.skipif(not os.environ.get("WS_LOAD_TEST"), reason="set WS_LOAD_TEST=1 to run")
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_load_5000_concurrent_sockets(monkeypatch):
+    # 5k sockets for 100 users (tabs and devices), all connecting at once.
+    loads = _count_loads(monkeypatch)
+    users = await database_sync_to_async(UserFactory.create_batch)(100)
+    tokens = [str(AccessToken.for_user(user)) for user in users]
+    app = _stack(TokenBucket(rate=1000, burst=5000))
+    communicators = [
+        WebsocketCommunicator(app, f"/ws/notifications/?token={tokens[n % 100]}") for n in range(5000)
+    ]
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(communicator.connect(timeout=60) for communicator in communicators))
+    elapsed = time.perf_counter() - started
+    print(f"5000 handshakes: {elapsed:.1f} s, {len(loads)} user loads")
+    assert all(connected for connected, _ in results)
+    # Concurrent handshakes of a user share one load; later ones hit the cache.
+    assert len(loads) == 100
+
+    await database_sync_to_async(push_event)(user_ids=[user.id for user in users], data={"event": "ping"})
+    frames = await asyncio.gather(*(communicator.receive_json_from(timeout=30) for communicator in communicators))
+    assert all(frame == {"event": "ping"} for frame in frames)
+    await asyncio.gather(*(communicator.disconnect() for communicator in communicators))
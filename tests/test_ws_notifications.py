@@ -54,6 +54,26 @@ async def test_websocket_receives_notification():
     response = await communicator.receive_json_from()
     assert response["type"] == "general"
     assert response["message"] == "Hello WebSocket"
+    assert response["unread"] == 1
+    await communicator.disconnect()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_websocket_receives_unread_count_after_mark_read():
+    from apps.notify.services import mark_read
+
+    user = await database_sync_to_async(UserFactory)()
+    await database_sync_to_async(notify_user)(user=user, message="Earlier", type="general")
+    token = str(AccessToken.for_user(user))
+    communicator = WebsocketCommunicator(application, f"/ws/notifications/?token={token}")
+    connected, _ = await communicator.connect()
+    assert connected
+
+    await database_sync_to_async(mark_read)(user)
+
+    response = await communicator.receive_json_from()
+    assert response == {"event": "unread_count", "unread": 0}
     await communicator.disconnect()
 
 
@@ -118,3 +138,81 @@ async def test_authenticated_user_in_scope():
     connected, subprotocol = await communicator.connect()
     assert connected
     await communicator.disconnect()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_websocket_receives_event_frames():
+    from apps.notify.services import push_event
+
+    user = await database_sync_to_async(UserFactory)()
+    token = str(AccessToken.for_user(user))
+    communicator = WebsocketCommunicator(application, f"/ws/notifications/?token={token}")
+    connected, _ = await communicator.connect()
+    assert connected
+
+    await database_sync_to_async(push_event)(user_ids=[user.id], data={"event": "timer", "action": "stopped"})
+
+    assert await communicator.receive_json_from() == {"event": "timer", "action": "stopped"}
+    await communicator.disconnect()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_reconnect_replays_notifications_after_last_seen_id():
+    from apps.notify import consumers
+    from apps.notify.models import Notification
+
+    user = await database_sync_to_async(UserFactory)()
+    seen = await database_sync_to_async(Notification.objects.create)(user=user, message="Seen", is_read=True)
+    for text in ("Missed 1", "Missed 2"):
+        await database_sync_to_async(notify_user)(user=user, message=text, type="task")
+    token = str(AccessToken.for_user(user))
+
+    communicator = WebsocketCommunicator(application, f"/ws/notifications/?token={token}&last_seen_id={seen.id}")
+    assert (await communicator.connect())[0]
+    replay = await communicator.receive_json_from()
+    assert replay["event"] == "replay" and replay["complete"] is True
+    assert [note["message"] for note in replay["notifications"]] == ["Missed 1", "Missed 2"]
+    assert replay["unread"] == 2
+
+    # Live frames carry the id the client reports on its next reconnect.
+    await database_sync_to_async(notify_user)(user=user, message="Live", type="task")
+    live = await communicator.receive_json_from()
+    assert live["id"] == replay["notifications"][-1]["id"] + 1
+    await communicator.disconnect()
+
+    consumers.REPLAY_LIMIT, limit = 1, consumers.REPLAY_LIMIT
+    try:
+        communicator = WebsocketCommunicator(application, f"/ws/notifications/?token={token}&last_seen_id={seen.id}")
+        assert (await communicator.connect())[0]
+        assert await communicator.receive_json_from() == {
+            "event": "replay", "notifications": [], "complete": False, "unread": 3,
+        }
+        await communicator.disconnect()
+    finally:
+        consumers.REPLAY_LIMIT = limit
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_reconnect_replays_digests_that_grew_while_away(settings):
+    settings.NOTIFY_COALESCE_WINDOW = 60
+    settings.NOTIFY_COALESCE_MAX_BATCH = 20
+
+    user = await database_sync_to_async(UserFactory)()
+    await database_sync_to_async(notify_user)(user=user, message="Task moved", type="task")
+    await database_sync_to_async(notify_user)(user=user, message="Comment added", type="comment")
+    from apps.notify.models import Notification
+    digest, seen = await database_sync_to_async(lambda: list(Notification.objects.filter(user=user).order_by("id")))()
+
+    # The digest is older than what the client last saw, but grows after it.
+    await database_sync_to_async(notify_user)(user=user, message="Task moved again", type="task")
+    token = str(AccessToken.for_user(user))
+    communicator = WebsocketCommunicator(application, f"/ws/notifications/?token={token}&last_seen_id={seen.id}")
+    assert (await communicator.connect())[0]
+    replay = await communicator.receive_json_from()
+    assert replay["complete"] is True
+    replayed = {note["id"]: note for note in replay["notifications"]}
+    assert replayed[digest.id]["message"] == "Task moved again (+1 more)"
+    await communicator.disconnect()